@@ -0,0 +1,101 @@
+"""
+Caché en memoria de proceso con expiración (TTL) y desalojo LRU
+Cada worker tiene su propia copia: los datos cacheados deben tolerar quedar
+desactualizados como máximo `ttl_segundos` en los demás workers.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def clave_token(token: str) -> str:
+    """Clave para indexar por token: se usa el hash para no retener los tokens en memoria"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class CacheTTL:
+    """Diccionario acotado (LRU) con expiración por entrada y contadores de aciertos/fallos"""
+
+    def __init__(self, nombre: str, max_entradas: int = 1024, ttl_segundos: float = 300):
+        self.nombre = nombre
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos
+        self._datos: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def obtener(self, clave: Hashable) -> Optional[Any]:
+        """Retorna el valor cacheado o None si no existe o expiró"""
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return None
+            valor, expira = entrada
+            if expira <= ahora:
+                del self._datos[clave]
+                self.fallos += 1
+                return None
+            self._datos.move_to_end(clave)
+            self.aciertos += 1
+            return valor
+
+    def guardar(self, clave: Hashable, valor: Any, ttl_segundos: Optional[float] = None):
+        expira = time.monotonic() + (ttl_segundos if ttl_segundos is not None else self.ttl_segundos)
+        with self._lock:
+            self._datos[clave] = (valor, expira)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+                self.desalojos += 1
+
+    def invalidar(self, clave: Hashable):
+        with self._lock:
+            self._datos.pop(clave, None)
+
+    def invalidar_donde(self, condicion: Callable[[Any], bool]) -> int:
+        """Elimina las entradas cuyo valor cumple la condición; retorna cuántas"""
+        with self._lock:
+            claves = [clave for clave, (valor, _) in self._datos.items() if condicion(valor)]
+            for clave in claves:
+                del self._datos[clave]
+        return len(claves)
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+
+    def __len__(self) -> int:
+        return len(self._datos)
+
+    def estadisticas(self) -> Dict[str, Any]:
+        total = self.aciertos + self.fallos
+        return {
+            "entradas": len(self._datos),
+            "max_entradas": self.max_entradas,
+            "ttl_segundos": self.ttl_segundos,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "desalojos": self.desalojos,
+            "tasa_aciertos": round(self.aciertos / total, 4) if total else 0.0
+        }
+
+
+# Registro global para exponer estadísticas de todas las cachés
+_caches: Dict[str, CacheTTL] = {}
+
+
+def crear_cache(nombre: str, max_entradas: int = 1024, ttl_segundos: float = 300) -> CacheTTL:
+    """Crea (o retorna la existente) una caché registrada con ese nombre"""
+    if nombre not in _caches:
+        _caches[nombre] = CacheTTL(nombre, max_entradas, ttl_segundos)
+    return _caches[nombre]
+
+
+def estadisticas_caches() -> Dict[str, Dict[str, Any]]:
+    return {nombre: cache.estadisticas() for nombre, cache in _caches.items()}
@@ -0,0 +1,179 @@
+"""
+Compresión de respuestas HTTP (gzip y, si está instalado el paquete
+`brotli`, br) para los consultorios remotos con enlaces lentos.
+
+- Solo se comprimen respuestas de al menos `minimo_bytes`; las pequeñas no
+  ganan nada y pagan la CPU.
+- Respuestas en streaming (StreamingResponse, descargas en lote): se
+  comprime cada fragmento con flush, así el cliente recibe datos a medida
+  que se generan en lugar de esperar al final.
+- Se omiten los tipos ya comprimidos (PDF, imágenes, ZIP), las respuestas
+  que ya traen Content-Encoding y las que no tienen cuerpo (204, 304).
+"""
+import gzip
+import zlib
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+    BROTLI_DISPONIBLE = True
+except ImportError:
+    brotli = None
+    BROTLI_DISPONIBLE = False
+
+# Prefijos de Content-Type que no vale la pena recomprimir
+TIPOS_COMPRIMIDOS = (
+    "application/pdf",
+    "application/zip",
+    "application/gzip",
+    "application/octet-stream",
+    "image/",
+    "audio/",
+    "video/",
+    "font/woff",
+)
+
+
+def _elegir_codificacion(accept_encoding: str, usar_brotli: bool) -> Optional[str]:
+    """br si el cliente lo acepta y está disponible, si no gzip; None si no acepta ninguno"""
+    aceptadas = set()
+    for parte in accept_encoding.lower().split(","):
+        nombre, _, parametros = parte.strip().partition(";")
+        if parametros.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        aceptadas.add(nombre.strip())
+    if usar_brotli and BROTLI_DISPONIBLE and "br" in aceptadas:
+        return "br"
+    if "gzip" in aceptadas:
+        return "gzip"
+    return None
+
+
+class _Compresor:
+    """Compresor incremental: comprimir(fragmento) y terminar() para el último"""
+
+    def __init__(self, codificacion: str, nivel_gzip: int, nivel_brotli: int):
+        if codificacion == "br":
+            self._brotli = brotli.Compressor(quality=nivel_brotli)
+            self._zlib = None
+        else:
+            self._brotli = None
+            # wbits=31: formato gzip (cabecera y CRC), igual que gzip.compress
+            self._zlib = zlib.compressobj(nivel_gzip, zlib.DEFLATED, 31)
+
+    def comprimir(self, datos: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(datos) + self._brotli.flush()
+        return self._zlib.compress(datos) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def terminar(self, datos: bytes = b"") -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(datos) + self._brotli.finish()
+        return self._zlib.compress(datos) + self._zlib.flush(zlib.Z_FINISH)
+
+
+def comprimir(datos: bytes, codificacion: str, nivel_gzip: int = 6, nivel_brotli: int = 4) -> bytes:
+    """Compresión de un cuerpo completo (también la usa el benchmark)"""
+    if codificacion == "br":
+        return brotli.compress(datos, quality=nivel_brotli)
+    return gzip.compress(datos, compresslevel=nivel_gzip, mtime=0)
+
+
+class CompresionMiddleware:
+    """Middleware ASGI de compresión; ver el docstring del módulo"""
+
+    def __init__(self, app: ASGIApp, minimo_bytes: int = 1024, nivel_gzip: int = 6,
+                 nivel_brotli: int = 4, usar_brotli: bool = True,
+                 tipos_excluidos: Tuple[str, ...] = TIPOS_COMPRIMIDOS):
+        self.app = app
+        self.minimo_bytes = minimo_bytes
+        self.nivel_gzip = nivel_gzip
+        self.nivel_brotli = nivel_brotli
+        self.usar_brotli = usar_brotli
+        self.tipos_excluidos = tipos_excluidos
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        codificacion = _elegir_codificacion(
+            Headers(scope=scope).get("accept-encoding", ""), self.usar_brotli
+        )
+        if codificacion is None:
+            await self.app(scope, receive, send)
+            return
+        await _RespuestaComprimida(self, codificacion, send).ejecutar(scope, receive)
+
+
+class _RespuestaComprimida:
+    """Estado de una respuesta: decide con el primer fragmento si se comprime"""
+
+    def __init__(self, middleware: CompresionMiddleware, codificacion: str, send: Send):
+        self.middleware = middleware
+        self.codificacion = codificacion
+        self.send = send
+        self.inicio: Optional[Message] = None
+        self.compresor: Optional[_Compresor] = None
+        self.decidido = False
+
+    async def ejecutar(self, scope: Scope, receive: Receive):
+        await self.middleware.app(scope, receive, self.enviar)
+
+    def _es_comprimible(self, cabeceras: Headers) -> bool:
+        if self.inicio["status"] in (204, 304) or "content-encoding" in cabeceras:
+            return False
+        tipo = cabeceras.get("content-type", "").lower()
+        return not tipo.startswith(self.middleware.tipos_excluidos)
+
+    def _preparar_cabeceras(self, longitud: Optional[int]):
+        cabeceras = MutableHeaders(raw=self.inicio["headers"])
+        cabeceras["Content-Encoding"] = self.codificacion
+        cabeceras.add_vary_header("Accept-Encoding")
+        # El cuerpo ya no es idéntico byte a byte: un ETag fuerte pasa a débil
+        etag = cabeceras.get("etag")
+        if etag and not etag.startswith("W/"):
+            cabeceras["ETag"] = f"W/{etag}"
+        if longitud is None:
+            del cabeceras["Content-Length"]
+        else:
+            cabeceras["Content-Length"] = str(longitud)
+        self.inicio["headers"] = cabeceras.raw
+
+    async def enviar(self, mensaje: Message):
+        if mensaje["type"] == "http.response.start":
+            # Se retiene hasta ver el primer fragmento del cuerpo
+            self.inicio = mensaje
+            return
+        if mensaje["type"] != "http.response.body":
+            await self.send(mensaje)
+            return
+
+        cuerpo = mensaje.get("body", b"")
+        mas = mensaje.get("more_body", False)
+
+        if not self.decidido:
+            self.decidido = True
+            cabeceras = Headers(raw=self.inicio["headers"])
+            if not self._es_comprimible(cabeceras) or (not mas and len(cuerpo) < self.middleware.minimo_bytes):
+                await self.send(self.inicio)
+                await self.send(mensaje)
+                return
+            self.compresor = _Compresor(self.codificacion, self.middleware.nivel_gzip, self.middleware.nivel_brotli)
+            if not mas:
+                # Cuerpo completo en un solo mensaje: Content-Length exacto
+                comprimido = comprimir(cuerpo, self.codificacion, self.middleware.nivel_gzip, self.middleware.nivel_brotli)
+                self._preparar_cabeceras(len(comprimido))
+                await self.send(self.inicio)
+                await self.send({"type": "http.response.body", "body": comprimido})
+                return
+            self._preparar_cabeceras(None)
+            await self.send(self.inicio)
+
+        if self.compresor is None:
+            await self.send(mensaje)
+            return
+        datos = self.compresor.comprimir(cuerpo) if mas else self.compresor.terminar(cuerpo)
+        await self.send({"type": "http.response.body", "body": datos, "more_body": mas})
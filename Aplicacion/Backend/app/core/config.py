@@ -8,23 +8,82 @@ class Settings(BaseSettings):
     DB_HOST: str
     DB_PORT: int
     DB_NAME: str
+    DB_URL: Optional[str] = None  # URL completa de la primaria (p. ej. sqlite:///... para pruebas)
+    DB_ASYNC_URL: Optional[str] = None  # por defecto, la misma base con mysql+aiomysql
+    DB_ASYNC_POOL_SIZE: int = 20
+    DB_ASYNC_MAX_OVERFLOW: int = 10
+
+    # Réplica de lectura (opcional): los GET se sirven desde ella
+    DB_REPLICA_HOST: Optional[str] = None
+    DB_REPLICA_PORT: Optional[int] = None  # por defecto, DB_PORT
+    DB_REPLICA_URL: Optional[str] = None  # URL completa; tiene prioridad sobre DB_REPLICA_HOST
+    DB_ASYNC_REPLICA_URL: Optional[str] = None
+    DB_LEER_PRIMARIA_TRAS_ESCRITURA: int = 5  # segundos en que un cliente lee de la primaria tras escribir
+    # Si la base no está en la versión requerida: True migra al arrancar (desarrollo),
+    # False detiene el arranque hasta ejecutar `python -m app.core.migraciones`
+    MIGRAR_AL_INICIAR: bool = True
 
     # JWT Configuration
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
+    # Contraseñas (bcrypt en un pool de procesos)
+    BCRYPT_ROUNDS: int = 12  # al cambiarlo, los hashes se regeneran en el siguiente login
+    HASH_WORKERS: int = 2
+    HASH_MAX_PENDIENTES: int = 64  # logins en espera antes de responder 503
+
     # Email Configuration (opcional)
     SMTP_HOST: Optional[str] = None
     SMTP_PORT: Optional[int] = None
     SMTP_USER: Optional[str] = None
     SMTP_PASSWORD: Optional[str] = None
     EMAIL_FROM: Optional[str] = None
+    SMTP_POOL_SIZE: int = 4  # conexiones SMTP persistentes por proceso
+    SMTP_POOL_MAX_INACTIVO: int = 60  # segundos sin uso antes de verificar con NOOP
+    SMTP_MAX_MENSAJES_CONEXION: int = 100  # mensajes antes de reciclar la conexión
+    
+    # Recordatorios de citas por email (job diario)
+    RECORDATORIOS_ACTIVOS: bool = False
+    RECORDATORIOS_HORA: int = 18  # hora local en que se envían los recordatorios del día siguiente
+    RECORDATORIOS_CONCURRENCIA: int = 4
+    RECORDATORIOS_POR_SEGUNDO: float = 10
+    RECORDATORIOS_MAX_INTENTOS: int = 3
     
     # Resend API Configuration
     RESEND_API_KEY: Optional[str] = None
     USE_RESEND: Optional[bool] = False
 
+    # Generación de PDFs en procesos separados
+    PDF_WORKERS: int = 2
+    PDF_MAX_PENDIENTES: int = 16
+    PDF_CACHE_DIR: Optional[str] = None  # por defecto, en el directorio temporal del sistema
+    PDF_CACHE_MAX_MB: int = 512
+
+    # Compresión de respuestas (gzip; br si está instalado el paquete brotli)
+    COMPRESION_ACTIVA: bool = True
+    COMPRESION_MINIMO_BYTES: int = 1024  # respuestas más pequeñas se envían sin comprimir
+    COMPRESION_NIVEL_GZIP: int = 6
+    COMPRESION_BROTLI: bool = True
+    COMPRESION_NIVEL_BROTLI: int = 4
+
+    # Métricas Prometheus en /metrics
+    METRICAS_ACTIVAS: bool = True
+    METRICAS_TOKEN: Optional[str] = None  # si se define, /metrics exige "Authorization: Bearer <token>"
+
+    # Perfil de SQL por solicitud y detector de N+1 (desarrollo y pruebas de carga)
+    PERFIL_SQL_ACTIVO: bool = False
+    PERFIL_SQL_MAX_CONSULTAS: int = 20  # más consultas en una solicitud se reportan en el log
+    PERFIL_SQL_MAX_REPETICIONES: int = 5  # la misma consulta más veces se reporta como posible N+1
+    PERFIL_SQL_CABECERA: bool = True  # agrega X-SQL-Consultas y Server-Timing a las respuestas
+
+    # Logging estructurado (app/utils/logger.py)
+    LOG_NIVEL: str = "INFO"
+    LOG_FORMATO: str = "json"  # json o texto
+    LOG_NIVELES: Optional[str] = None  # por módulo, p. ej. "websocket=WARNING,citas=DEBUG"
+    # Fracción de eventos de alto volumen que se escriben (advertencias y errores siempre)
+    LOG_MUESTREO: Optional[str] = "websocket.conexion=0.1,diagnosticos.sin_resultados=0.1,medicamentos.activo_corregido=0.1"
+
     class Config:
         env_file = ".env"
         env_file_encoding = 'utf-8'
@@ -1,28 +1,130 @@
+import time
 from sqlalchemy import create_engine, Column, Boolean, DateTime
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from sqlalchemy.exc import OperationalError
 from datetime import datetime
+from typing import Dict
+from fastapi import Request
+from app.core.cache import clave_token
 from app.core.config import settings
+from app.core.metricas import AsyncQueuePoolMedido, QueuePoolMedido
+from app.utils.logger import obtener_logger
 
-DATABASE_URL = (
-    f"mysql+pymysql://{settings.DB_USER}:{settings.DB_PASSWORD}"
-    f"@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
+logger = obtener_logger("database")
+
+def _url_mysql(driver: str, host: str, puerto: int) -> str:
+    return (
+        f"mysql+{driver}://{settings.DB_USER}:{settings.DB_PASSWORD}"
+        f"@{host}:{puerto}/{settings.DB_NAME}"
+    )
+
+def _opciones_pool(url: str, pool_size: int, max_overflow: int, asincrono: bool = False) -> dict:
+    # SQLite (pruebas locales) no usa QueuePool: no acepta estas opciones. FastAPI
+    # cierra la sesión de get_db en otro hilo del threadpool que el del endpoint
+    if url.startswith("sqlite"):
+        return {} if asincrono else {"connect_args": {"check_same_thread": False}}
+    return {
+        # QueuePool que además mide la espera por conexión (ver /metrics)
+        "poolclass": AsyncQueuePoolMedido if asincrono else QueuePoolMedido,
+        "pool_pre_ping": True,   # Verifica conexiones antes de usarlas
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": 60,      # Tiempo de espera para obtener conexión en segundos (antes: 30)
+        "pool_recycle": 3600     # Reciclar conexiones cada hora (evita conexiones muertas)
+    }
+
+DATABASE_URL = settings.DB_URL or _url_mysql("pymysql", settings.DB_HOST, settings.DB_PORT)
+
+# Réplica de lectura: DB_REPLICA_HOST (mismas credenciales y base que la
+# primaria) o DB_REPLICA_URL completa. Sin réplica, todo va a la primaria.
+REPLICA_DATABASE_URL = settings.DB_REPLICA_URL or (
+    _url_mysql("pymysql", settings.DB_REPLICA_HOST, settings.DB_REPLICA_PORT or settings.DB_PORT)
+    if settings.DB_REPLICA_HOST else None
 )
+HAY_REPLICA = REPLICA_DATABASE_URL is not None
 
 # Engine & session (sync)
-# Configuración optimizada para pruebas de carga
-engine = create_engine(
-    DATABASE_URL, 
-    pool_pre_ping=True,   # Verifica conexiones antes de usarlas
-    echo=False,
-    pool_size=20,         # Número base de conexiones (antes: 5 por defecto)
-    max_overflow=30,      # Conexiones adicionales permitidas (antes: 10 por defecto)
-    pool_timeout=60,      # Tiempo de espera para obtener conexión en segundos (antes: 30)
-    pool_recycle=3600     # Reciclar conexiones cada hora (evita conexiones muertas)
-)
+# Configuración optimizada para pruebas de carga: 20 conexiones base + 30
+# adicionales (antes: 5 y 10 por defecto)
+engine = create_engine(DATABASE_URL, echo=False, **_opciones_pool(DATABASE_URL, 20, 30))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+
+class SesionSoloLectura(Session):
+    """
+    Sesión ligada a la réplica. commit() no escribe: algunos GET corrigen
+    activo=NULL al vuelo y esos cambios quedan solo en memoria hasta que la
+    sesión se cierra (y se descartan con el rollback del cierre). Si había
+    cambios se registra una advertencia: una escritura que llega a la réplica
+    es un ruteo equivocado (debería usar get_db_primaria).
+    """
+
+    def commit(self):
+        if self.new or self.dirty or self.deleted:
+            logger.warning("Cambios descartados en una sesión de la réplica", extra={
+                "nuevos": len(self.new), "modificados": len(self.dirty), "eliminados": len(self.deleted),
+                "objetos": sorted({type(o).__name__ for o in (*self.new, *self.dirty, *self.deleted)}),
+            })
+
+
+replica_engine = (
+    create_engine(REPLICA_DATABASE_URL, echo=False, **_opciones_pool(REPLICA_DATABASE_URL, 20, 30))
+    if HAY_REPLICA else engine
+)
+SessionReplica = sessionmaker(
+    autocommit=False, autoflush=False, bind=replica_engine,
+    class_=SesionSoloLectura if HAY_REPLICA else Session
+)
+
+# Engine & session (async) para los endpoints de lectura de alto tráfico:
+# una conexión se ocupa solo mientras la consulta está en curso, sin retener
+# un hilo del threadpool. Se crea al primer uso porque requiere el driver
+# async (aiomysql; aiosqlite para pruebas con DB_ASYNC_URL=sqlite+aiosqlite://)
+ASYNC_DATABASE_URL = settings.DB_ASYNC_URL or _url_mysql("aiomysql", settings.DB_HOST, settings.DB_PORT)
+ASYNC_REPLICA_DATABASE_URL = settings.DB_ASYNC_REPLICA_URL or (
+    _url_mysql("aiomysql", settings.DB_REPLICA_HOST, settings.DB_REPLICA_PORT or settings.DB_PORT)
+    if settings.DB_REPLICA_HOST else None
+)
+_async_engine = None
+_async_replica_engine = None
+_AsyncSessionLocal = None
+_AsyncSessionReplica = None
+
+def _crear_async_engine(url: str):
+    return create_async_engine(
+        url, echo=False,
+        **_opciones_pool(url, settings.DB_ASYNC_POOL_SIZE, settings.DB_ASYNC_MAX_OVERFLOW, asincrono=True)
+    )
+
+def obtener_async_engine():
+    global _async_engine, _async_replica_engine, _AsyncSessionLocal, _AsyncSessionReplica
+    if _async_engine is None:
+        _async_engine = _crear_async_engine(ASYNC_DATABASE_URL)
+        # expire_on_commit=False: los objetos se serializan después de cerrar la sesión
+        _AsyncSessionLocal = sessionmaker(
+            _async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+        if ASYNC_REPLICA_DATABASE_URL:
+            _async_replica_engine = _crear_async_engine(ASYNC_REPLICA_DATABASE_URL)
+            _AsyncSessionReplica = sessionmaker(
+                _async_replica_engine, class_=AsyncSession, sync_session_class=SesionSoloLectura,
+                autoflush=False, expire_on_commit=False
+            )
+        else:
+            _AsyncSessionReplica = _AsyncSessionLocal
+    return _async_engine
+
+async def cerrar_async_engine():
+    """Cierra las conexiones de los engines async (apagado de la aplicación)"""
+    global _async_engine, _async_replica_engine, _AsyncSessionLocal, _AsyncSessionReplica
+    for motor in (_async_engine, _async_replica_engine):
+        if motor is not None:
+            await motor.dispose()
+    _async_engine = _async_replica_engine = None
+    _AsyncSessionLocal = _AsyncSessionReplica = None
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # MIXIN PARA SOFT DELETE (BORRADO LÓGICO)
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -45,17 +147,81 @@ class SoftDeleteMixin:
         self.activo = True
         self.fecha_eliminacion = None
 
-def get_db():
-    """Dependency para obtener sesión de base de datos"""
+# ═══════════════════════════════════════════════════════════════════════════════
+# SESIÓN POR SOLICITUD CON RUTEO LECTURA/ESCRITURA
+# ═══════════════════════════════════════════════════════════════════════════════
+
+METODOS_LECTURA = {"GET", "HEAD", "OPTIONS"}
+
+# Última escritura por cliente (token o IP): durante DB_LEER_PRIMARIA_TRAS_ESCRITURA
+# segundos sus lecturas van a la primaria, para que vea lo que acaba de guardar
+# aunque la réplica tenga retraso. Es por proceso, como el resto de cachés.
+_ultimas_escrituras: Dict[str, float] = {}
+_MAX_CLIENTES_RECORDADOS = 10000
+
+def _clave_cliente(request: Request) -> str:
+    autorizacion = request.headers.get("authorization")
+    if autorizacion:
+        return clave_token(autorizacion)
+    return request.client.host if request.client else ""
+
+def _registrar_escritura(request: Request):
+    ahora = time.monotonic()
+    if len(_ultimas_escrituras) >= _MAX_CLIENTES_RECORDADOS:
+        limite = ahora - settings.DB_LEER_PRIMARIA_TRAS_ESCRITURA
+        for clave, momento in list(_ultimas_escrituras.items()):
+            if momento < limite:
+                del _ultimas_escrituras[clave]
+    _ultimas_escrituras[_clave_cliente(request)] = ahora
+
+def usar_replica(request: Request) -> bool:
+    """Solo lecturas, y no si el cliente escribió hace menos de la ventana configurada"""
+    if request.method not in METODOS_LECTURA:
+        return False
+    ultima = _ultimas_escrituras.get(_clave_cliente(request))
+    return ultima is None or time.monotonic() - ultima >= settings.DB_LEER_PRIMARIA_TRAS_ESCRITURA
+
+def get_db(request: Request):
+    """
+    Dependency para obtener sesión de base de datos: réplica para lecturas,
+    primaria para escrituras (y para lecturas justo después de escribir)
+    """
+    if request.method not in METODOS_LECTURA:
+        # Antes de responder: el cierre de la dependencia corre después de
+        # enviar la respuesta, y un GET inmediato del cliente llegaría antes
+        _registrar_escritura(request)
+    if HAY_REPLICA and usar_replica(request):
+        db = SessionReplica()
+    else:
+        db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_db_primaria():
+    """Dependency para GET que escriben (p. ej. auditoría de accesos) o exigen consistencia"""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
-def init_db():
+async def get_async_db(request: Request):
+    """Dependency para obtener sesión async de base de datos (mismo ruteo que get_db)"""
+    obtener_async_engine()
+    if request.method not in METODOS_LECTURA:
+        _registrar_escritura(request)
+    fabrica = _AsyncSessionReplica if usar_replica(request) else _AsyncSessionLocal
+    async with fabrica() as db:
+        yield db
+
+def importar_modelos():
     # Import models here so they are registered with Base.metadata
-    from app.models import empleado, paciente, medico, cita, historia, consulta, farmacia, medicamento, signos_vitales, asistencia, receta, auditoria
+    from app.models import empleado, paciente, medico, cita, historia, consulta, farmacia, medicamento, signos_vitales, asistencia, receta, auditoria, recordatorio, lote, diagnostico_cie10, version_esquema, version_catalogo
+
+def init_db():
+    importar_modelos()
     try:
         Base.metadata.create_all(bind=engine)
         print("Database tables created or already exist.")
@@ -117,9 +117,10 @@ def create_default_users(db: Session):
         logger.info("ℹ️  No se crearon usuarios nuevos, todos ya existen")
 
 
-def initialize_default_data():
+def initialize_default_data() -> bool:
     """
-    Función principal para inicializar datos por defecto
+    Función principal para inicializar datos por defecto.
+    Retorna True si terminó sin errores.
     """
     logger.info("🚀 Iniciando creación de datos por defecto...")
     
@@ -128,6 +129,7 @@ def initialize_default_data():
         create_default_users(db)
         inicializar_diagnosticos_cie10(db)
         logger.info("✅ Inicialización de datos completada")
+        return True
     except Exception as e:
         # Silenciar errores de importación circular durante el primer intento
         # (cuando se llama desde el script de inicio antes de que FastAPI cargue todos los modelos)
@@ -136,6 +138,7 @@ def initialize_default_data():
         else:
             logger.error(f"❌ Error al inicializar datos: {str(e)}")
         db.rollback()
+        return False
     finally:
         db.close()
 
@@ -0,0 +1,267 @@
+"""
+Métricas del proceso en formato de texto de Prometheus (GET /metrics).
+
+- Latencia por ruta (histograma por método, plantilla de ruta y clase de
+  código HTTP) y solicitudes en curso, medidas por MetricasMiddleware.
+- Pools de conexiones de SQLAlchemy (primaria, réplica y async): tamaño,
+  prestadas, overflow y tiempo de espera para obtener una conexión.
+- Conexiones WebSocket, envíos de email en curso, pool SMTP, colas de PDFs
+  y de bcrypt, y registros de auditoría escritos.
+
+Costo: la medición de cada solicitud es una toma de tiempo y unas sumas en
+el event loop (sin locks). Los pools se miden con contadores protegidos por
+un lock por pool, que solo se toma al prestar una conexión. El resto se lee
+al momento de exponer, desde las estadísticas que cada módulo ya mantiene.
+Cada worker expone sus propios valores (Prometheus los suma por instancia).
+"""
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.logger import obtener_logger
+
+logger = obtener_logger("metricas")
+
+# Límites superiores (segundos) del histograma de latencia
+LIMITES_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+TIPO_CONTENIDO = "text/plain; version=0.0.4"  # Starlette agrega charset=utf-8
+
+Muestra = Tuple[Dict[str, str], float]
+
+
+class HistogramaLatencia:
+    """
+    Histograma por (método, ruta, código). Solo lo actualiza el middleware
+    desde el event loop, por eso no necesita lock.
+    """
+
+    def __init__(self, limites: Tuple[float, ...] = LIMITES_LATENCIA):
+        self.limites = limites
+        # clave -> [conteos por límite..., +Inf], suma
+        self._series: Dict[Tuple[str, str, str], list] = {}
+
+    def observar(self, metodo: str, ruta: str, codigo: str, segundos: float):
+        clave = (metodo, ruta, codigo)
+        serie = self._series.get(clave)
+        if serie is None:
+            serie = self._series[clave] = [[0] * (len(self.limites) + 1), 0.0]
+        serie[0][bisect.bisect_left(self.limites, segundos)] += 1
+        serie[1] += segundos
+
+    def lineas(self, nombre: str) -> List[str]:
+        lineas = []
+        for (metodo, ruta, codigo), (conteos, suma) in list(self._series.items()):
+            etiquetas = f'metodo="{metodo}",ruta="{_escapar(ruta)}",codigo="{codigo}"'
+            acumulado = 0
+            for limite, conteo in zip(self.limites + (float("inf"),), conteos):
+                acumulado += conteo
+                le = "+Inf" if limite == float("inf") else repr(limite)
+                lineas.append(f'{nombre}_bucket{{{etiquetas},le="{le}"}} {acumulado}')
+            lineas.append(f"{nombre}_sum{{{etiquetas}}} {suma}")
+            lineas.append(f"{nombre}_count{{{etiquetas}}} {acumulado}")
+        return lineas
+
+
+latencia_http = HistogramaLatencia()
+_en_curso = {"http": 0}
+
+
+class MetricasMiddleware:
+    """Mide cada solicitud HTTP; la ruta es la plantilla (/pacientes/{paciente_id}), no la URL"""
+
+    def __init__(self, app: ASGIApp, excluir: Iterable[str] = ("/metrics",)):
+        self.app = app
+        self.excluir = set(excluir)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in self.excluir:
+            await self.app(scope, receive, send)
+            return
+
+        codigo = 500
+        inicio = time.perf_counter()
+
+        async def enviar(mensaje: Message):
+            nonlocal codigo
+            if mensaje["type"] == "http.response.start":
+                codigo = mensaje["status"]
+            await send(mensaje)
+
+        _en_curso["http"] += 1
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _en_curso["http"] -= 1
+            ruta = scope.get("route")
+            # Sin ruta (404, archivos inexistentes): una sola serie para no crear una por URL
+            plantilla = getattr(ruta, "path", None) or "sin_ruta"
+            latencia_http.observar(scope["method"], plantilla, f"{codigo // 100}xx", time.perf_counter() - inicio)
+
+
+class _EsperaMedida:
+    """Mide cuánto se espera por una conexión del pool (y cuántas veces se agota)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock_metricas = threading.Lock()
+        self.prestamos = 0
+        self.espera_total = 0.0
+        self.tiempos_agotados = 0
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conexion = super()._do_get()
+        except Exception:
+            with self._lock_metricas:
+                self.tiempos_agotados += 1
+            raise
+        espera = time.perf_counter() - inicio
+        with self._lock_metricas:
+            self.prestamos += 1
+            self.espera_total += espera
+        return conexion
+
+
+class QueuePoolMedido(_EsperaMedida, QueuePool):
+    pass
+
+
+class AsyncQueuePoolMedido(_EsperaMedida, AsyncAdaptedQueuePool):
+    pass
+
+
+# Recolectores: funciones que retornan [(nombre, tipo, ayuda, [(etiquetas, valor)])]
+_recolectores: List[Callable[[], List[tuple]]] = []
+
+
+def registrar_recolector(recolector: Callable[[], List[tuple]]):
+    _recolectores.append(recolector)
+    return recolector
+
+
+@registrar_recolector
+def _pools_bd() -> List[tuple]:
+    from app.core import database
+
+    engines = [("primaria", database.engine)]
+    if database.HAY_REPLICA:
+        engines.append(("replica", database.replica_engine))
+    if database._async_engine is not None:
+        engines.append(("async", database._async_engine.sync_engine))
+    if database._async_replica_engine is not None:
+        engines.append(("async_replica", database._async_replica_engine.sync_engine))
+
+    series = {nombre: [] for nombre in (
+        "db_pool_tamano", "db_pool_prestadas", "db_pool_disponibles", "db_pool_overflow",
+        "db_pool_prestamos_total", "db_pool_espera_segundos_total", "db_pool_agotado_total",
+    )}
+    for etiqueta, engine in engines:
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            continue  # SQLite en pruebas
+        etiquetas = {"pool": etiqueta}
+        series["db_pool_tamano"].append((etiquetas, pool.size()))
+        series["db_pool_prestadas"].append((etiquetas, pool.checkedout()))
+        series["db_pool_disponibles"].append((etiquetas, pool.checkedin()))
+        series["db_pool_overflow"].append((etiquetas, max(pool.overflow(), 0)))
+        if isinstance(pool, _EsperaMedida):
+            series["db_pool_prestamos_total"].append((etiquetas, pool.prestamos))
+            series["db_pool_espera_segundos_total"].append((etiquetas, pool.espera_total))
+            series["db_pool_agotado_total"].append((etiquetas, pool.tiempos_agotados))
+    return [
+        ("db_pool_tamano", "gauge", "Conexiones base del pool", series["db_pool_tamano"]),
+        ("db_pool_prestadas", "gauge", "Conexiones prestadas en este momento", series["db_pool_prestadas"]),
+        ("db_pool_disponibles", "gauge", "Conexiones abiertas sin usar", series["db_pool_disponibles"]),
+        ("db_pool_overflow", "gauge", "Conexiones abiertas por encima de pool_size", series["db_pool_overflow"]),
+        ("db_pool_prestamos_total", "counter", "Conexiones obtenidas del pool", series["db_pool_prestamos_total"]),
+        ("db_pool_espera_segundos_total", "counter", "Tiempo total esperando una conexión",
+         series["db_pool_espera_segundos_total"]),
+        ("db_pool_agotado_total", "counter", "Esperas que terminaron en error (pool_timeout o conexión fallida)",
+         series["db_pool_agotado_total"]),
+    ]
+
+
+@registrar_recolector
+def _websockets() -> List[tuple]:
+    from app.core.websocket import manager
+
+    por_rol = [({"rol": rol}, len(conexiones)) for rol, conexiones in manager.connections_by_role.items()]
+    return [
+        ("websocket_conexiones", "gauge", "Conexiones WebSocket abiertas", [({}, manager.get_total_connections())]),
+        ("websocket_conexiones_por_rol", "gauge", "Conexiones WebSocket abiertas por rol", por_rol),
+        ("websocket_usuarios", "gauge", "Usuarios con al menos una conexión", [({}, len(manager.active_connections))]),
+    ]
+
+
+@registrar_recolector
+def _colas() -> List[tuple]:
+    from app.services.auditoria_service import estadisticas_auditoria
+    from app.services.password_service import estadisticas_hash
+    from app.services.pdf_service import estadisticas_pdf
+    from app.utils.email_utils import estadisticas_email
+    from app.utils import smtp_transport
+
+    email = estadisticas_email()
+    hash_ = estadisticas_hash()
+    auditoria = estadisticas_auditoria()
+    metricas = [
+        ("email_envios_en_curso", "gauge", "Emails enviándose en el executor", [({}, email["en_curso"])]),
+        ("email_envios_total", "counter", "Emails procesados por resultado",
+         [({"resultado": "enviado"}, email["enviados"]), ({"resultado": "fallido"}, email["fallidos"])]),
+        ("pdf_pendientes", "gauge", "PDFs en generación o en cola", [({}, estadisticas_pdf()["pendientes"])]),
+        ("hash_en_curso", "gauge", "Operaciones bcrypt en curso", [({}, hash_["en_curso"])]),
+        ("hash_en_cola", "gauge", "Operaciones bcrypt esperando un proceso", [({}, hash_["en_cola"])]),
+        ("hash_rechazadas_total", "counter", "Logins rechazados con 503", [({}, hash_["rechazadas"])]),
+        ("auditoria_registros_total", "counter", "Registros de auditoría escritos", [({}, auditoria["registros"])]),
+        ("auditoria_escritura_segundos_total", "counter", "Tiempo escribiendo registros de auditoría",
+         [({}, auditoria["segundos"])]),
+    ]
+    # El pool SMTP se crea con el primer envío
+    if smtp_transport._pool is not None:
+        smtp = smtp_transport._pool.estadisticas()
+        metricas.append(("smtp_conexiones_libres", "gauge", "Conexiones SMTP abiertas sin usar", [({}, smtp["libres"])]))
+        metricas.append(("smtp_reconexiones_total", "counter", "Reconexiones SMTP", [({}, smtp["reconexiones"])]))
+    return metricas
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _formatear(nombre: str, tipo: str, ayuda: str, muestras: List[Muestra]) -> List[str]:
+    lineas = [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} {tipo}"]
+    for etiquetas, valor in muestras:
+        texto = ",".join(f'{clave}="{_escapar(str(v))}"' for clave, v in etiquetas.items())
+        lineas.append(f"{nombre}{{{texto}}} {valor}" if texto else f"{nombre} {valor}")
+    return lineas
+
+
+def exponer() -> str:
+    """Todas las métricas en formato de texto de Prometheus"""
+    lineas = _formatear("http_solicitudes_en_curso", "gauge", "Solicitudes HTTP en curso", [({}, _en_curso["http"])])
+    lineas += [
+        "# HELP http_solicitud_duracion_segundos Latencia de las solicitudes HTTP por ruta",
+        "# TYPE http_solicitud_duracion_segundos histogram",
+    ]
+    lineas += latencia_http.lineas("http_solicitud_duracion_segundos")
+    for recolector in _recolectores:
+        try:
+            metricas = recolector()
+        except Exception:
+            # Una fuente con error no debe dejar sin métricas al resto
+            logger.exception("Error recolectando métricas", extra={"recolector": recolector.__name__})
+            continue
+        for nombre, tipo, ayuda, muestras in metricas:
+            lineas += _formatear(nombre, tipo, ayuda, muestras)
+    return "\n".join(lineas) + "\n"
+
+
+def autorizado(cabecera: Optional[str], token: Optional[str]) -> bool:
+    """Sin METRICAS_TOKEN configurado /metrics es abierto (red interna); con token exige Bearer"""
+    return not token or cabecera == f"Bearer {token}"
@@ -0,0 +1,147 @@
+"""
+Migraciones del esquema y de los datos por defecto.
+
+El arranque de cada worker solo verifica, con una consulta a
+`version_esquema`, que la base esté en ESQUEMA_VERSION / DATOS_VERSION. La
+creación de tablas y la carga de datos por defecto se ejecutan una vez por
+despliegue con:
+
+    python -m app.core.migraciones            # aplica lo pendiente
+    python -m app.core.migraciones --estado   # solo muestra las versiones
+    python -m app.core.migraciones --forzar   # reaplica aunque esté al día
+
+Subir ESQUEMA_VERSION al agregar tablas o modelos, y DATOS_VERSION al cambiar
+los datos por defecto (usuarios, CIE-10). create_all solo crea tablas
+faltantes: los cambios de columnas en tablas existentes siguen siendo scripts
+SQL manuales (ver DB/).
+"""
+import argparse
+import sys
+from typing import Optional, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core import database
+from app.core.database import SessionLocal
+from app.models.version_esquema import VersionEsquema
+
+ESQUEMA_VERSION = 2  # 2: versiones_catalogo (ETag de catálogos)
+DATOS_VERSION = 3  # 2: pacientes con activo=NULL pasan a activo=True; 3: ídem citas, médicos, medicamentos, historias y farmacias
+
+_ID_VERSION = 1
+
+
+def leer_version() -> Optional[Tuple[int, int]]:
+    """(version_esquema, version_datos) registradas, o None si la tabla no existe o está vacía"""
+    # Todos los modelos deben estar registrados antes de la primera consulta ORM
+    # (las relaciones se declaran con nombres de clase)
+    database.importar_modelos()
+    db = SessionLocal()
+    try:
+        return db.query(
+            VersionEsquema.version_esquema, VersionEsquema.version_datos
+        ).filter(VersionEsquema.id == _ID_VERSION).one_or_none()
+    except SQLAlchemyError:
+        return None
+    finally:
+        db.close()
+
+
+def esquema_actualizado() -> bool:
+    version = leer_version()
+    return version is not None and version[0] >= ESQUEMA_VERSION and version[1] >= DATOS_VERSION
+
+
+def _registrar_version():
+    db = SessionLocal()
+    try:
+        db.merge(VersionEsquema(
+            id=_ID_VERSION, version_esquema=ESQUEMA_VERSION, version_datos=DATOS_VERSION
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _inicializar_versiones_catalogo():
+    from app.services.version_catalogo_service import inicializar_versiones
+    db = SessionLocal()
+    try:
+        inicializar_versiones(db)
+    finally:
+        db.close()
+
+
+def _activar_registros_sin_activo():
+    """
+    Registros previos al borrado lógico (activo=NULL): un UPDATE por tabla en
+    lugar de corregirlos en cada GET, que con réplica corre en una sesión de
+    solo lectura
+    """
+    from sqlalchemy import update
+    from app.models.cita import Cita
+    from app.models.farmacia import Farmacia
+    from app.models.historia import Historia
+    from app.models.medicamento import Medicamento
+    from app.models.medico import Medico
+    from app.models.paciente import Paciente
+    db = SessionLocal()
+    try:
+        for modelo in (Paciente, Cita, Medico, Medicamento, Historia, Farmacia):
+            corregidos = db.execute(
+                update(modelo).where(modelo.activo.is_(None)).values(activo=True)
+            ).rowcount
+            if corregidos:
+                print(f"🔧 {corregidos} registros de {modelo.__tablename__} con activo=NULL marcados como activos")
+        db.commit()
+    finally:
+        db.close()
+
+
+def migrar(forzar: bool = False) -> bool:
+    """
+    Crea las tablas faltantes y carga los datos por defecto si la versión
+    registrada es anterior. Retorna True si la base quedó al día.
+    """
+    # Import diferido: init_data importa modelos y seguridad (bcrypt)
+    from app.core.init_data import initialize_default_data
+
+    version = leer_version()
+    esquema, datos = tuple(version) if version else (0, 0)
+
+    if forzar or esquema < ESQUEMA_VERSION:
+        print(f"📊 Migrando esquema {esquema} → {ESQUEMA_VERSION}...")
+        database.init_db()
+        _inicializar_versiones_catalogo()
+    if forzar or datos < DATOS_VERSION:
+        print(f"📊 Cargando datos por defecto {datos} → {DATOS_VERSION}...")
+        if not initialize_default_data():
+            print("❌ La carga de datos por defecto falló; la versión no se registra")
+            return False
+        _activar_registros_sin_activo()
+
+    _registrar_version()
+    print(f"✅ Base de datos en versión {ESQUEMA_VERSION}.{DATOS_VERSION}")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migraciones de la base de datos")
+    parser.add_argument("--estado", action="store_true", help="Solo mostrar la versión registrada")
+    parser.add_argument("--forzar", action="store_true", help="Reaplicar aunque la versión esté al día")
+    args = parser.parse_args()
+
+    if args.estado:
+        version = leer_version()
+        actual = f"{version[0]}.{version[1]}" if version else "sin registrar"
+        print(f"Versión registrada: {actual} | requerida: {ESQUEMA_VERSION}.{DATOS_VERSION}")
+        sys.exit(0 if esquema_actualizado() else 1)
+
+    if not args.forzar and esquema_actualizado():
+        print(f"✅ Base de datos al día (versión {ESQUEMA_VERSION}.{DATOS_VERSION})")
+        return
+    sys.exit(0 if migrar(forzar=args.forzar) else 1)
+
+
+if __name__ == "__main__":
+    main()
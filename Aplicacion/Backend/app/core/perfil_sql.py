@@ -0,0 +1,170 @@
+"""
+Perfil de SQL por solicitud y detector de N+1 (opcional, PERFIL_SQL_ACTIVO).
+
+Con los eventos before/after_cursor_execute de SQLAlchemy se cuenta cada
+consulta que llega al driver (engines sync y async, primaria y réplica):
+cantidad, tiempo total en la base y "formas" repetidas. La forma es el SQL
+sin valores literales y con las listas IN colapsadas, así que 40 consultas
+`SELECT ... FROM historias WHERE historias.paciente_id = ?` dentro de una
+solicitud cuentan como una forma repetida 40 veces: la firma de un N+1.
+
+- PerfilSQLMiddleware mide cada solicitud HTTP. Si pasa los umbrales
+  (consultas o repeticiones de una forma) lo registra con la ruta, y con
+  `cabecera=True` agrega X-SQL-Consultas y Server-Timing a la respuesta. Las
+  consultas hechas después de enviar las cabeceras (streaming) solo
+  aparecen en el log.
+- medir_sql() mide un bloque de código (lo usa el plugin de pytest,
+  app/core/pytest_perfil_sql.py).
+
+Los eventos se registran recién al activar el perfil: apagado no cuesta nada.
+"""
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.logger import obtener_logger
+
+logger = obtener_logger("perfil_sql")
+
+_LITERALES = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_LISTAS_IN = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|%\(\w+\)s))*\s*\)")
+_ESPACIOS = re.compile(r"\s+")
+
+
+def forma_sql(sql: str) -> str:
+    """SQL normalizado: sin literales, listas IN como (...) y espacios simples"""
+    sql = _LITERALES.sub("?", sql)
+    sql = _LISTAS_IN.sub("(...)", sql)
+    return _ESPACIOS.sub(" ", sql).strip()
+
+
+class PerfilSQL:
+    """Consultas de una solicitud (o de un bloque medido con medir_sql)"""
+
+    def __init__(self):
+        self.consultas = 0
+        self.segundos = 0.0
+        self.formas: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def registrar(self, sql: str, segundos: float):
+        forma = forma_sql(sql)
+        # Los endpoints sync y sus dependencias corren en hilos distintos del threadpool
+        with self._lock:
+            self.consultas += 1
+            self.segundos += segundos
+            self.formas[forma] += 1
+
+    def repetidas(self, minimo: int = 2) -> List[Tuple[str, int]]:
+        """Formas ejecutadas al menos `minimo` veces, de la más repetida a la menos"""
+        return [(forma, n) for forma, n in self.formas.most_common() if n >= minimo]
+
+    @property
+    def max_repeticiones(self) -> int:
+        return max(self.formas.values(), default=0)
+
+    def resumen(self, max_formas: int = 3, largo: int = 200) -> str:
+        texto = f"{self.consultas} consultas en {self.segundos * 1000:.1f} ms"
+        for forma, n in self.repetidas()[:max_formas]:
+            texto += f"\n    {n}x {forma[:largo]}"
+        return texto
+
+
+# Perfil de la solicitud en curso (lo fija el middleware; los hilos del threadpool lo heredan)
+_perfil_actual: ContextVar[Optional[PerfilSQL]] = ContextVar("perfil_sql", default=None)
+# Perfiles de medir_sql(): reciben todas las consultas del proceso, sin importar el contexto
+_perfiles_globales: List[PerfilSQL] = []
+_instalado = False
+_lock_instalacion = threading.Lock()
+
+
+def _antes(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("perfil_sql_inicio", []).append(time.perf_counter())
+
+
+def _despues(conn, cursor, statement, parameters, context, executemany):
+    inicios = conn.info.get("perfil_sql_inicio")
+    if not inicios:
+        return
+    segundos = time.perf_counter() - inicios.pop()
+    perfil = _perfil_actual.get()
+    if perfil is not None:
+        perfil.registrar(statement, segundos)
+    for global_ in list(_perfiles_globales):
+        global_.registrar(statement, segundos)
+
+
+def instalar_eventos():
+    """Registra los eventos en todos los Engine (una sola vez por proceso)"""
+    global _instalado
+    with _lock_instalacion:
+        if _instalado:
+            return
+        event.listen(Engine, "before_cursor_execute", _antes)
+        event.listen(Engine, "after_cursor_execute", _despues)
+        _instalado = True
+
+
+@contextmanager
+def medir_sql():
+    """Cuenta todas las consultas del proceso dentro del bloque (pruebas y benchmarks)"""
+    instalar_eventos()
+    perfil = PerfilSQL()
+    _perfiles_globales.append(perfil)
+    try:
+        yield perfil
+    finally:
+        _perfiles_globales.remove(perfil)
+
+
+class PerfilSQLMiddleware:
+    """Mide las consultas de cada solicitud HTTP; ver el docstring del módulo"""
+
+    def __init__(self, app: ASGIApp, max_consultas: int = 20, max_repeticiones: int = 5,
+                 cabecera: bool = False):
+        self.app = app
+        self.max_consultas = max_consultas
+        self.max_repeticiones = max_repeticiones
+        self.cabecera = cabecera
+        instalar_eventos()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        perfil = PerfilSQL()
+        token = _perfil_actual.set(perfil)
+
+        async def enviar(mensaje: Message):
+            if self.cabecera and mensaje["type"] == "http.response.start":
+                cabeceras = MutableHeaders(scope=mensaje)
+                cabeceras["X-SQL-Consultas"] = f"{perfil.consultas}; repeticiones={perfil.max_repeticiones}"
+                cabeceras.append("Server-Timing", f'db;dur={perfil.segundos * 1000:.1f};desc="{perfil.consultas} consultas"')
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _perfil_actual.reset(token)
+            self._reportar(scope, perfil)
+
+    def _reportar(self, scope: Scope, perfil: PerfilSQL):
+        if perfil.consultas <= self.max_consultas and perfil.max_repeticiones <= self.max_repeticiones:
+            return
+        ruta = getattr(scope.get("route"), "path", None) or scope["path"]
+        posible_n1 = " (posible N+1)" if perfil.max_repeticiones > self.max_repeticiones else ""
+        logger.warning(f"SQL {scope['method']} {ruta}{posible_n1}: {perfil.resumen()}", extra={
+            "ruta": ruta, "consultas": perfil.consultas,
+            "repeticiones": perfil.max_repeticiones, "ms_db": round(perfil.segundos * 1000, 1),
+        })
+
@@ -1,33 +1,97 @@
+import time
+from typing import Optional
 from fastapi import HTTPException, status, Depends
 from jose import jwt, JWTError
 from app.core.config import settings
+from app.core.cache import clave_token, crear_cache
+from app.core.database import SessionLocal
+from app.models.empleado import Empleado, EstadoEmpleado
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 security = HTTPBearer()
 
+# Tokens ya verificados -> principal (id, cargo y datos de visualización).
+# Cada entrada vive hasta el `exp` del token o PRINCIPAL_TTL_SEGUNDOS, lo que
+# ocurra primero; ese TTL es también el retraso máximo con el que otros
+# workers ven la desactivación de un usuario.
+PRINCIPAL_TTL_SEGUNDOS = 300
+_cache_principales = crear_cache("principales", max_entradas=4096, ttl_segundos=PRINCIPAL_TTL_SEGUNDOS)
+
+
+def _cargar_principal(user_id: int) -> Optional[dict]:
+    """Carga los datos del empleado; None si no existe o no está activo"""
+    db = SessionLocal()
+    try:
+        fila = db.query(
+            Empleado.id, Empleado.nombre, Empleado.apellido, Empleado.email,
+            Empleado.cargo, Empleado.activo, Empleado.estado
+        ).filter(Empleado.id == user_id).first()
+    finally:
+        db.close()
+
+    if not fila or fila.activo is False:
+        return None
+    if fila.estado is not None and fila.estado != EstadoEmpleado.ACTIVO:
+        return None
+
+    return {
+        "id": fila.id,
+        "cargo": fila.cargo,
+        "nombre": fila.nombre,
+        "apellido": fila.apellido,
+        "nombre_completo": f"{fila.nombre} {fila.apellido}",
+        "email": fila.email
+    }
+
+
+def invalidar_principal(empleado_id: int):
+    """
+    Descarta los tokens cacheados de un empleado (desactivación, cambio de
+    cargo o de datos). Su siguiente solicitud vuelve a validarse contra la BD.
+    """
+    _cache_principales.invalidar_donde(lambda principal: principal["id"] == empleado_id)
+
+
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """
-    Obtiene el usuario actual desde el token JWT
+    Obtiene el usuario actual desde el token JWT.
+    Retorna id, cargo, nombre, apellido, nombre_completo y email del empleado.
     """
+    token = credentials.credentials
+    clave = clave_token(token)
+    principal = _cache_principales.obtener(clave)
+    if principal is not None:
+        return dict(principal)
+
     try:
-        token = credentials.credentials
         payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
         user_id = payload.get("sub")
-        cargo = payload.get("cargo")
         
         if user_id is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token inválido"
             )
-        
-        return {"id": int(user_id), "cargo": cargo}
-    except JWTError:
+        user_id = int(user_id)
+    except (JWTError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="No se pudo validar las credenciales"
         )
 
+    principal = _cargar_principal(user_id)
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Usuario inactivo o inexistente"
+        )
+
+    exp = payload.get("exp")
+    ttl = PRINCIPAL_TTL_SEGUNDOS if exp is None else min(PRINCIPAL_TTL_SEGUNDOS, exp - time.time())
+    if ttl > 0:
+        _cache_principales.guardar(clave, principal, ttl_segundos=ttl)
+    return dict(principal)
+
 def require_role(allowed_roles: list):
     """
     Decorador para verificar que el usuario tenga un rol permitido
@@ -0,0 +1,74 @@
+"""
+Plugin de pytest para fijar un presupuesto de consultas SQL por endpoint.
+
+Se registra en tests/conftest.py, después de fijar las variables de entorno
+que exige Settings:
+
+    pytest_plugins = ["app.core.pytest_perfil_sql"]
+
+(`pytest -p app.core.pytest_perfil_sql` no sirve: el plugin se importaría
+antes que el conftest y Settings fallaría por las variables faltantes.)
+
+Uso con el fixture, para medir solo la llamada al endpoint:
+
+    def test_listar_citas(client, presupuesto_sql):
+        with presupuesto_sql(consultas=3, repeticiones=1):
+            client.get("/citas/")
+
+O con el marcador, para medir toda la prueba:
+
+    @pytest.mark.presupuesto_sql(consultas=5)
+    def test_disponibilidad(client): ...
+
+`consultas` es el máximo de consultas y `repeticiones` el máximo de veces
+que puede repetirse una misma forma de SQL (1 = ninguna repetida; un N+1
+lo supera en cuanto hay más de una fila).
+"""
+from contextlib import contextmanager
+from typing import Optional
+
+import pytest
+
+from app.core.perfil_sql import PerfilSQL, medir_sql
+
+
+def verificar_presupuesto(perfil: PerfilSQL, consultas: Optional[int] = None, repeticiones: Optional[int] = None):
+    """Falla la prueba si el perfil supera el presupuesto"""
+    errores = []
+    if consultas is not None and perfil.consultas > consultas:
+        errores.append(f"{perfil.consultas} consultas (máximo {consultas})")
+    if repeticiones is not None and perfil.max_repeticiones > repeticiones:
+        errores.append(f"una consulta repetida {perfil.max_repeticiones} veces (máximo {repeticiones})")
+    if errores:
+        pytest.fail(f"Presupuesto SQL excedido: {', '.join(errores)}\n{perfil.resumen(max_formas=5)}", pytrace=False)
+
+
+@pytest.fixture
+def presupuesto_sql():
+    """Context manager que mide el bloque y verifica el presupuesto al salir"""
+
+    @contextmanager
+    def _presupuesto(consultas: Optional[int] = None, repeticiones: Optional[int] = None):
+        with medir_sql() as perfil:
+            yield perfil
+        verificar_presupuesto(perfil, consultas, repeticiones)
+
+    return _presupuesto
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "presupuesto_sql(consultas=None, repeticiones=None): máximo de consultas SQL de la prueba"
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    marcador = item.get_closest_marker("presupuesto_sql")
+    if marcador is None:
+        return (yield)
+    # Si la prueba falla por otra causa, el yield relanza ese error y no se verifica el presupuesto
+    with medir_sql() as perfil:
+        resultado = yield
+    verificar_presupuesto(perfil, **marcador.kwargs)
+    return resultado
@@ -3,7 +3,9 @@ from datetime import datetime, timedelta
 from jose import jwt
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Los hashes con otro número de rondas se marcan como desactualizados y se
+# regeneran en el siguiente inicio de sesión correcto (verify_and_update_password)
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 def get_password_hash(password: str) -> str:
     """
@@ -18,6 +20,13 @@ def get_password_hash(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str):
+    """
+    Retorna (válida, nuevo_hash). nuevo_hash no es None cuando la contraseña es
+    válida pero el hash usa un costo distinto de BCRYPT_ROUNDS
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: int = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES if not expires_delta else expires_delta)
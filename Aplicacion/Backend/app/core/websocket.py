@@ -10,6 +10,9 @@ from fastapi import WebSocket, WebSocketDisconnect
 from typing import Dict, List
 import json
 from datetime import datetime
+from app.utils.logger import obtener_logger
+
+logger = obtener_logger("websocket")
 
 class ConnectionManager:
     """Gestiona las conexiones WebSocket activas"""
@@ -38,7 +41,10 @@ class ConnectionManager:
         if user_role in self.connections_by_role:
             self.connections_by_role[user_role].append(websocket)
         
-        print(f"✅ Usuario {user_id} ({user_role}) conectado. Total conexiones: {self.get_total_connections()}")
+        logger.info("Usuario conectado", extra={
+            "evento": "websocket.conexion", "usuario_id": user_id, "rol": user_role,
+            "conexiones": self.get_total_connections(),
+        })
     
     def disconnect(self, websocket: WebSocket, user_id: int, user_role: str):
         """Desconecta un cliente WebSocket"""
@@ -54,7 +60,10 @@ class ConnectionManager:
             if websocket in self.connections_by_role[user_role]:
                 self.connections_by_role[user_role].remove(websocket)
         
-        print(f"❌ Usuario {user_id} ({user_role}) desconectado. Total conexiones: {self.get_total_connections()}")
+        logger.info("Usuario desconectado", extra={
+            "evento": "websocket.conexion", "usuario_id": user_id, "rol": user_role,
+            "conexiones": self.get_total_connections(),
+        })
     
     async def send_personal_message(self, message: dict, user_id: int):
         """Envía un mensaje a un usuario específico"""
@@ -64,7 +73,7 @@ class ConnectionManager:
                 try:
                     await connection.send_json(message)
                 except Exception as e:
-                    print(f"Error enviando mensaje a usuario {user_id}: {e}")
+                    logger.warning("Error enviando mensaje a usuario", extra={"usuario_id": user_id, "error": str(e)})
     
     async def send_to_role(self, message: dict, role: str):
         """Envía un mensaje a todos los usuarios de un rol específico"""
@@ -75,7 +84,7 @@ class ConnectionManager:
                 try:
                     await connection.send_json(message)
                 except Exception as e:
-                    print(f"Error enviando mensaje a rol {role}: {e}")
+                    logger.warning("Error enviando mensaje a rol", extra={"rol": role, "error": str(e)})
                     disconnected.append(connection)
             
             # Limpiar conexiones muertas
@@ -91,7 +100,7 @@ class ConnectionManager:
                 try:
                     await connection.send_json(message)
                 except Exception as e:
-                    print(f"Error en broadcast a usuario {user_id}: {e}")
+                    logger.warning("Error en broadcast a usuario", extra={"usuario_id": user_id, "error": str(e)})
     
     def get_total_connections(self) -> int:
         """Retorna el total de conexiones activas"""
@@ -1,9 +1,21 @@
-from fastapi import FastAPI
+import asyncio
+
+from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
-from scalar_fastapi import get_scalar_api_reference
 
-from app.core import config, database
-from app.core.init_data import initialize_default_data
+from app.core import config, database, migraciones
+from app.core.compresion import CompresionMiddleware
+from app.core.metricas import TIPO_CONTENIDO, MetricasMiddleware, autorizado, exponer
+from app.core.perfil_sql import PerfilSQLMiddleware
+from app.core.cache import estadisticas_caches
+from app.core.permissions import super_admin_only
+from app.services.password_service import cerrar_pool_hash, estadisticas_hash
+from app.services.pdf_service import cerrar_pool_pdf
+from app.services.recordatorio_service import programar_recordatorios
+from app.utils.qr_utils import estadisticas_qr
+from app.utils.smtp_transport import cerrar_pool_smtp
+from app.utils.logger import configurar_logging, detener_logging
 from app.routes import (
     auth_routes, empleado_routes, paciente_routes, medico_routes,
     cita_routes, historia_routes, consulta_routes, farmacia_routes, medicamento_routes,
@@ -30,6 +42,35 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    # Perfil de SQL (opcional): reporta solicitudes con muchas consultas o N+1
+    if config.settings.PERFIL_SQL_ACTIVO:
+        app.add_middleware(
+            PerfilSQLMiddleware,
+            max_consultas=config.settings.PERFIL_SQL_MAX_CONSULTAS,
+            max_repeticiones=config.settings.PERFIL_SQL_MAX_REPETICIONES,
+            cabecera=config.settings.PERFIL_SQL_CABECERA,
+        )
+    
+    # Compresión (listados JSON y expediente); PDFs e imágenes se envían tal cual
+    if config.settings.COMPRESION_ACTIVA:
+        app.add_middleware(
+            CompresionMiddleware,
+            minimo_bytes=config.settings.COMPRESION_MINIMO_BYTES,
+            nivel_gzip=config.settings.COMPRESION_NIVEL_GZIP,
+            nivel_brotli=config.settings.COMPRESION_NIVEL_BROTLI,
+            usar_brotli=config.settings.COMPRESION_BROTLI,
+        )
+    
+    # Métricas: el más externo, para medir también la compresión
+    if config.settings.METRICAS_ACTIVAS:
+        app.add_middleware(MetricasMiddleware)
+        
+        @app.get("/metrics", include_in_schema=False)
+        def metrics(request: Request):
+            if not autorizado(request.headers.get("authorization"), config.settings.METRICAS_TOKEN):
+                raise HTTPException(status_code=401, detail="Token de métricas inválido")
+            return Response(content=exponer(), media_type=TIPO_CONTENIDO)
+    
     # Ruta raíz de bienvenida
     @app.get("/", tags=["Sistema"])
     def root():
@@ -44,10 +85,22 @@ def create_app() -> FastAPI:
             "estado": "activo"
         }
     
+    # Estadísticas de las cachés en memoria del worker (aciertos, fallos, desalojos),
+    # incluida la caché de PNGs de QR del proceso del API
+    @app.get("/cache/estadisticas", tags=["Sistema"])
+    def cache_estadisticas(current_user: dict = Depends(super_admin_only)):
+        return {**estadisticas_caches(), "qr_png": estadisticas_qr()}
+    
+    # Pool de bcrypt: operaciones en curso, en cola, rechazadas y tiempos promedio
+    @app.get("/seguridad/hash/estadisticas", tags=["Sistema"])
+    def hash_estadisticas(current_user: dict = Depends(super_admin_only)):
+        return estadisticas_hash()
+    
     # Ruta para Scalar API Reference - Configuración avanzada
     @app.get("/scalar", include_in_schema=False)
     async def scalar_html():
-        from scalar_fastapi import Theme, Layout, SearchHotKey
+        # Import diferido: solo se necesita al abrir la documentación
+        from scalar_fastapi import get_scalar_api_reference, Theme, Layout, SearchHotKey
         return get_scalar_api_reference(
             openapi_url=app.openapi_url,
             title=app.title,
@@ -113,12 +166,38 @@ def create_app() -> FastAPI:
 
     @app.on_event("startup")
     def startup():
+        # Reinicia el listener de logs si un apagado anterior lo detuvo
+        configurar_logging()
         print("🚀 Iniciando Sistema de Gestión Médica...")
-        database.init_db()
-        print("📊 Inicializando datos por defecto...")
-        initialize_default_data()
+        # Una consulta a version_esquema: con la base al día no se reflejan
+        # tablas ni se revisan los datos por defecto en cada worker
+        if not migraciones.esquema_actualizado():
+            if not config.settings.MIGRAR_AL_INICIAR:
+                raise RuntimeError(
+                    "La base de datos no está en la versión requerida: "
+                    "ejecute `python -m app.core.migraciones` antes de iniciar"
+                )
+            migraciones.migrar()
         print("✅ Sistema listo!")
 
+    tareas_fondo = []
+
+    @app.on_event("startup")
+    async def iniciar_tareas_fondo():
+        if config.settings.RECORDATORIOS_ACTIVOS:
+            tareas_fondo.append(asyncio.create_task(programar_recordatorios()))
+            print(f"🔔 Recordatorios de citas programados a las {config.settings.RECORDATORIOS_HORA}:00")
+
+    @app.on_event("shutdown")
+    async def shutdown():
+        for tarea in tareas_fondo:
+            tarea.cancel()
+        cerrar_pool_pdf()
+        cerrar_pool_hash()
+        cerrar_pool_smtp()
+        await database.cerrar_async_engine()
+        detener_logging()
+
     return app
 
 app = create_app()
@@ -15,3 +15,14 @@ class Historia(Base, SoftDeleteMixin):
     
     # Relación 1:1 con Paciente
     paciente = relationship("Paciente", back_populates="historia", uselist=False)
+
+
+class SecuenciaHistoria(Base):
+    """
+    Contador diario para los números de historia clínica (HCL-YYYYMMDD-NNNN).
+    Una fila por día; ultimo_numero es el último secuencial entregado.
+    """
+    __tablename__ = "secuencias_historia"
+
+    fecha = Column(String(8), primary_key=True)  # YYYYMMDD
+    ultimo_numero = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text
+from datetime import datetime
+from app.core.database import Base
+
+class RecordatorioCita(Base):
+    """
+    Estado del recordatorio por email de cada cita (RF-001).
+    Una fila por cita (cita_id único): el job de recordatorios la reclama antes
+    de enviar, por lo que reinicios o varios workers no duplican envíos.
+    """
+    __tablename__ = "recordatorios_cita"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cita_id = Column(Integer, ForeignKey("citas.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
+    estado = Column(String(20), nullable=False, default="enviando")  # enviando, enviado, fallido
+    email = Column(String(150), nullable=True)
+    intentos = Column(Integer, nullable=False, default=0)
+    fecha_envio = Column(DateTime, nullable=True)
+    error = Column(Text, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
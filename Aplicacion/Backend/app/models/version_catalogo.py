@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from app.core.database import Base
+
+class VersionCatalogo(Base):
+    """
+    Contador de versión por catálogo de referencia (medicamentos, médicos,
+    farmacias, diagnósticos, empleados). Se incrementa después del commit de
+    cada escritura ORM sobre el catálogo; los listados lo usan como ETag.
+    """
+    __tablename__ = "versiones_catalogo"
+
+    catalogo = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    fecha_actualizacion = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
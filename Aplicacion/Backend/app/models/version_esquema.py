@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, DateTime
+from datetime import datetime
+from app.core.database import Base
+
+class VersionEsquema(Base):
+    """
+    Versión del esquema y de los datos por defecto aplicados a la base.
+    Una sola fila (id=1): el arranque la lee con una consulta y, si está al
+    día, omite create_all y la carga de datos por defecto.
+    """
+    __tablename__ = "version_esquema"
+
+    id = Column(Integer, primary_key=True)
+    version_esquema = Column(Integer, nullable=False)
+    version_datos = Column(Integer, nullable=False)
+    fecha_actualizacion = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
-from app.core.database import SessionLocal
+from app.core.database import get_db
 from app.schemas.asistencia_schema import AsistenciaCreate, AsistenciaOut, AsistenciaRegistroSalida
 from app.services.asistencia_service import (
     registrar_entrada, 
@@ -14,13 +14,6 @@ from app.core.permissions import get_current_user, admin_only
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/entrada", response_model=AsistenciaOut)
 def marcar_entrada(
     observaciones: Optional[str] = None,
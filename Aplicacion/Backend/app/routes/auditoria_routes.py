@@ -6,6 +6,7 @@ from app.core.permissions import super_admin_only
 from app.schemas.auditoria_schema import AuditoriaResponse, AuditoriaFilter, AuditoriaCreate
 from app.services.auditoria_service import auditoria_service
 from app.models.empleado import Empleado
+from app.utils.respuesta_json import ORJSONResponse
 
 router = APIRouter(tags=["Auditoría"])
 
@@ -37,7 +38,8 @@ def listar_auditoria(
     )
     
     registros = auditoria_service.listar(db, filtros=filtros, skip=skip, limit=limit)
-    return registros
+    # response_model solo documenta: las filas ya vienen como diccionarios
+    return ORJSONResponse(registros)
 
 @router.get("/estadisticas")
 def obtener_estadisticas_auditoria(
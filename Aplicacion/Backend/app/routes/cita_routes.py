@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Body
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, Request
+from fastapi.responses import Response, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from starlette.background import BackgroundTask
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date, datetime
-from app.core.database import SessionLocal
+from app.core.database import get_async_db, get_db
 from app.schemas.cita_schema import CitaCreate, CitaOut, CitaUpdate
 from app.services.cita_service import (
     create_cita, get_cita, list_citas, update_cita, delete_cita,
@@ -12,32 +16,33 @@ from app.services.cita_service import (
 )
 from app.core.permissions import get_current_user, admin_only, medical_staff
 from app.models.medico import Medico
-from app.models.paciente import Paciente
-from app.utils.pdf_generator import generar_comprobante_cita_pdf
+from app.services.pdf_service import (
+    CitaPDF, MedicoPDF, PacientePDF, renderizar_comprobante_cita,
+    renderizar_lote, reservar_capacidad_lote
+)
+from app.services.pdf_cache_service import es_cacheable, servir_pdf
+from app.services.resumen_service import obtener_medico_resumen
+from app.utils.qr_utils import ERROR_CORRECT_L, etag_qr, generar_qr_png
+from app.utils.respuesta_json import ORJSONResponse
+from app.utils.zip_stream import zip_en_streaming
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/", response_model=CitaOut)
 def create(payload: CitaCreate, db: Session = Depends(get_db), current_user: dict = Depends(medical_staff)):
     """Crear cita médica con validaciones (RF-001)"""
     return create_cita(db, payload, current_user["id"])
 
 @router.get("/", response_model=List[CitaOut])
-def all(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+async def all(db: AsyncSession = Depends(get_async_db), current_user: dict = Depends(get_current_user)):
     """Listar citas - Admin ve todas, médicos solo sus citas"""
     medico_id = None
     if current_user["cargo"] == "Medico":
-        medico = db.query(Medico).filter(Medico.empleado_id == current_user["id"]).first()
-        if medico:
-            medico_id = medico.id
-    return list_citas(db, medico_id)
+        medico_id = (await db.execute(
+            select(Medico.id).where(Medico.empleado_id == current_user["id"]).limit(1)
+        )).scalar()
+    # response_model solo documenta: las filas ya vienen como diccionarios
+    return ORJSONResponse(await list_citas(db, medico_id))
 
 @router.get("/fecha/{fecha}", response_model=List[CitaOut])
 def citas_por_fecha(fecha: date, medico_id: Optional[int] = None, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -49,6 +54,33 @@ def disponibilidad_medicos(fecha: Optional[date] = Query(None), especialidad: Op
     """Obtener disponibilidad de médicos por especialidad (RF-001)"""
     return obtener_disponibilidad_medicos(db, especialidad, fecha)
 
+def _trabajos_comprobantes(db: Session, fecha: date, medico_id: Optional[int]):
+    """DTOs de los comprobantes del día, cargados en una sola consulta"""
+    trabajos = []
+    for cita in obtener_citas_por_fecha(db, fecha, medico_id):
+        medico = None
+        if cita.medico and cita.medico.empleado:
+            medico = MedicoPDF.desde_orm(cita.medico.empleado)
+        dtos = (CitaPDF.desde_orm(cita), PacientePDF.desde_orm(cita.paciente), medico)
+        trabajos.append((f"comprobante_cita_{cita.id}.pdf", "cita", dtos))
+    return trabajos
+
+@router.get("/comprobantes")
+async def descargar_comprobantes_del_dia(fecha: date, medico_id: Optional[int] = None, db: Session = Depends(get_db), current_user: dict = Depends(medical_staff)):
+    """Descarga en un ZIP los comprobantes PDF de todas las citas de una fecha.
+    Los PDFs se generan en paralelo en el pool de procesos y el ZIP se envía a
+    medida que cada uno está listo."""
+    trabajos = await run_in_threadpool(_trabajos_comprobantes, db, fecha, medico_id)
+    if not trabajos:
+        raise HTTPException(404, "No hay citas para la fecha indicada")
+    reserva = reservar_capacidad_lote()
+    return StreamingResponse(
+        zip_en_streaming(renderizar_lote(trabajos, reserva)),
+        media_type="application/zip",
+        background=BackgroundTask(reserva.liberar),
+        headers={"Content-Disposition": f"attachment; filename=comprobantes_{fecha}.zip"}
+    )
+
 @router.get("/{cita_id}", response_model=CitaOut)
 def one(cita_id: int, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
     """Obtener una cita"""
@@ -58,10 +90,8 @@ def one(cita_id: int, db: Session = Depends(get_db), current_user: dict = Depend
     return cita
 
 @router.get("/{cita_id}/qr")
-def generar_qr_cita(cita_id: int, db: Session = Depends(get_db)):
+def generar_qr_cita(request: Request, cita_id: int, db: Session = Depends(get_db)):
     """Genera código QR con datos de la cita para escaneo rápido (acceso público)"""
-    import qrcode
-    import io
     import json
     from datetime import datetime as dt
     
@@ -69,16 +99,15 @@ def generar_qr_cita(cita_id: int, db: Session = Depends(get_db)):
     if not cita:
         raise HTTPException(404, "Cita no encontrada")
     
-    paciente = db.query(Paciente).filter(Paciente.id == cita.paciente_id).first()
+    paciente = cita.paciente
     
     medico_nombre = "Por asignar"
     medico_especialidad = "General"
     if cita.medico_id:
-        from app.models.medico import Medico
-        medico_obj = db.query(Medico).filter(Medico.id == cita.medico_id).first()
-        if medico_obj and medico_obj.empleado:
-            medico_nombre = f"{medico_obj.empleado.nombre} {medico_obj.empleado.apellido}"
-            medico_especialidad = medico_obj.especialidad or "General"
+        medico_resumen = obtener_medico_resumen(db, cita.medico_id)
+        if medico_resumen and medico_resumen["tiene_empleado"]:
+            medico_nombre = medico_resumen["nombre_completo"]
+            medico_especialidad = medico_resumen["especialidad"] or "General"
     
     # Formatear fecha y hora
     if isinstance(cita.fecha, dt):
@@ -102,48 +131,50 @@ def generar_qr_cita(cita_id: int, db: Session = Depends(get_db)):
         "url": f"http://localhost:5173/citas/{cita.id}"  # URL para ver detalles
     }
     
-    # Generar QR code
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
-    )
-    qr.add_data(json.dumps(qr_data, ensure_ascii=False))
-    qr.make(fit=True)
-    
-    # Crear imagen
-    img = qr.make_image(fill_color="black", back_color="white")
+    # El PNG se cachea por contenido: solo se regenera si cambian los datos
+    contenido_qr = json.dumps(qr_data, ensure_ascii=False)
+    etag = etag_qr(contenido_qr)
+    # Las citas en estado final no cambian; el resto se revalida con el ETag.
+    # "private": el QR contiene datos del paciente y no debe quedar en proxies
+    if es_cacheable("cita", cita.estado) or cita.estado == "cancelada":
+        cache_control = "private, max-age=86400"
+    else:
+        cache_control = "private, no-cache"
+    cabeceras = {"ETag": etag, "Cache-Control": cache_control}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=cabeceras)
     
-    # Guardar en buffer
-    img_buffer = io.BytesIO()
-    img.save(img_buffer, format='PNG')
-    img_buffer.seek(0)
+    png = generar_qr_png(contenido_qr, box_size=10, border=4, correccion=ERROR_CORRECT_L)
     
-    return StreamingResponse(
-        img_buffer,
+    return Response(
+        content=png,
         media_type="image/png",
         headers={
+            **cabeceras,
             "Content-Disposition": f"inline; filename=qr_cita_{cita.id}.png",
-            "X-QR-Data": json.dumps(qr_data, ensure_ascii=False)
+            "X-QR-Data": contenido_qr
         }
     )
 
-@router.get("/{cita_id}/comprobante/pdf")
-def descargar_comprobante(cita_id: int, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    """Genera comprobante de cita en PDF con código QR (RF-001)"""
+def _datos_comprobante_pdf(db: Session, cita_id: int):
+    """Carga cita, paciente y médico y los convierte en DTOs para el pool de PDFs"""
     cita = get_cita(db, cita_id)
     if not cita:
         raise HTTPException(404, "Cita no encontrada")
-    paciente = db.query(Paciente).filter(Paciente.id == cita.paciente_id).first()
     medico = None
-    if cita.medico_id:
-        from app.models.medico import Medico
-        medico_obj = db.query(Medico).filter(Medico.id == cita.medico_id).first()
-        if medico_obj:
-            medico = medico_obj.empleado
-    pdf_buffer = generar_comprobante_cita_pdf(cita, paciente, medico)
-    return StreamingResponse(pdf_buffer, media_type="application/pdf", headers={"Content-Disposition": f"attachment; filename=comprobante_cita_{cita.id}.pdf"})
+    if cita.medico and cita.medico.empleado:
+        medico = MedicoPDF.desde_orm(cita.medico.empleado)
+    return CitaPDF.desde_orm(cita), PacientePDF.desde_orm(cita.paciente), medico
+
+@router.get("/{cita_id}/comprobante/pdf")
+async def descargar_comprobante(request: Request, cita_id: int, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    """Genera comprobante de cita en PDF con código QR (RF-001), en el pool de procesos.
+    Los de citas completadas se sirven desde la caché en disco con ETag."""
+    cita, paciente, medico = await run_in_threadpool(_datos_comprobante_pdf, db, cita_id)
+    return await servir_pdf(
+        request, "cita", cita_id, cita.estado, (cita, paciente, medico),
+        renderizar_comprobante_cita, f"comprobante_cita_{cita_id}.pdf"
+    )
 
 @router.put("/{cita_id}", response_model=CitaOut)
 def update(cita_id: int, payload: CitaUpdate, db: Session = Depends(get_db), current_user: dict = Depends(medical_staff)):
@@ -2,25 +2,19 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.core.database import SessionLocal
+from app.core.database import get_db
 from app.schemas.consulta_schema import ConsultaCreate, ConsultaOut, ConsultaUpdate
 from app.services.consulta_service import create_consulta, list_consultas, get_consulta, update_consulta
-from app.utils.pdf_generator import generar_comprobante_cita_pdf
 from app.utils.email_utils import send_email
 from app.models.paciente import Paciente
 from app.models.cita import Cita
 from app.models.medico import Medico
 from app.models.empleado import Empleado
 from datetime import datetime
+from app.utils.logger import obtener_logger
 
 router = APIRouter()
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+logger = obtener_logger("consultas")
 
 @router.post("/", response_model=ConsultaOut)
 def create(payload: ConsultaCreate, db: Session = Depends(get_db)):
@@ -101,7 +95,8 @@ def generar_comprobante_consulta(
     
     cita_temp = CitaTemp(consulta)
     
-    # Generar PDF
+    # Generar PDF (ReportLab se importa solo cuando se genera un comprobante)
+    from app.utils.pdf_generator import generar_comprobante_cita_pdf
     try:
         pdf_buffer = generar_comprobante_cita_pdf(cita_temp, paciente, medico)
         
@@ -144,7 +139,7 @@ def generar_comprobante_consulta(
                     "destinatario": paciente.email
                 }
             except Exception as e:
-                print(f"Error al enviar email: {str(e)}")
+                logger.warning("Error al enviar el comprobante por email", extra={"consulta_id": consulta.id, "error": str(e)})
                 # Si falla el email, continuar y retornar el PDF
                 pdf_buffer.seek(0)
         
@@ -158,5 +153,5 @@ def generar_comprobante_consulta(
         )
     
     except Exception as e:
-        print(f"Error al generar comprobante: {str(e)}")
+        logger.exception("Error al generar comprobante", extra={"consulta_id": consulta_id})
         raise HTTPException(500, f"Error al generar comprobante: {str(e)}")
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
 from app.core.database import get_db
@@ -6,6 +6,7 @@ from app.core.permissions import super_admin_only, admin_only
 from app.schemas.empleado_schema import EmpleadoCreate, EmpleadoOut, EmpleadoUpdate
 from app.services.empleado_service import create_empleado, get_empleado, list_empleados, update_empleado, delete_empleado
 from app.services.auditoria_service import auditoria_service
+from app.services.version_catalogo_service import respuesta_condicional
 
 router = APIRouter()
 
@@ -23,12 +24,10 @@ def create(
     nuevo_empleado = create_empleado(db, payload)
     
     # Registrar en auditoría
-    from app.models.empleado import Empleado
-    usuario_actual_db = db.query(Empleado).filter(Empleado.id == current_user["id"]).first()
     auditoria_service.registrar_accion(
         db=db,
         usuario_id=current_user["id"],
-        usuario_nombre=f"{usuario_actual_db.nombre} {usuario_actual_db.apellido}" if usuario_actual_db else "Sistema",
+        usuario_nombre=current_user["nombre_completo"],
         usuario_cargo=current_user["cargo"],
         accion="CREATE",
         modulo="Empleados",
@@ -50,6 +49,7 @@ def create(
 @router.get("/", response_model=List[EmpleadoOut])
 def all_empleados(
     request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: dict = Depends(admin_only)
 ):
@@ -57,6 +57,9 @@ def all_empleados(
     Lista todos los empleados del sistema.
     Accesible para Admin General y Administrador.
     """
+    no_modificado = respuesta_condicional(db, request, response, "empleados")
+    if no_modificado:
+        return no_modificado
     return list_empleados(db)
 
 @router.get("/{empleado_id}", response_model=EmpleadoOut)
@@ -104,12 +107,10 @@ def modify(
     empleado_actualizado = update_empleado(db, empleado_id, payload)
     
     # Registrar en auditoría
-    from app.models.empleado import Empleado
-    usuario_actual_db = db.query(Empleado).filter(Empleado.id == current_user["id"]).first()
     auditoria_service.registrar_accion(
         db=db,
         usuario_id=current_user["id"],
-        usuario_nombre=f"{usuario_actual_db.nombre} {usuario_actual_db.apellido}" if usuario_actual_db else "Sistema",
+        usuario_nombre=current_user["nombre_completo"],
         usuario_cargo=current_user["cargo"],
         accion="UPDATE",
         modulo="Empleados",
@@ -157,12 +158,10 @@ def remove(
     delete_empleado(db, empleado_id)
     
     # Registrar en auditoría
-    from app.models.empleado import Empleado
-    usuario_actual_db = db.query(Empleado).filter(Empleado.id == current_user["id"]).first()
     auditoria_service.registrar_accion(
         db=db,
         usuario_id=current_user["id"],
-        usuario_nombre=f"{usuario_actual_db.nombre} {usuario_actual_db.apellido}" if usuario_actual_db else "Sistema",
+        usuario_nombre=current_user["nombre_completo"],
         usuario_cargo=current_user["cargo"],
         accion="DELETE",
         modulo="Empleados",
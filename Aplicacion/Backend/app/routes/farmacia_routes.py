@@ -1,25 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
-from app.core.database import SessionLocal
+from app.core.database import get_db
 from app.schemas.farmacia_schema import FarmaciaCreate, FarmaciaOut
 from app.services.farmacia_service import create_farmacia, list_farmacias, get_farmacia
+from app.services.version_catalogo_service import respuesta_condicional
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/", response_model=FarmaciaOut)
 def create(payload: FarmaciaCreate, db: Session = Depends(get_db)):
     return create_farmacia(db, payload)
 
 @router.get("/", response_model=List[FarmaciaOut])
-def all(db: Session = Depends(get_db)):
+def all(request: Request, response: Response, db: Session = Depends(get_db)):
+    no_modificado = respuesta_condicional(db, request, response, "farmacias")
+    if no_modificado:
+        return no_modificado
     return list_farmacias(db)
 
 @router.get("/{farmacia_id}", response_model=FarmaciaOut)
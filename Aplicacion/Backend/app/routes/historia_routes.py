@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.core.database import SessionLocal
+from app.core.database import get_db, get_db_primaria
 from app.core.permissions import any_authenticated, get_current_user
 from app.schemas.historia_schema import HistoriaCreate, HistoriaOut
 from app.schemas.expediente_schema import ExpedienteCompletoOut
@@ -13,17 +13,9 @@ from app.services.historia_service import (
     get_expediente_por_paciente
 )
 from app.services.auditoria_service import auditoria_service
-from app.models.empleado import Empleado
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/", response_model=HistoriaOut)
 def create(payload: HistoriaCreate, db: Session = Depends(get_db)):
     return create_historia(db, payload)
@@ -43,6 +35,7 @@ def one(historia_id: int, db: Session = Depends(get_db)):
 def buscar_expediente(
     query: str = Query(..., description="Número de historia clínica o cédula del paciente"),
     db: Session = Depends(get_db),
+    db_auditoria: Session = Depends(get_db_primaria),
     current_user: dict = Depends(any_authenticated)
 ):
     """
@@ -55,20 +48,19 @@ def buscar_expediente(
         raise HTTPException(404, "No se encontró el expediente del paciente")
     
     # Registrar acceso al expediente en auditoría (RF-002)
-    usuario = db.query(Empleado).filter(Empleado.id == current_user["id"]).first()
-    if usuario:
-        auditoria_service.registrar_accion(
-            db=db,
-            usuario_id=usuario.id,
-            usuario_nombre=f"{usuario.nombre} {usuario.apellido}",
-            usuario_cargo=usuario.cargo,
-            accion="CONSULTA",
-            modulo="Expediente Clínico",
-            descripcion=f"Acceso al expediente del paciente {expediente['paciente'].nombre} {expediente['paciente'].apellido}",
-            tabla_afectada="historias",
-            registro_id=expediente['historia'].id if expediente['historia'] else None,
-            estado="exitoso"
-        )
+    # La lectura puede venir de la réplica; el registro siempre va a la primaria
+    auditoria_service.registrar_accion(
+        db=db_auditoria,
+        usuario_id=current_user["id"],
+        usuario_nombre=current_user["nombre_completo"],
+        usuario_cargo=current_user["cargo"],
+        accion="CONSULTA",
+        modulo="Expediente Clínico",
+        descripcion=f"Acceso al expediente del paciente {expediente['paciente'].nombre} {expediente['paciente'].apellido}",
+        tabla_afectada="historias",
+        registro_id=expediente['historia'].id if expediente['historia'] else None,
+        estado="exitoso"
+    )
     
     # Filtrar información según el rol (RF-002)
     cargo = current_user["cargo"]
@@ -165,6 +157,7 @@ def buscar_expediente(
 def obtener_expediente(
     paciente_id: int,
     db: Session = Depends(get_db),
+    db_auditoria: Session = Depends(get_db_primaria),
     current_user: dict = Depends(any_authenticated)
 ):
     """
@@ -176,20 +169,18 @@ def obtener_expediente(
         raise HTTPException(404, "No se encontró el expediente del paciente")
     
     # Registrar acceso en auditoría
-    usuario = db.query(Empleado).filter(Empleado.id == current_user["id"]).first()
-    if usuario:
-        auditoria_service.registrar_accion(
-            db=db,
-            usuario_id=usuario.id,
-            usuario_nombre=f"{usuario.nombre} {usuario.apellido}",
-            usuario_cargo=usuario.cargo,
-            accion="CONSULTA",
-            modulo="Expediente Clínico",
-            descripcion=f"Acceso al expediente del paciente {expediente['paciente'].nombre} {expediente['paciente'].apellido}",
-            tabla_afectada="historias",
-            registro_id=expediente['historia'].id if expediente['historia'] else None,
-            estado="exitoso"
-        )
+    auditoria_service.registrar_accion(
+        db=db_auditoria,
+        usuario_id=current_user["id"],
+        usuario_nombre=current_user["nombre_completo"],
+        usuario_cargo=current_user["cargo"],
+        accion="CONSULTA",
+        modulo="Expediente Clínico",
+        descripcion=f"Acceso al expediente del paciente {expediente['paciente'].nombre} {expediente['paciente'].apellido}",
+        tabla_afectada="historias",
+        registro_id=expediente['historia'].id if expediente['historia'] else None,
+        estado="exitoso"
+    )
     
     # Aplicar filtrado por rol igual que en buscar_expediente
     cargo = current_user["cargo"]
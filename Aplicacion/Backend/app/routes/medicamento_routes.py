@@ -1,32 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
-from app.core.database import SessionLocal
+from app.core.database import get_db
 from app.schemas.medicamento_schema import MedicamentoCreate, MedicamentoOut
 from app.services.medicamento_service import create_medicamento, list_medicamentos, get_medicamento, buscar_medicamentos
+from app.services.version_catalogo_service import respuesta_condicional
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/", response_model=MedicamentoOut)
 def create(payload: MedicamentoCreate, db: Session = Depends(get_db)):
     return create_medicamento(db, payload)
 
 @router.get("/", response_model=List[MedicamentoOut])
-def all(db: Session = Depends(get_db)):
+def all(request: Request, response: Response, db: Session = Depends(get_db)):
+    no_modificado = respuesta_condicional(db, request, response, "medicamentos")
+    if no_modificado:
+        return no_modificado
     return list_medicamentos(db)
 
 @router.get("/buscar", response_model=List[MedicamentoOut])
-def buscar(query: str, limit: int = 20, db: Session = Depends(get_db)):
+def buscar(request: Request, response: Response, query: str, limit: int = 20, db: Session = Depends(get_db)):
     """
     RF-003: Busca medicamentos por nombre con stock disponible
     """
+    no_modificado = respuesta_condicional(db, request, response, "medicamentos")
+    if no_modificado:
+        return no_modificado
     return buscar_medicamentos(db, query, limit)
 
 @router.get("/{med_id}", response_model=MedicamentoOut)
@@ -1,22 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
-from app.core.database import SessionLocal
+from app.core.database import get_db
 from app.schemas.medico_schema import MedicoOut, MedicoCreate, MedicoUpdate
 from app.services import medico_service
+from app.services.version_catalogo_service import respuesta_condicional
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.get("/", response_model=List[MedicoOut])
-def get_all_medicos(db: Session = Depends(get_db)):
-    """Listar todos los médicos"""
+def get_all_medicos(request: Request, response: Response, db: Session = Depends(get_db)):
+    """Listar todos los médicos (304 si el cliente ya tiene la versión actual)"""
+    no_modificado = respuesta_condicional(db, request, response, "medicos")
+    if no_modificado:
+        return no_modificado
     return medico_service.list_medicos(db)
 
 @router.get("/{medico_id}", response_model=MedicoOut)
@@ -1,16 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 from app.core.permissions import get_current_user
-from app.core.permissions import verificar_permisos
+from app.core.permissions import verificar_permisos, admin_only
 from app.models.empleado import Empleado
 from app.services.notificacion_stock_service import NotificacionStockService
+from app.services.recordatorio_service import ejecutar_recordatorios
 
 router = APIRouter(prefix="/notificaciones", tags=["Notificaciones"])
 
 @router.get("/stock/alertas")
-def obtener_alertas_stock(
-    db: Session = Depends(get_db),
+async def obtener_alertas_stock(
+    db: AsyncSession = Depends(get_async_db),
     current_user: Empleado = Depends(get_current_user)
 ):
     """
@@ -20,12 +23,12 @@ def obtener_alertas_stock(
     """
     verificar_permisos(current_user, ["farmaceutico", "medico", "admin", "super_admin"])
     
-    alertas = NotificacionStockService.obtener_alertas_dashboard()
+    alertas = await NotificacionStockService.obtener_alertas_dashboard(db)
     return alertas
 
 @router.get("/stock/resumen")
-def obtener_resumen_alertas(
-    db: Session = Depends(get_db),
+async def obtener_resumen_alertas(
+    db: AsyncSession = Depends(get_async_db),
     current_user: Empleado = Depends(get_current_user)
 ):
     """
@@ -35,13 +38,13 @@ def obtener_resumen_alertas(
     """
     verificar_permisos(current_user, ["farmaceutico", "medico", "admin", "super_admin"])
     
-    resumen = NotificacionStockService.obtener_resumen_alertas(db)
+    resumen = await NotificacionStockService.obtener_resumen_alertas(db)
     return resumen
 
 @router.post("/stock/verificar-disponibilidad")
-def verificar_disponibilidad(
+async def verificar_disponibilidad(
     payload: dict,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Empleado = Depends(get_current_user)
 ):
     """
@@ -60,8 +63,23 @@ def verificar_disponibilidad(
             detail="Debe proporcionar medicamento_id"
         )
     
-    resultado = NotificacionStockService.verificar_disponibilidad_para_prescripcion(
+    resultado = await NotificacionStockService.verificar_disponibilidad_para_prescripcion(
         db, medicamento_id, cantidad
     )
     
     return resultado
+
+@router.post("/recordatorios/ejecutar")
+async def ejecutar_recordatorios_citas(
+    fecha: Optional[date] = Query(None, description="Día de las citas a recordar (por defecto, mañana)"),
+    current_user: dict = Depends(admin_only)
+):
+    """
+    RF-001: Ejecuta manualmente el envío de recordatorios de citas.
+    Las citas ya recordadas se omiten, por lo que puede repetirse sin duplicar envíos.
+    Acceso: admin, super_admin
+    """
+    if fecha:
+        inicio = datetime.combine(fecha, time.min)
+        return await ejecutar_recordatorios(inicio, inicio + timedelta(days=1))
+    return await ejecutar_recordatorios()
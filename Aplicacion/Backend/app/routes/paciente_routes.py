@@ -1,32 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.core.database import SessionLocal
+import io
+from app.core.database import get_async_db, get_db
 from app.schemas.paciente_schema import PacienteCreate, PacienteOut, PacienteUpdate
 from app.services.paciente_service import (
     create_paciente, get_paciente, list_pacientes, 
-    delete_paciente, update_paciente, buscar_pacientes
+    delete_paciente, update_paciente, buscar_pacientes, cursor_paciente
 )
+from app.services.importacion_paciente_service import importar_pacientes_csv
 from app.core.permissions import get_current_user, admin_only
 from app.models.medico import Medico
+from app.utils.respuesta_json import ORJSONResponse
 from app.utils.validators import validar_vigencia_poliza
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/", response_model=PacienteOut)
 def create(payload: PacienteCreate, db: Session = Depends(get_db), current_user: dict = Depends(admin_only)):
     """Crear paciente - Solo administradores"""
     return create_paciente(db, payload)
 
+@router.post("/importar")
+def importar(
+    archivo: UploadFile = File(..., description="CSV con cabecera (columnas de PacienteCreate, fechas YYYY-MM-DD)"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(admin_only)
+):
+    """
+    Importación masiva de pacientes desde CSV - Solo administradores
+    Retorna el resumen y los errores por fila (las filas válidas se importan)
+    """
+    texto = io.TextIOWrapper(archivo.file, encoding="utf-8-sig", newline="")
+    try:
+        return importar_pacientes_csv(db, texto)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(400, f"Archivo CSV inválido: {e}")
+    finally:
+        texto.detach()
+
 @router.get("/", response_model=List[PacienteOut])
-def all(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+def all(
+    estado_poliza: Optional[str] = Query(
+        None, regex="^(vigente|proxima_a_vencer|vencida|sin_informacion)$",
+        description="Filtrar por estado de póliza: vigente, proxima_a_vencer, vencida, sin_informacion"
+    ),
+    orden: str = Query("id", regex="^(id|poliza)$", description="Orden: id o poliza (vencidas primero)"),
+    cursor: Optional[str] = Query(None, description="Cursor devuelto en la cabecera X-Next-Cursor de la página anterior"),
+    limite: Optional[int] = Query(None, ge=1, le=500, description="Tamaño de página (sin límite si se omite)"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
     """Listar pacientes - Admin ve todos, médicos solo sus pacientes"""
     medico_id = None
     
@@ -36,7 +61,18 @@ def all(db: Session = Depends(get_db), current_user: dict = Depends(get_current_
         if medico:
             medico_id = medico.id
     
-    return list_pacientes(db, medico_id)
+    try:
+        pacientes = list_pacientes(db, medico_id, estado_poliza, orden, cursor, limite)
+    except ValueError:
+        raise HTTPException(400, "Cursor de paginación inválido")
+    
+    # Página completa: indicar cómo pedir la siguiente
+    headers = {}
+    if limite and len(pacientes) == limite:
+        headers["X-Next-Cursor"] = cursor_paciente(pacientes[-1], orden)
+    
+    # response_model solo documenta: las filas ya vienen como diccionarios
+    return ORJSONResponse(pacientes, headers=headers)
 
 @router.get("/{paciente_id}", response_model=PacienteOut)
 def one(paciente_id: int, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -63,16 +99,16 @@ def remove(paciente_id: int, db: Session = Depends(get_db), current_user: dict =
     return {"detail": "Paciente eliminado exitosamente"}
 
 @router.get("/buscar/search", response_model=List[PacienteOut])
-def search(
+async def search(
     q: str = Query(..., min_length=2, description="Término de búsqueda: cédula o nombre"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Búsqueda de pacientes por cédula o nombre en tiempo real (RF-001)
     Requiere mínimo 2 caracteres
     """
-    return buscar_pacientes(db, q)
+    return await buscar_pacientes(db, q)
 
 @router.get("/{paciente_id}/validar-poliza")
 def validar_poliza(
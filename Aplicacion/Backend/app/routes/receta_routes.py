@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from starlette.background import BackgroundTask
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
-from app.core.database import SessionLocal
+from datetime import date, datetime, time
+from app.core.database import get_db
 from app.schemas.receta_schema import RecetaCreate, RecetaOut, RecetaDispensar
 from app.services.receta_service import (
     crear_receta,
@@ -13,19 +16,21 @@ from app.services.receta_service import (
 )
 from app.services.validacion_farmaceutica_service import ValidacionFarmaceuticaService
 from app.core.permissions import get_current_user, admin_or_medic, admin_or_pharmacist
-from app.utils.pdf_generator import generar_receta_pdf
+from app.services.pdf_service import (
+    MedicoPDF, PacientePDF, RecetaPDF, renderizar_receta,
+    renderizar_lote, reservar_capacidad_lote
+)
+from app.services.pdf_cache_service import servir_pdf
 from app.models.receta import Receta
 from app.models.paciente import Paciente
 from app.models.empleado import Empleado
+from app.utils.respuesta_json import ORJSONResponse
+from app.utils.zip_stream import zip_en_streaming
 
-router = APIRouter()
+# Máximo de recetas por descarga en lote
+MAX_RECETAS_LOTE = 500
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+router = APIRouter()
 
 @router.post("/", response_model=RecetaOut)
 def crear(
@@ -38,7 +43,7 @@ def crear(
     """
     return crear_receta(db, payload)
 
-@router.get("/")
+@router.get("/", response_model=List[RecetaOut])
 def listar(
     paciente_id: Optional[int] = Query(None, description="Filtrar por paciente"),
     estado: Optional[str] = Query(None, description="Filtrar por estado (pendiente, dispensada, parcial, cancelada)"),
@@ -48,7 +53,57 @@ def listar(
     """
     Lista recetas con filtros opcionales incluyendo información del paciente, médico y farmacéutico
     """
-    return listar_recetas(db, paciente_id, estado)
+    # response_model solo documenta: las filas ya vienen como diccionarios
+    return ORJSONResponse(listar_recetas(db, paciente_id, estado))
+
+def _trabajos_recetas(db: Session, estado: Optional[str], desde: Optional[date], hasta: Optional[date]):
+    """DTOs de las recetas del rango, con paciente y médico en la misma consulta"""
+    query = db.query(Receta).options(
+        joinedload(Receta.paciente),
+        joinedload(Receta.medico)
+    )
+    if estado:
+        query = query.filter(Receta.estado == estado)
+    if desde:
+        query = query.filter(Receta.fecha_emision >= datetime.combine(desde, time.min))
+    if hasta:
+        query = query.filter(Receta.fecha_emision <= datetime.combine(hasta, time.max))
+
+    recetas = query.order_by(Receta.fecha_emision).limit(MAX_RECETAS_LOTE + 1).all()
+    if len(recetas) > MAX_RECETAS_LOTE:
+        raise HTTPException(400, f"El lote supera el máximo de {MAX_RECETAS_LOTE} recetas, reduzca el rango de fechas")
+
+    trabajos = []
+    for receta in recetas:
+        if not receta.paciente or not receta.medico:
+            continue
+        dtos = (RecetaPDF.desde_orm(receta), PacientePDF.desde_orm(receta.paciente), MedicoPDF.desde_orm(receta.medico))
+        trabajos.append((f"receta_{receta.id}.pdf", "receta", dtos))
+    return trabajos
+
+@router.get("/pdf-lote")
+async def descargar_pdf_lote(
+    estado: Optional[str] = Query(None, description="Filtrar por estado"),
+    desde: Optional[date] = Query(None, description="Fecha de emisión inicial"),
+    hasta: Optional[date] = Query(None, description="Fecha de emisión final"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(admin_or_pharmacist)
+):
+    """
+    Descarga en un ZIP los PDFs de las recetas filtradas.
+    Se generan en paralelo en el pool de procesos y el ZIP se envía a medida
+    que cada PDF está listo, sin armarlo completo en memoria.
+    """
+    trabajos = await run_in_threadpool(_trabajos_recetas, db, estado, desde, hasta)
+    if not trabajos:
+        raise HTTPException(404, "No hay recetas con los filtros indicados")
+    reserva = reservar_capacidad_lote()
+    return StreamingResponse(
+        zip_en_streaming(renderizar_lote(trabajos, reserva)),
+        media_type="application/zip",
+        background=BackgroundTask(reserva.liberar),
+        headers={"Content-Disposition": f"attachment; filename=recetas_{desde or 'inicio'}_{hasta or 'hoy'}.zip"}
+    )
 
 @router.get("/{receta_id}", response_model=RecetaOut)
 def obtener(
@@ -117,17 +172,8 @@ def cancelar(
         raise HTTPException(404, "Receta no encontrada")
     return receta
 
-@router.get("/{receta_id}/pdf")
-def descargar_pdf(
-    receta_id: int,
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
-):
-    """
-    Genera y descarga el PDF de una receta médica
-    Accesible para todos los usuarios autenticados
-    """
-    # Obtener receta con sus relaciones
+def _datos_receta_pdf(db: Session, receta_id: int):
+    """Carga receta, paciente y médico y los convierte en DTOs para el pool de PDFs"""
     receta = db.query(Receta).filter(Receta.id == receta_id).first()
     if not receta:
         raise HTTPException(404, "Receta no encontrada")
@@ -142,17 +188,30 @@ def descargar_pdf(
     if not medico:
         raise HTTPException(404, "Médico no encontrado")
     
-    # Generar PDF
+    return RecetaPDF.desde_orm(receta), PacientePDF.desde_orm(paciente), MedicoPDF.desde_orm(medico)
+
+@router.get("/{receta_id}/pdf")
+async def descargar_pdf(
+    request: Request,
+    receta_id: int,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Genera y descarga el PDF de una receta médica
+    Accesible para todos los usuarios autenticados.
+    El PDF se genera en el pool de procesos (503 si está saturado); las
+    recetas dispensadas se sirven desde la caché en disco con ETag.
+    """
+    receta, paciente, medico = await run_in_threadpool(_datos_receta_pdf, db, receta_id)
+    
     try:
-        pdf_buffer = generar_receta_pdf(receta, paciente, medico)
-        
-        # Retornar como respuesta streaming
-        return StreamingResponse(
-            pdf_buffer,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename=receta_{receta_id}.pdf"
-            }
+        return await servir_pdf(
+            request, "receta", receta_id, receta.estado,
+            (receta, paciente, medico), renderizar_receta,
+            f"receta_{receta_id}.pdf"
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, f"Error al generar PDF: {str(e)}")
@@ -2,9 +2,11 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query
 from jose import jwt, JWTError
 from app.core.config import settings
 from app.core.websocket import manager
+from app.utils.logger import obtener_logger
 from typing import Optional
 
 router = APIRouter()
+logger = obtener_logger("websocket")
 
 async def get_user_from_token(token: str) -> dict:
     """
@@ -81,7 +83,7 @@ async def websocket_endpoint(
     except WebSocketDisconnect:
         manager.disconnect(websocket, user_id, user_role)
     except Exception as e:
-        print(f"Error en WebSocket: {e}")
+        logger.warning("Error en WebSocket", extra={"usuario_id": user_id, "error": str(e)})
         manager.disconnect(websocket, user_id, user_role)
 
 
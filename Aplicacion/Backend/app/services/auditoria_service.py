@@ -1,19 +1,38 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, desc
 from app.models.auditoria import Auditoria
-from app.schemas.auditoria_schema import AuditoriaCreate, AuditoriaFilter
+from app.schemas.auditoria_schema import AuditoriaCreate, AuditoriaFilter, AuditoriaResponse
+from app.utils.respuesta_json import columnas, filas_a_dicts
 from datetime import datetime
 from typing import Optional, List, Dict, Any
+import threading
+import time
+
+# Columnas del listado, en el orden de AuditoriaResponse
+CAMPOS_AUDITORIA = list(AuditoriaResponse.__fields__)
+
+# Registros escritos y tiempo dedicado (la escritura es síncrona, en la solicitud)
+_estadisticas = {"registros": 0, "segundos": 0.0}
+_estadisticas_lock = threading.Lock()
+
+
+def estadisticas_auditoria() -> Dict[str, Any]:
+    with _estadisticas_lock:
+        return dict(_estadisticas)
 
 class AuditoriaService:
     
     @staticmethod
     def crear_registro(db: Session, auditoria: AuditoriaCreate) -> Auditoria:
         """Crea un nuevo registro de auditoría"""
+        inicio = time.perf_counter()
         db_auditoria = Auditoria(**auditoria.dict())
         db.add(db_auditoria)
         db.commit()
         db.refresh(db_auditoria)
+        with _estadisticas_lock:
+            _estadisticas["registros"] += 1
+            _estadisticas["segundos"] += time.perf_counter() - inicio
         return db_auditoria
     
     @staticmethod
@@ -61,7 +80,8 @@ class AuditoriaService:
         limit: int = 100
     ) -> List[Dict[str, Any]]:
         """Lista registros de auditoría con filtros opcionales"""
-        query = db.query(Auditoria)
+        # Solo columnas, sin entidades ORM: el listado se serializa con ORJSONResponse
+        query = db.query(*columnas(Auditoria, CAMPOS_AUDITORIA))
         
         if filtros:
             if filtros.fecha_desde:
@@ -86,28 +106,8 @@ class AuditoriaService:
         
         registros = query.order_by(desc(Auditoria.fecha_hora)).offset(skip).limit(limit).all()
         
-        # Convertir a diccionarios manualmente
-        return [
-            {
-                "id": r.id,
-                "usuario_id": r.usuario_id,
-                "usuario_nombre": r.usuario_nombre,
-                "usuario_cargo": r.usuario_cargo,
-                "accion": r.accion,
-                "modulo": r.modulo,
-                "descripcion": r.descripcion,
-                "tabla_afectada": r.tabla_afectada,
-                "registro_id": r.registro_id,
-                "datos_anteriores": r.datos_anteriores,
-                "datos_nuevos": r.datos_nuevos,
-                "ip_address": r.ip_address,
-                "user_agent": r.user_agent,
-                "estado": r.estado,
-                "fecha_hora": r.fecha_hora,
-                "detalles_adicionales": r.detalles_adicionales
-            }
-            for r in registros
-        ]
+        # Filas a diccionarios con la forma de AuditoriaResponse
+        return filas_a_dicts(registros)
     
     @staticmethod
     def obtener_por_id(db: Session, auditoria_id: int) -> Optional[Dict[str, Any]]:
@@ -1,20 +1,35 @@
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.cita import Cita
 from app.models.paciente import Paciente
 from app.models.medico import Medico
 from app.models.empleado import Empleado
 from app.schemas.cita_schema import CitaCreate, CitaUpdate
+from app.schemas.medico_schema import MedicoOut
 from app.utils.email_utils import (
     enviar_confirmacion_cita,
     enviar_cancelacion_cita,
     enviar_reprogramacion_cita
 )
+from app.utils.email_plantillas import fecha_hora_cita
+from app.utils.respuesta_json import columnas, subdict
+from app.utils.logger import obtener_logger
+from app.utils.validators import edad_en_anios
 from app.core.websocket import manager
 from fastapi import HTTPException
 import asyncio
 from datetime import datetime, timedelta, date
 from app.services.auditoria_service import auditoria_service
+from app.services.paciente_service import CAMPOS_PACIENTE
+from app.services.pdf_cache_service import invalidar as invalidar_pdf
+from app.services.resumen_service import (
+    obtener_empleado_resumen,
+    obtener_medico_resumen,
+    obtener_paciente_resumen
+)
+
+logger = obtener_logger("citas")
 
 
 def create_cita(db: Session, payload: CitaCreate, empleado_id: int = None):
@@ -22,13 +37,13 @@ def create_cita(db: Session, payload: CitaCreate, empleado_id: int = None):
     Crea una cita con validaciones y notificaciones (RF-001)
     """
     # Validar que el paciente existe
-    paciente = db.query(Paciente).filter(Paciente.id == payload.paciente_id).first()
+    paciente = obtener_paciente_resumen(db, payload.paciente_id)
     if not paciente:
         raise HTTPException(status_code=404, detail="Paciente no encontrado")
     
     # Validar que el médico existe si se proporciona
     if payload.medico_id:
-        medico = db.query(Medico).filter(Medico.id == payload.medico_id).first()
+        medico = db.get(Medico, payload.medico_id)
         if not medico:
             raise HTTPException(status_code=404, detail="Médico no encontrado")
     
@@ -76,87 +91,70 @@ def create_cita(db: Session, payload: CitaCreate, empleado_id: int = None):
     db.commit()
     db.refresh(c)
     
+    # Nombre del médico para auditoría y email (se resuelve una sola vez)
+    medico_nombre = "Por asignar"
+    if payload.medico_id:
+        medico_resumen = obtener_medico_resumen(db, payload.medico_id)
+        if medico_resumen and medico_resumen["tiene_empleado"]:
+            medico_nombre = medico_resumen["nombre_completo"]
+    
     # Registrar en auditoría
     if empleado_id:
         try:
-            empleado = db.query(Empleado).filter(Empleado.id == empleado_id).first()
-            medico_nombre = "Por asignar"
-            if payload.medico_id:
-                medico_obj = db.query(Medico).filter(Medico.id == payload.medico_id).first()
-                if medico_obj and medico_obj.empleado:
-                    medico_nombre = f"{medico_obj.empleado.nombre} {medico_obj.empleado.apellido}"
+            empleado = obtener_empleado_resumen(db, empleado_id)
             
             auditoria_service.registrar_accion(
                 db=db,
                 usuario_id=empleado_id,
-                usuario_nombre=f"{empleado.nombre} {empleado.apellido}" if empleado else "Sistema",
-                usuario_cargo=empleado.cargo if empleado else "Sistema",
+                usuario_nombre=empleado["nombre_completo"] if empleado else "Sistema",
+                usuario_cargo=empleado["cargo"] if empleado else "Sistema",
                 accion="CREAR",
                 modulo="Citas",
-                descripcion=f"Nueva cita creada para {paciente.nombre} {paciente.apellido}",
+                descripcion=f"Nueva cita creada para {paciente['nombre_completo']}",
                 tabla_afectada="citas",
                 registro_id=c.id,
                 datos_nuevos={
-                    "paciente": f"{paciente.nombre} {paciente.apellido}",
+                    "paciente": paciente["nombre_completo"],
                     "medico": medico_nombre,
                     "fecha": c.fecha.strftime('%d/%m/%Y'),
                     "estado": c.estado,
                     "tipo": c.tipo_cita
                 }
             )
-        except Exception as e:
-            print(f"Error registrando auditoría: {e}")
+        except Exception:
+            logger.exception("Error registrando auditoría", extra={"cita_id": c.id})
     
     # Enviar notificación WebSocket a todos los usuarios
     try:
         asyncio.create_task(manager.broadcast({
             "type": "cita_creada",
             "title": "Nueva cita",
-            "message": f"Nueva cita registrada: {paciente.nombre} {paciente.apellido}",
+            "message": f"Nueva cita registrada: {paciente['nombre_completo']}",
             "data": {"cita_id": c.id, "paciente_id": c.paciente_id}
         }))
     except Exception as e:
-        print(f"Error enviando notificación WebSocket: {e}")
+        logger.warning("Error enviando notificación WebSocket", extra={"cita_id": c.id, "error": str(e)})
     
     # Enviar email de confirmación de forma ASÍNCRONA (no bloquear la respuesta)
     # Si falla el email, solo se loguea el error pero NO se hace rollback de la cita
-    if paciente.email:
+    if paciente["email"]:
         try:
-            medico_nombre = "Por asignar"
-            if payload.medico_id:
-                medico_obj = db.query(Medico).filter(Medico.id == payload.medico_id).first()
-                if medico_obj and medico_obj.empleado:
-                    medico_nombre = f"{medico_obj.empleado.nombre} {medico_obj.empleado.apellido}"
-            
             # Construir fecha/hora completa combinando fecha + hora_inicio
-            from datetime import datetime as dt, time
-            if isinstance(c.fecha, dt):
-                fecha_base = c.fecha.date()
-            else:
-                fecha_base = c.fecha
-            
-            # Parsear hora_inicio (formato "HH:MM:SS" o "HH:MM")
-            if c.hora_inicio:
-                hora_partes = c.hora_inicio.split(':')
-                hora_obj = time(int(hora_partes[0]), int(hora_partes[1]))
-                fecha_hora_completa = dt.combine(fecha_base, hora_obj)
-            else:
-                fecha_hora_completa = dt.combine(fecha_base, time(8, 0))
+            fecha_hora_completa = fecha_hora_cita(c.fecha, c.hora_inicio)
             
             # Intentar enviar email (sin bloquear ni hacer rollback si falla)
             enviar_confirmacion_cita(
-                paciente.email,
-                f"{paciente.nombre} {paciente.apellido}",
+                paciente["email"],
+                paciente["nombre_completo"],
                 fecha_hora_completa,
                 medico_nombre,
                 c.motivo or "Consulta médica",
                 c.id
             )
-            print(f"✅ Email de confirmación enviado a {paciente.email}")
+            logger.info("Email de confirmación enviado", extra={"cita_id": c.id})
         except Exception as e:
             # Solo loguear el error, no afectar la creación de la cita
-            print(f"⚠️ No se pudo enviar email de confirmación: {e}")
-            print(f"   Cita #{c.id} creada correctamente sin notificación por email")
+            logger.warning("Cita creada sin email de confirmación", extra={"cita_id": c.id, "error": str(e)})
     
     # Notificar via WebSocket (opcional - comentado para evitar error de event loop en contexto síncrono)
     # try:
@@ -174,65 +172,88 @@ def create_cita(db: Session, payload: CitaCreate, empleado_id: int = None):
     
     return c
 
-def list_citas(db: Session, medico_id: int = None):
+# Columnas de los listados, en el orden de CitaOut
+CAMPOS_CITA = [
+    "fecha", "hora_inicio", "hora_fin", "motivo", "estado", "sala_asignada", "tipo_cita",
+    "id", "paciente_id", "medico_id", "encargado_id", "observaciones_cancelacion",
+]
+CAMPOS_MEDICO = list(MedicoOut.__fields__)
+
+
+async def list_citas(db: AsyncSession, medico_id: int = None):
     """
     Lista citas. Si se proporciona medico_id, solo devuelve citas de ese médico.
-    Carga relaciones con paciente y médico para incluir información adicional.
+    Incluye información adicional del paciente y del médico.
+    Usa la sesión async: no ocupa un hilo del threadpool mientras espera a la base.
+    
+    Selecciona solo columnas (sin entidades ORM) y retorna diccionarios con
+    la forma de CitaOut, listos para ORJSONResponse.
     """
-    query = db.query(Cita).options(
-        joinedload(Cita.paciente),
-        joinedload(Cita.medico).joinedload(Medico.empleado)
-    ).filter(
+    query = select(
+        *columnas(Cita, CAMPOS_CITA),
+        *columnas(Paciente, CAMPOS_PACIENTE, "paciente__"),
+        *columnas(Medico, CAMPOS_MEDICO, "medico__"),
+        Empleado.nombre.label("empleado__nombre"),
+        Empleado.apellido.label("empleado__apellido")
+    ).outerjoin(
+        Paciente, Cita.paciente_id == Paciente.id
+    ).outerjoin(
+        Medico, Cita.medico_id == Medico.id
+    ).outerjoin(
+        Empleado, Medico.empleado_id == Empleado.id
+    ).where(
         or_(Cita.activo == True, Cita.activo.is_(None))  # Incluir activas y NULL
     )
     
     if medico_id:
-        query = query.filter(Cita.medico_id == medico_id)
+        query = query.where(Cita.medico_id == medico_id)
     
-    citas = query.all()
-    
-    # Corregir registros con activo=NULL y agregar información adicional
-    for cita in citas:
-        # Corregir activo=NULL (migración automática)
-        if cita.activo is None:
-            cita.activo = True
+    citas = []
+    for fila in (await db.execute(query)).all():
+        fila = fila._mapping
+        cita = subdict(fila, CAMPOS_CITA)
         
-        if cita.paciente:
-            cita.paciente_nombre = cita.paciente.nombre
-            cita.paciente_apellido = cita.paciente.apellido
-            cita.paciente_cedula = str(cita.paciente.cedula)
-            cita.paciente_edad = cita.paciente.edad  # Edad calculada desde fecha_nacimiento
-            cita.paciente_genero = cita.paciente.genero
-            cita.paciente_telefono = cita.paciente.telefono
+        paciente = None
+        if fila["paciente__id"] is not None:
+            paciente = subdict(fila, CAMPOS_PACIENTE, "paciente__")
+            paciente["edad"] = edad_en_anios(paciente["fecha_nacimiento"])  # Edad calculada desde fecha_nacimiento
+            paciente["numero_historia_clinica"] = None
+            paciente["estado_poliza"] = None
+        medico = subdict(fila, CAMPOS_MEDICO, "medico__") if fila["medico__id"] is not None else None
         
-        if cita.medico:
-            if cita.medico.empleado:
-                cita.medico_nombre = cita.medico.empleado.nombre
-                cita.medico_apellido = cita.medico.empleado.apellido
+        cita.update({
+            "paciente_nombre": paciente["nombre"] if paciente else None,
+            "paciente_apellido": paciente["apellido"] if paciente else None,
+            "paciente_cedula": str(paciente["cedula"]) if paciente else None,
+            "paciente_edad": paciente["edad"] if paciente else None,
+            "paciente_genero": paciente["genero"] if paciente else None,
+            "paciente_telefono": paciente["telefono"] if paciente else None,
+            "medico_nombre": None,
+            "medico_apellido": None,
+            "medico_especialidad": None,
+            "paciente": paciente,
+            "medico": medico,
+        })
+        if medico:
+            if fila["empleado__nombre"] is not None:
+                cita["medico_nombre"] = fila["empleado__nombre"]
+                cita["medico_apellido"] = fila["empleado__apellido"]
             else:
-                cita.medico_nombre = cita.medico.nombre
-                cita.medico_apellido = cita.medico.apellido
-            cita.medico_especialidad = cita.medico.especialidad
-    
-    # Hacer commit si hubo cambios
-    if any(c.activo is None for c in citas):
-        db.commit()
+                cita["medico_nombre"] = medico["nombre"]
+                cita["medico_apellido"] = medico["apellido"]
+            cita["medico_especialidad"] = medico["especialidad"]
+        citas.append(cita)
     
     return citas
 
 def get_cita(db: Session, cita_id: int):
-    cita = db.query(Cita).options(
+    # db.get resuelve desde el identity map si la cita ya está en la sesión
+    cita = db.get(Cita, cita_id, options=[
         joinedload(Cita.paciente),
         joinedload(Cita.medico).joinedload(Medico.empleado)
-    ).filter(Cita.id == cita_id).first()
+    ])
     
     if cita:
-        # Corregir activo=NULL si existe (migración automática)
-        if cita.activo is None:
-            cita.activo = True
-            db.commit()
-            db.refresh(cita)
-        
         # Agregar información adicional
         if cita.paciente:
             cita.paciente_nombre = cita.paciente.nombre
@@ -262,8 +283,8 @@ def update_cita(db: Session, cita_id: int, payload: CitaUpdate, empleado_id: int
     if not cita:
         return None
     
-    # Obtener datos del paciente para notificaciones
-    paciente = db.query(Paciente).filter(Paciente.id == cita.paciente_id).first()
+    # Datos del paciente para notificaciones
+    paciente = obtener_paciente_resumen(db, cita.paciente_id)
     
     # Guardar datos anteriores para notificaciones y auditoría
     estado_anterior = cita.estado
@@ -287,12 +308,12 @@ def update_cita(db: Session, cita_id: int, payload: CitaUpdate, empleado_id: int
         setattr(cita, field, value)
     
     db.commit()
-    db.refresh(cita)
+    invalidar_pdf("cita", cita_id)
     
     # Registrar en auditoría
     if empleado_id:
         try:
-            empleado = db.query(Empleado).filter(Empleado.id == empleado_id).first()
+            empleado = obtener_empleado_resumen(db, empleado_id)
             cambios = []
             datos_anteriores = {}
             datos_nuevos = {}
@@ -317,13 +338,13 @@ def update_cita(db: Session, cita_id: int, payload: CitaUpdate, empleado_id: int
                 cambios.append(f"Horario modificado")
             
             detalles_cambios = ", ".join(cambios) if cambios else "Actualización de cita"
-            paciente_nombre = f"{paciente.nombre} {paciente.apellido}" if paciente else "Desconocido"
+            paciente_nombre = paciente["nombre_completo"] if paciente else "Desconocido"
             
             auditoria_service.registrar_accion(
                 db=db,
                 usuario_id=empleado_id,
-                usuario_nombre=f"{empleado.nombre} {empleado.apellido}" if empleado else "Sistema",
-                usuario_cargo=empleado.cargo if empleado else "Sistema",
+                usuario_nombre=empleado["nombre_completo"] if empleado else "Sistema",
+                usuario_cargo=empleado["cargo"] if empleado else "Sistema",
                 accion="ACTUALIZAR",
                 modulo="Citas",
                 descripcion=f"Cita actualizada para {paciente_nombre}",
@@ -333,29 +354,29 @@ def update_cita(db: Session, cita_id: int, payload: CitaUpdate, empleado_id: int
                 datos_nuevos=datos_nuevos if datos_nuevos else None,
                 detalles_adicionales={"cambios": detalles_cambios}
             )
-        except Exception as e:
-            print(f"Error registrando auditoría: {e}")
+        except Exception:
+            logger.exception("Error registrando auditoría", extra={"cita_id": cita_id})
     
     # Enviar notificación WebSocket sobre actualización
     try:
         asyncio.create_task(manager.broadcast({
             "type": "cita_actualizada",
             "title": "Cita actualizada",
-            "message": f"La cita de {paciente.nombre if paciente else 'un paciente'} ha sido actualizada",
+            "message": f"La cita de {paciente['nombre'] if paciente else 'un paciente'} ha sido actualizada",
             "data": {"cita_id": cita.id, "nuevo_estado": cita.estado}
         }))
     except Exception as e:
-        print(f"Error enviando notificación WebSocket: {e}")
+        logger.warning("Error enviando notificación WebSocket", extra={"cita_id": cita.id, "error": str(e)})
     
     # Enviar notificaciones por email según el caso (RF-001)
-    if paciente and paciente.email:
+    if paciente and paciente["email"]:
         try:
             if es_cancelacion:
                 # Email de cancelación
                 motivo = cita.observaciones_cancelacion or "No especificado"
                 enviar_cancelacion_cita(
-                    paciente.email,
-                    f"{paciente.nombre} {paciente.apellido}",
+                    paciente["email"],
+                    paciente["nombre_completo"],
                     fecha_anterior,
                     motivo
                 )
@@ -363,20 +384,20 @@ def update_cita(db: Session, cita_id: int, payload: CitaUpdate, empleado_id: int
                 # Email de reprogramación
                 medico_nombre = "Por asignar"
                 if cita.medico_id:
-                    medico = db.query(Medico).filter(Medico.id == cita.medico_id).first()
-                    if medico and medico.empleado:
-                        medico_nombre = f"{medico.empleado.nombre} {medico.empleado.apellido}"
+                    medico_resumen = obtener_medico_resumen(db, cita.medico_id)
+                    if medico_resumen and medico_resumen["tiene_empleado"]:
+                        medico_nombre = medico_resumen["nombre_completo"]
                 
                 enviar_reprogramacion_cita(
-                    paciente.email,
-                    f"{paciente.nombre} {paciente.apellido}",
+                    paciente["email"],
+                    paciente["nombre_completo"],
                     fecha_anterior,
                     cita.fecha,
                     medico_nombre,
                     cita.id
                 )
         except Exception as e:
-            print(f"Error enviando notificación por email: {e}")
+            logger.warning("Error enviando notificación por email", extra={"cita_id": cita.id, "error": str(e)})
     
     # Notificar cambios vía WebSocket si cambió el estado (comentado - error de event loop)
     # if estado_anterior != cita.estado:
@@ -416,15 +437,16 @@ def delete_cita(db: Session, cita_id: int, empleado_id: int):
     # Borrado lógico en lugar de físico
     cita.soft_delete()
     db.commit()
+    invalidar_pdf("cita", cita_id)
     
     # Registrar en auditoría
     try:
-        empleado = db.query(Empleado).filter(Empleado.id == empleado_id).first()
+        empleado = obtener_empleado_resumen(db, empleado_id)
         auditoria_service.registrar_accion(
             db=db,
             usuario_id=empleado_id,
-            usuario_nombre=f"{empleado.nombre} {empleado.apellido}" if empleado else "Sistema",
-            usuario_cargo=empleado.cargo if empleado else "Sistema",
+            usuario_nombre=empleado["nombre_completo"] if empleado else "Sistema",
+            usuario_cargo=empleado["cargo"] if empleado else "Sistema",
             accion="ELIMINAR",
             modulo="Citas",
             descripcion=f"Cita eliminada de {paciente_nombre}",
@@ -437,8 +459,8 @@ def delete_cita(db: Session, cita_id: int, empleado_id: int):
                 "estado": estado_cita
             }
         )
-    except Exception as e:
-        print(f"Error registrando auditoría: {e}")
+    except Exception:
+        logger.exception("Error registrando auditoría", extra={"cita_id": cita_id})
     
     return True
 
@@ -458,16 +480,22 @@ def obtener_disponibilidad_medicos(db: Session, especialidad: str = None, fecha:
     
     medicos = query.all()
     
-    disponibilidad = []
-    for medico in medicos:
-        # Obtener citas del médico en la fecha especificada
-        citas = db.query(Cita).filter(
+    # Citas del día de todos los médicos en una sola consulta (antes: una por médico)
+    citas_por_medico = {medico.id: [] for medico in medicos}
+    if medicos:
+        citas_dia = db.query(Cita).filter(
             and_(
-                Cita.medico_id == medico.id,
+                Cita.medico_id.in_(list(citas_por_medico)),
                 func.date(Cita.fecha) == fecha,
                 Cita.estado.in_(['programada', 'confirmada', 'Pendiente', 'Confirmada'])
             )
-        ).all()
+        ).order_by(Cita.id).all()
+        for cita in citas_dia:
+            citas_por_medico[cita.medico_id].append(cita)
+    
+    disponibilidad = []
+    for medico in medicos:
+        citas = citas_por_medico[medico.id]
         
         # Calcular bloques ocupados
         bloques_ocupados = []
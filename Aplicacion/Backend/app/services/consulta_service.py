@@ -6,8 +6,11 @@ from app.models.consulta import Consulta
 from app.models.cita import Cita
 from app.models.historia import Historia
 from app.schemas.consulta_schema import ConsultaCreate, ConsultaUpdate
+from app.utils.logger import obtener_logger
 import json
 
+logger = obtener_logger("consultas")
+
 def create_consulta(db: Session, payload: ConsultaCreate):
     from app.models.paciente import Paciente
     from fastapi import HTTPException
@@ -84,7 +87,7 @@ def create_consulta(db: Session, payload: ConsultaCreate):
             
             cita.sala_asignada = sala
             cita.estado = "en_consulta"  # Cambiar estado a en consulta
-            print(f"✅ Sala asignada a cita #{cita.id}: {sala}")
+            logger.info("Sala asignada", extra={"cita_id": cita.id, "sala": sala})
     
     db.commit()
     db.refresh(consulta)
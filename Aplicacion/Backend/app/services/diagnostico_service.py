@@ -1,12 +1,16 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.diagnostico_cie10 import DiagnosticoCIE10
+from app.utils.logger import obtener_logger
+
+logger = obtener_logger("diagnosticos")
 
 class DiagnosticoService:
     @staticmethod
-    def buscar_diagnosticos(db: Session, query: str, limit: int = 20):
+    async def buscar_diagnosticos(db: AsyncSession, query: str, limit: int = 20):
         """
-        Busca diagnósticos CIE-10 por código o descripción.
+        Busca diagnósticos CIE-10 por código o descripción (sesión async).
         Retorna lista de objetos ORM que serán convertidos por Pydantic.
         """
         if not query or len(query) < 2:
@@ -15,24 +19,23 @@ class DiagnosticoService:
         search_pattern = f"%{query.upper()}%"  # Convertir a mayúsculas para búsqueda
         
         try:
-            diagnosticos = db.query(DiagnosticoCIE10).filter(
-                or_(
-                    DiagnosticoCIE10.codigo.ilike(search_pattern),
-                    DiagnosticoCIE10.descripcion.ilike(search_pattern)
-                )
-            ).limit(limit).all()
+            resultado = await db.execute(
+                select(DiagnosticoCIE10).where(
+                    or_(
+                        DiagnosticoCIE10.codigo.ilike(search_pattern),
+                        DiagnosticoCIE10.descripcion.ilike(search_pattern)
+                    )
+                ).limit(limit)
+            )
+            diagnosticos = resultado.scalars().all()
             
-            # Debug: Verificar qué tipo de objetos estamos devolviendo
-            if diagnosticos:
-                print(f"✅ Se encontraron {len(diagnosticos)} diagnósticos")
-                print(f"   Primer resultado tipo: {type(diagnosticos[0])}")
-                print(f"   Primer resultado: id={diagnosticos[0].id}, codigo={diagnosticos[0].codigo}")
-            else:
-                print(f"⚠️ No se encontraron diagnósticos para: {query}")
+            if not diagnosticos:
+                logger.info("Búsqueda de diagnósticos sin resultados",
+                            extra={"evento": "diagnosticos.sin_resultados", "consulta": query})
             
             return diagnosticos
         except Exception as e:
-            print(f"❌ Error al buscar diagnósticos: {e}")
+            logger.exception("Error al buscar diagnósticos", extra={"consulta": query})
             return []
     
     @staticmethod
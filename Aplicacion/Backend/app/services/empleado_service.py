@@ -1,9 +1,15 @@
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.models.empleado import Empleado, EstadoEmpleado
 from app.schemas.empleado_schema import EmpleadoCreate, EmpleadoUpdate
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash
+from app.services.password_service import verificar_password
+from app.core.permissions import invalidar_principal
+from app.services.resumen_service import invalidar_empleado
 
-def create_empleado(db: Session, payload: EmpleadoCreate):
+def create_empleado(db: Session, payload: EmpleadoCreate, hashed_password: Optional[str] = None):
+    """hashed_password: hash ya calculado (p. ej. en el pool de hash); si falta se calcula aquí"""
     # Manejar el estado - convertir de Pydantic enum a SQLAlchemy enum si es necesario
     estado = EstadoEmpleado.ACTIVO  # Por defecto
     if hasattr(payload, 'estado') and payload.estado is not None:
@@ -22,7 +28,7 @@ def create_empleado(db: Session, payload: EmpleadoCreate):
         cedula=payload.cedula,
         cargo=payload.cargo,
         email=payload.email,
-        hashed_password=get_password_hash(payload.password),
+        hashed_password=hashed_password or get_password_hash(payload.password),
         activo=payload.activo if hasattr(payload, 'activo') else True,  # Por defecto activo (no eliminado)
         estado=estado  # Estado validado
     )
@@ -64,6 +70,8 @@ def update_empleado(db: Session, empleado_id: int, payload: EmpleadoUpdate):
     
     db.add(empleado)
     db.commit()
+    invalidar_empleado(empleado_id, db)
+    invalidar_principal(empleado_id)
     db.refresh(empleado)
     return empleado
 
@@ -75,15 +83,12 @@ def delete_empleado(db: Session, empleado_id: int):
     # Borrado lógico en lugar de físico
     empleado.soft_delete()
     db.commit()
+    invalidar_empleado(empleado_id, db)
+    invalidar_principal(empleado_id)
     return True
 
-def authenticate_empleado(db: Session, email: str, password: str):
-    """
-    Autenticar empleados.
-    Validaciones:
-    1. activo = True (no está eliminado lógicamente)
-    2. estado = 'Activo' (tiene permiso de acceso) o None (se asigna Activo automáticamente)
-    """
+def obtener_empleado_para_login(db: Session, email: str):
+    """Empleado activo (no eliminado) con contraseña registrada, o None"""
     if not email:
         return None
     
@@ -93,20 +98,48 @@ def authenticate_empleado(db: Session, email: str, password: str):
         Empleado.activo == True  # No eliminado
     ).first()
     
-    if not empleado:
+    if not empleado or not empleado.hashed_password:
         return None
-    if not empleado.hashed_password:
-        return None
-    if not verify_password(password, empleado.hashed_password):
+    return empleado
+
+def completar_login(db: Session, empleado: Empleado, nuevo_hash: Optional[str] = None):
+    """
+    Tras verificar la contraseña: guarda el hash regenerado (cambio de costo de
+    bcrypt) y valida el estado del empleado
+    """
+    if empleado.estado is not None and empleado.estado != EstadoEmpleado.ACTIVO:
+        # Usuario con estado diferente a ACTIVO no puede iniciar sesión
         return None
     
-    # Si el estado es None o no es ACTIVO, actualizar a ACTIVO (migración automática)
+    cambios = False
+    if nuevo_hash:
+        empleado.hashed_password = nuevo_hash
+        cambios = True
+    # Si el estado es None, actualizar a ACTIVO (migración automática)
     if empleado.estado is None:
         empleado.estado = EstadoEmpleado.ACTIVO
+        cambios = True
+    if cambios:
         db.commit()
         db.refresh(empleado)
-    elif empleado.estado != EstadoEmpleado.ACTIVO:
-        # Usuario con estado diferente a ACTIVO no puede iniciar sesión
+    return empleado
+
+async def authenticate_empleado(db: Session, email: str, password: str):
+    """
+    Autenticar empleados.
+    Validaciones:
+    1. activo = True (no está eliminado lógicamente)
+    2. estado = 'Activo' (tiene permiso de acceso) o None (se asigna Activo automáticamente)
+    
+    Las consultas corren en el threadpool y bcrypt en el pool de hash, así que
+    el event loop queda libre mientras se verifica la contraseña.
+    """
+    empleado = await run_in_threadpool(obtener_empleado_para_login, db, email)
+    if not empleado:
         return None
     
-    return empleado
+    valida, nuevo_hash = await verificar_password(password, empleado.hashed_password)
+    if not valida:
+        return None
+    
+    return await run_in_threadpool(completar_login, db, empleado, nuevo_hash)
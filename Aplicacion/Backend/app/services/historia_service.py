@@ -1,11 +1,15 @@
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_
-from app.models.historia import Historia
+from sqlalchemy import or_, func, select, text
+from sqlalchemy.exc import IntegrityError
+from datetime import date
+from typing import List
+from app.models.historia import Historia, SecuenciaHistoria
 from app.models.paciente import Paciente
 from app.models.consulta import Consulta
 from app.models.receta import Receta
 from app.models.empleado import Empleado
 from app.schemas.historia_schema import HistoriaCreate
+from app.utils.validators import generar_numero_historia_clinica
 
 def create_historia(db: Session, payload: HistoriaCreate):
     h = Historia(identificador=payload.identificador, activo=True)
@@ -14,32 +18,135 @@ def create_historia(db: Session, payload: HistoriaCreate):
     db.refresh(h)
     return h
 
+def reservar_numeros_historia(db: Session, cantidad: int = 1, fecha: date = None) -> List[str]:
+    """
+    Reserva un bloque de números de historia clínica consecutivos (RF-001).
+
+    El contador diario (tabla secuencias_historia) se incrementa de forma
+    atómica en una transacción corta e independiente de la sesión, por lo que
+    dos registros concurrentes nunca reciben el mismo número. Si la sesión que
+    usa el número hace rollback solo queda un hueco en la secuencia.
+
+    Args:
+        cantidad: Números a reservar (más de uno para importaciones masivas)
+        fecha: Día de la secuencia (por defecto, hoy)
+
+    Returns:
+        List[str]: Números HCL-YYYYMMDD-NNNN en orden ascendente
+    """
+    if cantidad < 1:
+        raise ValueError("La cantidad de números a reservar debe ser mayor a cero")
+
+    fecha = fecha or date.today()
+    clave = fecha.strftime("%Y%m%d")
+
+    with db.get_bind().begin() as conn:
+        if conn.dialect.name == "mysql":
+            ultimo = _incrementar_secuencia_mysql(conn, clave, cantidad)
+        else:
+            ultimo = _incrementar_secuencia_generica(conn, clave, cantidad)
+
+    primero = ultimo - cantidad + 1
+    return [generar_numero_historia_clinica(n - 1, fecha) for n in range(primero, ultimo + 1)]
+
+
+def asignar_numero_historia(db: Session, fecha: date = None) -> str:
+    """Reserva un único número de historia clínica"""
+    return reservar_numeros_historia(db, 1, fecha)[0]
+
+
+def _incrementar_secuencia_mysql(conn, clave: str, cantidad: int) -> int:
+    """
+    Incrementa el contador con UPDATE ... LAST_INSERT_ID(n + k): una sola
+    consulta por clave primaria. MySQL devuelve el nuevo valor en el paquete OK
+    (lastrowid), sin necesidad de un SELECT adicional.
+    """
+    result = conn.execute(
+        text(
+            "UPDATE secuencias_historia "
+            "SET ultimo_numero = LAST_INSERT_ID(ultimo_numero + :cantidad) "
+            "WHERE fecha = :fecha"
+        ),
+        {"cantidad": cantidad, "fecha": clave}
+    )
+
+    if not result.rowcount:
+        # Primera reserva del día: partir del último número ya existente en
+        # historias (datos previos a la tabla de secuencias). Si otro proceso
+        # creó la fila entre tanto, ON DUPLICATE KEY incrementa sobre ella.
+        base = _ultimo_numero_existente(conn, clave)
+        result = conn.execute(
+            text(
+                "INSERT INTO secuencias_historia (fecha, ultimo_numero) "
+                "VALUES (:fecha, LAST_INSERT_ID(:inicial)) "
+                "ON DUPLICATE KEY UPDATE ultimo_numero = LAST_INSERT_ID(ultimo_numero + :cantidad)"
+            ),
+            {"fecha": clave, "inicial": base + cantidad, "cantidad": cantidad}
+        )
+
+    if result.lastrowid:
+        return int(result.lastrowid)
+    return int(conn.execute(text("SELECT LAST_INSERT_ID()")).scalar())
+
+
+def _incrementar_secuencia_generica(conn, clave: str, cantidad: int) -> int:
+    """
+    Variante portable (SQLite en pruebas y desarrollo): UPDATE + SELECT dentro
+    de la misma transacción, que bloquea la fila/base de datos hasta el commit.
+    """
+    tabla = SecuenciaHistoria.__table__
+    result = conn.execute(
+        tabla.update()
+        .where(tabla.c.fecha == clave)
+        .values(ultimo_numero=tabla.c.ultimo_numero + cantidad)
+    )
+
+    if not result.rowcount:
+        inicial = _ultimo_numero_existente(conn, clave) + cantidad
+        try:
+            conn.execute(tabla.insert().values(fecha=clave, ultimo_numero=inicial))
+            return inicial
+        except IntegrityError:
+            conn.execute(
+                tabla.update()
+                .where(tabla.c.fecha == clave)
+                .values(ultimo_numero=tabla.c.ultimo_numero + cantidad)
+            )
+
+    return conn.execute(
+        select(tabla.c.ultimo_numero).where(tabla.c.fecha == clave)
+    ).scalar()
+
+
+def _ultimo_numero_existente(conn, clave: str) -> int:
+    """Último secuencial HCL-YYYYMMDD-NNNN ya usado en historias para el día"""
+    ultimo = conn.execute(
+        select(func.max(Historia.identificador)).where(
+            Historia.identificador.like(f"HCL-{clave}-%")
+        )
+    ).scalar()
+
+    if not ultimo:
+        return 0
+    partes = ultimo.split('-')
+    if len(partes) == 3:
+        try:
+            return int(partes[2])
+        except ValueError:
+            return 0
+    return 0
+
+
 def list_historias(db: Session):
-    # Incluir historias activas y NULL (migración automática)
+    # Incluir historias activas y NULL (los NULL se corrigen en migraciones)
     historias = db.query(Historia).filter(
         or_(Historia.activo == True, Historia.activo.is_(None))
     ).all()
     
-    # Corregir registros con activo=NULL
-    for historia in historias:
-        if historia.activo is None:
-            historia.activo = True
-    
-    if any(h.activo is None for h in historias):
-        db.commit()
-    
     return historias
 
 def get_historia(db: Session, historia_id: int):
-    historia = db.query(Historia).filter(Historia.id == historia_id).first()
-    
-    # Corregir activo=NULL si existe
-    if historia and historia.activo is None:
-        historia.activo = True
-        db.commit()
-        db.refresh(historia)
-    
-    return historia
+    return db.query(Historia).filter(Historia.id == historia_id).first()
 
 def buscar_expediente_completo(db: Session, termino: str):
     """
@@ -0,0 +1,237 @@
+"""
+Importación masiva de pacientes desde CSV (RF-001)
+Pensada para migrar la base de pacientes de otra clínica: procesa el archivo
+por bloques, valida columnas completas y usa inserciones en bloque.
+"""
+import csv
+from datetime import date, datetime
+from typing import IO, Dict, Iterator, List, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.models.historia import Historia
+from app.models.paciente import Paciente
+from app.services.historia_service import reservar_numeros_historia
+from app.utils.logger import obtener_logger
+from app.utils.validators import (
+    validar_cedulas_ecuatorianas,
+    validar_edad_coherente,
+    validar_formato_email
+)
+
+# Columnas aceptadas en el CSV (mismos nombres que PacienteCreate)
+COLUMNAS_OBLIGATORIAS = ("nombre", "apellido", "cedula")
+COLUMNAS_TEXTO = (
+    "email", "telefono", "direccion", "genero", "grupo_sanguineo", "alergias",
+    "antecedentes_medicos", "contacto_emergencia_nombre", "contacto_emergencia_telefono",
+    "contacto_emergencia_relacion", "tipo_seguro", "aseguradora", "numero_poliza"
+)
+COLUMNAS_FECHA = ("fecha_nacimiento", "fecha_vigencia_poliza")
+
+TAMANO_LOTE = 1000
+MAX_ERRORES_REPORTE = 5000
+
+logger = obtener_logger("importacion")
+
+
+def _leer_por_lotes(archivo: IO[str], tamano_lote: int) -> Iterator[List[dict]]:
+    """Lee el CSV de forma incremental y entrega bloques de filas"""
+    lector = csv.DictReader(archivo)
+    faltantes = [c for c in COLUMNAS_OBLIGATORIAS if c not in (lector.fieldnames or [])]
+    if faltantes:
+        raise ValueError(f"Faltan columnas obligatorias en el CSV: {', '.join(faltantes)}")
+
+    lote = []
+    for fila in lector:
+        lote.append(fila)
+        if len(lote) >= tamano_lote:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def _texto(valor: Optional[str]) -> Optional[str]:
+    valor = (valor or "").strip()
+    return valor or None
+
+
+def _fecha(valor: Optional[str]) -> Optional[date]:
+    valor = _texto(valor)
+    if not valor:
+        return None
+    return datetime.strptime(valor, "%Y-%m-%d").date()
+
+
+def _insertar(db: Session, nuevos: List[tuple], numeros_hc: List[str]):
+    """INSERT masivos de historias y pacientes (sin commit)"""
+    db.execute(
+        Historia.__table__.insert(),
+        [{"identificador": numero, "activo": True} for numero in numeros_hc]
+    )
+    ids_historia = dict(
+        db.query(Historia.identificador, Historia.id)
+        .filter(Historia.identificador.in_(numeros_hc))
+        .all()
+    )
+
+    filas_paciente = []
+    for (_, cedula_int, email, fila), numero in zip(nuevos, numeros_hc):
+        datos = {campo: _texto(fila.get(campo)) for campo in COLUMNAS_TEXTO}
+        datos.update(fila["_fechas"])
+        datos.update(
+            nombre=_texto(fila.get("nombre")),
+            apellido=_texto(fila.get("apellido")),
+            cedula=cedula_int,
+            email=email,
+            historia_id=ids_historia[numero],
+            activo=True
+        )
+        filas_paciente.append(datos)
+
+    db.execute(Paciente.__table__.insert(), filas_paciente)
+
+
+def importar_pacientes_csv(db: Session, archivo: IO[str], tamano_lote: int = TAMANO_LOTE) -> Dict:
+    """
+    Importa pacientes desde un CSV con cabecera (columnas de PacienteCreate,
+    fechas en formato YYYY-MM-DD).
+
+    Por cada bloque de filas:
+    1. Valida la columna de cédulas completa con validar_cedulas_ecuatorianas
+    2. Verifica unicidad de cédula y email con una sola consulta
+    3. Reserva los números de historia clínica en bloque
+    4. Inserta historias y pacientes con INSERT masivos y hace commit
+
+    Las filas inválidas no detienen la importación: se reportan con su
+    número de fila (la fila 1 es la cabecera). Si el INSERT de un bloque
+    falla, el bloque se reintenta fila por fila para reportar solo las
+    filas que la base de datos rechaza.
+
+    Returns:
+        dict: total_filas, importados y lista de errores por fila
+    """
+    total_filas = 0
+    importados = 0
+    errores: List[dict] = []
+    cedulas_vistas = set()
+    emails_vistos = set()
+
+    def registrar_error(numero_fila: int, cedula, mensaje: str):
+        if len(errores) < MAX_ERRORES_REPORTE:
+            errores.append({"fila": numero_fila, "cedula": cedula, "error": mensaje})
+
+    for lote in _leer_por_lotes(archivo, tamano_lote):
+        primera_fila = total_filas + 2  # +1 por la cabecera, +1 por base 1
+        total_filas += len(lote)
+
+        # 1. Validación por columna de las cédulas
+        cedulas = [_texto(f.get("cedula")) or "" for f in lote]
+        validaciones = validar_cedulas_ecuatorianas(cedulas)
+
+        candidatos = []  # (numero_fila, cedula_int, email, fila)
+        for i, (fila, (cedula_valida, mensaje)) in enumerate(zip(lote, validaciones)):
+            numero_fila = primera_fila + i
+            cedula = cedulas[i]
+
+            if not cedula_valida:
+                registrar_error(numero_fila, cedula, f"Cédula inválida: {mensaje}")
+                continue
+            if not _texto(fila.get("nombre")) or not _texto(fila.get("apellido")):
+                registrar_error(numero_fila, cedula, "Nombre y apellido son obligatorios")
+                continue
+
+            email = _texto(fila.get("email"))
+            if email and not validar_formato_email(email):
+                registrar_error(numero_fila, cedula, "Formato de email inválido")
+                continue
+
+            try:
+                fechas = {campo: _fecha(fila.get(campo)) for campo in COLUMNAS_FECHA}
+            except ValueError:
+                registrar_error(numero_fila, cedula, "Fecha inválida (formato esperado YYYY-MM-DD)")
+                continue
+
+            if fechas["fecha_nacimiento"]:
+                fecha_valida, mensaje_fecha = validar_edad_coherente(fechas["fecha_nacimiento"])
+                if not fecha_valida:
+                    registrar_error(numero_fila, cedula, mensaje_fecha)
+                    continue
+
+            cedula_int = int(cedula)
+            if cedula_int in cedulas_vistas:
+                registrar_error(numero_fila, cedula, "Cédula duplicada dentro del archivo")
+                continue
+            if email and email.lower() in emails_vistos:
+                registrar_error(numero_fila, cedula, "Email duplicado dentro del archivo")
+                continue
+            cedulas_vistas.add(cedula_int)
+            if email:
+                emails_vistos.add(email.lower())
+
+            fila["_fechas"] = fechas
+            candidatos.append((numero_fila, cedula_int, email, fila))
+
+        if not candidatos:
+            continue
+
+        # 2. Unicidad contra la base de datos: una consulta por bloque
+        cedulas_lote = [c[1] for c in candidatos]
+        emails_lote = [c[2] for c in candidatos if c[2]]
+        condiciones = [Paciente.cedula.in_(cedulas_lote)]
+        if emails_lote:
+            condiciones.append(Paciente.email.in_(emails_lote))
+        existentes = db.query(Paciente.cedula, Paciente.email).filter(or_(*condiciones)).all()
+        cedulas_existentes = {c for c, _ in existentes}
+        emails_existentes = {e.lower() for _, e in existentes if e}
+
+        nuevos = []
+        for numero_fila, cedula_int, email, fila in candidatos:
+            if cedula_int in cedulas_existentes:
+                registrar_error(numero_fila, str(cedula_int), "Ya existe un paciente con esta cédula")
+            elif email and email.lower() in emails_existentes:
+                registrar_error(numero_fila, str(cedula_int), "Ya existe un paciente con este email")
+            else:
+                nuevos.append((numero_fila, cedula_int, email, fila))
+
+        if not nuevos:
+            continue
+
+        # 3. Números de historia clínica reservados en bloque
+        numeros_hc = reservar_numeros_historia(db, len(nuevos))
+
+        # 4. Inserción masiva de historias y pacientes
+        try:
+            _insertar(db, nuevos, numeros_hc)
+            db.commit()
+            importados += len(nuevos)
+            continue
+        except Exception:
+            db.rollback()
+            logger.exception(
+                "Error insertando un bloque de pacientes; se reintenta fila por fila",
+                extra={"primera_fila": primera_fila, "filas": len(nuevos)}
+            )
+
+        # Los números reservados siguen siendo de esta importación tras el rollback
+        for fila_nueva, numero in zip(nuevos, numeros_hc):
+            numero_fila, cedula_int, email, _ = fila_nueva
+            try:
+                _insertar(db, [fila_nueva], [numero])
+                db.commit()
+                importados += 1
+            except Exception:
+                db.rollback()
+                logger.exception("Error insertando paciente importado", extra={"fila": numero_fila})
+                cedulas_vistas.discard(cedula_int)
+                if email:
+                    emails_vistos.discard(email.lower())
+                registrar_error(numero_fila, str(cedula_int), "No se pudo guardar el paciente en la base de datos")
+
+    return {
+        "total_filas": total_filas,
+        "importados": importados,
+        "rechazados": total_filas - importados,
+        "errores": errores
+    }
@@ -2,6 +2,9 @@ from sqlalchemy.orm import Session
 from app.models.medicamento import Medicamento
 from app.models.farmacia import Farmacia
 from app.schemas.medicamento_schema import MedicamentoCreate
+from app.utils.logger import obtener_logger
+
+logger = obtener_logger("medicamentos")
 
 def create_medicamento(db: Session, payload: MedicamentoCreate):
     # Si no se proporciona farmacia_id, intentar obtener la primera farmacia disponible
@@ -32,25 +35,21 @@ def list_medicamentos(db: Session):
     # Corregir registros con activo=NULL o activo=0 para que sean activos
     for medicamento in medicamentos:
         if medicamento.activo is None or medicamento.activo == False:
-            print(f"⚠️ Medicamento {medicamento.id} - {medicamento.nombre} tiene activo={medicamento.activo}, corrigiendo a True")
+            logger.info(
+                "Medicamento con activo nulo o falso, corregido a True",
+                extra={"evento": "medicamentos.activo_corregido", "medicamento_id": medicamento.id,
+                       "activo": medicamento.activo}
+            )
             medicamento.activo = True
     
     if any(m.activo is None or m.activo == False for m in medicamentos):
         db.commit()
-        print(f"✅ Se actualizaron {len(medicamentos)} medicamentos a activo=True")
+        logger.info("Medicamentos corregidos a activo=True", extra={"total": len(medicamentos)})
     
     return medicamentos
 
 def get_medicamento(db: Session, med_id: int):
-    medicamento = db.query(Medicamento).filter(Medicamento.id == med_id).first()
-    
-    # Corregir activo=NULL si existe
-    if medicamento and medicamento.activo is None:
-        medicamento.activo = True
-        db.commit()
-        db.refresh(medicamento)
-    
-    return medicamento
+    return db.query(Medicamento).filter(Medicamento.id == med_id).first()
 
 def buscar_medicamentos(db: Session, query: str, limit: int = 20):
     """
@@ -69,12 +68,4 @@ def buscar_medicamentos(db: Session, query: str, limit: int = 20):
         or_(Medicamento.activo == True, Medicamento.activo.is_(None))  # Activos o NULL
     ).limit(limit).all()
     
-    # Corregir registros con activo=NULL
-    for medicamento in medicamentos:
-        if medicamento.activo is None:
-            medicamento.activo = True
-    
-    if any(m.activo is None for m in medicamentos):
-        db.commit()
-    
     return medicamentos
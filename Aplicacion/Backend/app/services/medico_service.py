@@ -2,23 +2,16 @@ from sqlalchemy.orm import Session
 from app.models.medico import Medico
 from app.models.empleado import Empleado
 from app.schemas.medico_schema import MedicoCreate, MedicoUpdate
+from app.services.resumen_service import invalidar_medico
 
 def list_medicos(db: Session):
     """Listar todos los médicos activos del sistema"""
     from sqlalchemy import or_
-    # Incluir médicos con activo=True o activo=NULL (migración automática)
+    # Incluir médicos con activo=True o activo=NULL (los NULL se corrigen en migraciones)
     medicos = db.query(Medico).filter(
         or_(Medico.activo == True, Medico.activo.is_(None))
     ).all()
     
-    # Corregir registros con activo=NULL
-    for medico in medicos:
-        if medico.activo is None:
-            medico.activo = True
-    
-    if any(m.activo is None for m in medicos):
-        db.commit()
-    
     return medicos
 
 def get_medico(db: Session, medico_id: int):
@@ -29,12 +22,6 @@ def get_medico(db: Session, medico_id: int):
         or_(Medico.activo == True, Medico.activo.is_(None))
     ).first()
     
-    # Corregir activo=NULL si existe
-    if medico and medico.activo is None:
-        medico.activo = True
-        db.commit()
-        db.refresh(medico)
-    
     return medico
 
 def get_medico_by_cedula(db: Session, cedula: int):
@@ -68,6 +55,7 @@ def update_medico(db: Session, medico_id: int, medico_data: MedicoUpdate):
         setattr(medico, key, value)
     
     db.commit()
+    invalidar_medico(medico_id, db)
     db.refresh(medico)
     return medico
 
@@ -80,6 +68,7 @@ def delete_medico(db: Session, medico_id: int):
     # Borrado lógico en lugar de físico
     medico.soft_delete()
     db.commit()
+    invalidar_medico(medico_id, db)
     return True
 
 def list_medicos_empleados(db: Session):
@@ -1,5 +1,6 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.orm import contains_eager
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime, date, timedelta
 from app.models.medicamento import Medicamento
@@ -8,11 +9,12 @@ from app.models.lote import Lote
 class NotificacionStockService:
     """
     RF-004: Servicio para gestionar notificaciones de stock
-    Alertas para médicos y farmacéuticos sobre stock crítico y vencimientos
+    Alertas para médicos y farmacéuticos sobre stock crítico y vencimientos.
+    Consultas con la sesión async: el dashboard las pide en cada refresco.
     """
     
     @staticmethod
-    def obtener_alertas_dashboard() -> dict:
+    async def obtener_alertas_dashboard(db: AsyncSession) -> dict:
         """
         Obtener todas las alertas para el dashboard
         Retorna: {
@@ -22,31 +24,26 @@ class NotificacionStockService:
             "vencidos": []
         }
         """
-        from app.core.database import SessionLocal
-        db = SessionLocal()
-        
-        try:
-            alertas = {
-                "stock_critico": NotificacionStockService._obtener_stock_critico(db),
-                "stock_agotado": NotificacionStockService._obtener_stock_agotado(db),
-                "proximos_vencer": NotificacionStockService._obtener_proximos_vencer(db),
-                "vencidos": NotificacionStockService._obtener_vencidos(db)
-            }
-            return alertas
-        finally:
-            db.close()
+        return {
+            "stock_critico": await NotificacionStockService._obtener_stock_critico(db),
+            "stock_agotado": await NotificacionStockService._obtener_stock_agotado(db),
+            "proximos_vencer": await NotificacionStockService._obtener_proximos_vencer(db),
+            "vencidos": await NotificacionStockService._obtener_vencidos(db)
+        }
     
     @staticmethod
-    def _obtener_stock_critico(db: Session, umbral: int = 10) -> List[dict]:
+    async def _obtener_stock_critico(db: AsyncSession, umbral: int = 10) -> List[dict]:
         """
         Obtener medicamentos con stock crítico (< umbral)
         """
-        medicamentos = db.query(Medicamento).filter(
-            and_(
-                Medicamento.stock > 0,
-                Medicamento.stock < umbral
+        medicamentos = (await db.execute(
+            select(Medicamento).where(
+                and_(
+                    Medicamento.stock > 0,
+                    Medicamento.stock < umbral
+                )
             )
-        ).all()
+        )).scalars().all()
         
         alertas = []
         for med in medicamentos:
@@ -64,13 +61,13 @@ class NotificacionStockService:
         return alertas
     
     @staticmethod
-    def _obtener_stock_agotado(db: Session) -> List[dict]:
+    async def _obtener_stock_agotado(db: AsyncSession) -> List[dict]:
         """
         Obtener medicamentos agotados
         """
-        medicamentos = db.query(Medicamento).filter(
-            Medicamento.stock == 0
-        ).all()
+        medicamentos = (await db.execute(
+            select(Medicamento).where(Medicamento.stock == 0)
+        )).scalars().all()
         
         alertas = []
         for med in medicamentos:
@@ -88,19 +85,22 @@ class NotificacionStockService:
         return alertas
     
     @staticmethod
-    def _obtener_proximos_vencer(db: Session, dias: int = 30) -> List[dict]:
+    async def _obtener_proximos_vencer(db: AsyncSession, dias: int = 30) -> List[dict]:
         """
         Obtener lotes próximos a vencer en los próximos X días
         """
         fecha_limite = date.today() + timedelta(days=dias)
         
-        lotes = db.query(Lote).join(Medicamento).filter(
-            and_(
-                Lote.fecha_vencimiento <= fecha_limite,
-                Lote.fecha_vencimiento >= date.today(),
-                Lote.cantidad_disponible > 0
-            )
-        ).order_by(Lote.fecha_vencimiento.asc()).all()
+        # contains_eager: el medicamento viene del mismo JOIN (sin carga perezosa)
+        lotes = (await db.execute(
+            select(Lote).join(Lote.medicamento).options(contains_eager(Lote.medicamento)).where(
+                and_(
+                    Lote.fecha_vencimiento <= fecha_limite,
+                    Lote.fecha_vencimiento >= date.today(),
+                    Lote.cantidad_disponible > 0
+                )
+            ).order_by(Lote.fecha_vencimiento.asc())
+        )).scalars().all()
         
         alertas = []
         for lote in lotes:
@@ -127,16 +127,18 @@ class NotificacionStockService:
         return alertas
     
     @staticmethod
-    def _obtener_vencidos(db: Session) -> List[dict]:
+    async def _obtener_vencidos(db: AsyncSession) -> List[dict]:
         """
         Obtener lotes vencidos con stock
         """
-        lotes = db.query(Lote).join(Medicamento).filter(
-            and_(
-                Lote.fecha_vencimiento < date.today(),
-                Lote.cantidad_disponible > 0
+        lotes = (await db.execute(
+            select(Lote).join(Lote.medicamento).options(contains_eager(Lote.medicamento)).where(
+                and_(
+                    Lote.fecha_vencimiento < date.today(),
+                    Lote.cantidad_disponible > 0
+                )
             )
-        ).all()
+        )).scalars().all()
         
         alertas = []
         for lote in lotes:
@@ -159,12 +161,12 @@ class NotificacionStockService:
         return alertas
     
     @staticmethod
-    def verificar_disponibilidad_para_prescripcion(db: Session, medicamento_id: int, cantidad: int) -> dict:
+    async def verificar_disponibilidad_para_prescripcion(db: AsyncSession, medicamento_id: int, cantidad: int) -> dict:
         """
         Verificar si un medicamento puede ser prescrito
         Usado por médicos al crear recetas
         """
-        medicamento = db.query(Medicamento).filter(Medicamento.id == medicamento_id).first()
+        medicamento = await db.get(Medicamento, medicamento_id)
         if not medicamento:
             return {
                 "disponible": False,
@@ -173,16 +175,16 @@ class NotificacionStockService:
             }
         
         # Verificar stock en lotes disponibles
-        lotes_disponibles = db.query(Lote).filter(
-            and_(
-                Lote.medicamento_id == medicamento_id,
-                Lote.cantidad_disponible > 0,
-                Lote.fecha_vencimiento >= date.today(),
-                Lote.estado.in_(["disponible", "proximo_a_vencer"])
+        stock_total = (await db.execute(
+            select(func.coalesce(func.sum(Lote.cantidad_disponible), 0)).where(
+                and_(
+                    Lote.medicamento_id == medicamento_id,
+                    Lote.cantidad_disponible > 0,
+                    Lote.fecha_vencimiento >= date.today(),
+                    Lote.estado.in_(["disponible", "proximo_a_vencer"])
+                )
             )
-        ).all()
-        
-        stock_total = sum(lote.cantidad_disponible for lote in lotes_disponibles)
+        )).scalar()
         
         if stock_total == 0:
             return {
@@ -216,13 +218,13 @@ class NotificacionStockService:
             }
     
     @staticmethod
-    def obtener_resumen_alertas(db: Session) -> dict:
+    async def obtener_resumen_alertas(db: AsyncSession) -> dict:
         """
         Obtener resumen numérico de alertas para dashboard
         """
         return {
-            "stock_critico": len(NotificacionStockService._obtener_stock_critico(db)),
-            "stock_agotado": len(NotificacionStockService._obtener_stock_agotado(db)),
-            "proximos_vencer": len(NotificacionStockService._obtener_proximos_vencer(db)),
-            "vencidos": len(NotificacionStockService._obtener_vencidos(db))
+            "stock_critico": len(await NotificacionStockService._obtener_stock_critico(db)),
+            "stock_agotado": len(await NotificacionStockService._obtener_stock_agotado(db)),
+            "proximos_vencer": len(await NotificacionStockService._obtener_proximos_vencer(db)),
+            "vencidos": len(await NotificacionStockService._obtener_vencidos(db))
         }
@@ -1,16 +1,21 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, or_, and_, case, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.paciente import Paciente
 from app.models.historia import Historia
-from app.schemas.paciente_schema import PacienteCreate, PacienteUpdate
+from app.schemas.paciente_schema import PacienteBase, PacienteCreate, PacienteUpdate
 from app.utils.validators import (
     validar_cedula_ecuatoriana, 
     validar_vigencia_poliza,
-    generar_numero_historia_clinica,
     validar_edad_coherente
 )
+from app.services.historia_service import asignar_numero_historia
+from app.services.resumen_service import invalidar_paciente
+from app.utils.respuesta_json import columnas, subdict
+from app.utils.validators import edad_en_anios
 from fastapi import HTTPException
-from datetime import date
+from datetime import date, timedelta
+from typing import Optional
 
 
 def create_paciente(db: Session, payload: PacienteCreate):
@@ -40,27 +45,8 @@ def create_paciente(db: Session, payload: PacienteCreate):
         if email_existente:
             raise HTTPException(status_code=400, detail="Ya existe un paciente con este email")
     
-    # Generar número de historia clínica único
-    # Obtener el último número del día actual
-    hoy = date.today()
-    fecha_str = hoy.strftime("%Y%m%d")
-    patron_hc = f"HCL-{fecha_str}-%"
-    
-    ultima_historia = db.query(Historia).filter(
-        Historia.identificador.like(patron_hc)
-    ).order_by(Historia.identificador.desc()).first()
-    
-    ultimo_numero = 0
-    if ultima_historia:
-        # Extraer el número secuencial del último registro
-        partes = ultima_historia.identificador.split('-')
-        if len(partes) == 3:
-            try:
-                ultimo_numero = int(partes[2])
-            except ValueError:
-                ultimo_numero = 0
-    
-    numero_hc = generar_numero_historia_clinica(ultimo_numero)
+    # Generar número de historia clínica único (contador diario atómico)
+    numero_hc = asignar_numero_historia(db)
     
     # Crear la historia clínica primero
     historia = Historia(identificador=numero_hc)
@@ -97,46 +83,115 @@ def create_paciente(db: Session, payload: PacienteCreate):
     
     return p
 
-def list_pacientes(db: Session, medico_id: int = None):
+# Orden de urgencia de la póliza para listados: primero lo que requiere acción
+RANGO_ESTADO_POLIZA = {
+    'vencida': 0,
+    'proxima_a_vencer': 1,
+    'vigente': 2,
+    'sin_informacion': 3,
+}
+
+
+def _estado_poliza_sql(hoy: date):
+    """
+    Expresión SQL equivalente a validar_vigencia_poliza para calcular el
+    estado de la póliza en la propia consulta (sin recorrer filas en Python)
+    """
+    return case(
+        (Paciente.fecha_vigencia_poliza.is_(None), 'sin_informacion'),
+        (Paciente.fecha_vigencia_poliza <= hoy, 'vencida'),
+        (Paciente.fecha_vigencia_poliza <= hoy + timedelta(days=30), 'proxima_a_vencer'),
+        else_='vigente'
+    )
+
+
+def _rango_poliza_sql(estado_expr):
+    return case(
+        *[(estado_expr == estado, rango) for estado, rango in RANGO_ESTADO_POLIZA.items()],
+        else_=len(RANGO_ESTADO_POLIZA)
+    )
+
+
+# Columnas de los listados, en el orden de PacienteOut
+CAMPOS_PACIENTE = list(PacienteBase.__fields__) + ["id", "historia_id"]
+
+
+def cursor_paciente(paciente: dict, orden: str = "id") -> str:
+    """Cursor opaco para continuar el listado después de este paciente (fila de list_pacientes)"""
+    if orden == "poliza":
+        rango = RANGO_ESTADO_POLIZA.get(paciente["estado_poliza"], len(RANGO_ESTADO_POLIZA))
+        return f"{rango}:{paciente['id']}"
+    return str(paciente["id"])
+
+
+def list_pacientes(
+    db: Session,
+    medico_id: int = None,
+    estado_poliza: Optional[str] = None,
+    orden: str = "id",
+    cursor: Optional[str] = None,
+    limite: Optional[int] = None
+):
     """
     Lista pacientes. Si se proporciona medico_id, solo devuelve pacientes de ese médico.
+    
+    Una sola consulta: el filtro por médico es un EXISTS sobre citas, la
+    historia clínica se carga con JOIN y el estado de póliza se calcula en SQL,
+    por lo que también se puede filtrar (estado_poliza) y ordenar (orden="poliza").
+    Paginación por cursor (keyset): pasar como `cursor` el valor de
+    cursor_paciente() del último paciente de la página anterior.
     """
+    hoy = date.today()
+    estado_expr = _estado_poliza_sql(hoy)
+    rango_expr = _rango_poliza_sql(estado_expr)
+    
+    # Solo columnas, sin entidades ORM: el listado se serializa con ORJSONResponse
+    # Filtrar solo pacientes activos (no eliminados) - incluye NULL como activo
+    query = db.query(
+        *columnas(Paciente, CAMPOS_PACIENTE),
+        Historia.identificador.label("numero_historia_clinica"),
+        estado_expr.label("estado_poliza")
+    ).outerjoin(
+        Historia, Paciente.historia_id == Historia.id
+    ).filter(
+        or_(Paciente.activo == True, Paciente.activo.is_(None))
+    )
+    
     if medico_id:
-        # Obtener pacientes que tienen citas con este médico
+        # Pacientes que tienen citas con este médico
         from app.models.cita import Cita
-        pacientes_ids = db.query(Cita.paciente_id).filter(Cita.medico_id == medico_id).distinct().all()
-        pacientes_ids = [pid[0] for pid in pacientes_ids]
-        # Filtrar solo pacientes activos (no eliminados) - incluye NULL como activo
-        pacientes = db.query(Paciente).filter(
-            Paciente.id.in_(pacientes_ids),
-            or_(Paciente.activo == True, Paciente.activo.is_(None))
-        ).all()
-    else:
-        # Filtrar solo pacientes activos (no eliminados) - incluye NULL como activo
-        pacientes = db.query(Paciente).filter(
-            or_(Paciente.activo == True, Paciente.activo.is_(None))
-        ).all()
+        query = query.filter(Paciente.citas.any(Cita.medico_id == medico_id))
     
-    # Corregir registros con activo=NULL (migración automática)
-    for paciente in pacientes:
-        if paciente.activo is None:
-            paciente.activo = True
+    if estado_poliza:
+        query = query.filter(estado_expr == estado_poliza)
     
-    # Hacer commit si hubo cambios
-    if any(p.activo is None for p in pacientes):
-        db.commit()
+    if orden == "poliza":
+        if cursor:
+            rango_cursor, id_cursor = (int(v) for v in cursor.split(":", 1))
+            query = query.filter(or_(
+                rango_expr > rango_cursor,
+                and_(rango_expr == rango_cursor, Paciente.id > id_cursor)
+            ))
+        query = query.order_by(rango_expr, Paciente.id)
+    else:
+        if cursor:
+            query = query.filter(Paciente.id > int(cursor))
+        query = query.order_by(Paciente.id)
     
-    # Agregar estado de póliza a cada paciente
-    for paciente in pacientes:
-        if paciente.fecha_vigencia_poliza:
-            estado, _ = validar_vigencia_poliza(paciente.fecha_vigencia_poliza)
-            paciente.estado_poliza = estado
-        else:
-            paciente.estado_poliza = 'sin_informacion'
-        
-        # Agregar número de historia clínica
-        if paciente.historia:
-            paciente.numero_historia_clinica = paciente.historia.identificador
+    if limite:
+        query = query.limit(limite)
+    
+    # Los activo=NULL se corrigen una vez en migraciones (DATOS_VERSION 2), no
+    # en este GET: con réplica la sesión es de solo lectura
+    pacientes = []
+    for fila in query.all():
+        fila = fila._mapping
+        # Estado de póliza y número de historia clínica ya vienen en la consulta
+        paciente = subdict(fila, CAMPOS_PACIENTE)
+        paciente["edad"] = edad_en_anios(paciente["fecha_nacimiento"])
+        paciente["numero_historia_clinica"] = fila["numero_historia_clinica"]
+        paciente["estado_poliza"] = fila["estado_poliza"]
+        pacientes.append(paciente)
     
     return pacientes
 
@@ -148,12 +203,6 @@ def get_paciente(db: Session, paciente_id: int):
     paciente = db.query(Paciente).filter(Paciente.id == paciente_id).first()
     
     if paciente:
-        # Corregir activo=NULL si existe (migración automática)
-        if paciente.activo is None:
-            paciente.activo = True
-            db.commit()
-            db.refresh(paciente)
-        
         # Agregar estado de póliza
         if paciente.fecha_vigencia_poliza:
             estado, _ = validar_vigencia_poliza(paciente.fecha_vigencia_poliza)
@@ -168,17 +217,18 @@ def get_paciente(db: Session, paciente_id: int):
     return paciente
 
 
-def buscar_pacientes(db: Session, termino: str):
+async def buscar_pacientes(db: AsyncSession, termino: str):
     """
     Busca pacientes por cédula o nombre (RF-001)
-    Retorna resultados en tiempo real
+    Retorna resultados en tiempo real. Usa la sesión async (búsqueda por tecla)
     """
     if not termino or len(termino) < 2:
         return []
     
     # Buscar por cédula (número exacto o parcial) o nombre/apellido
     # Incluir pacientes activos o con activo=NULL
-    pacientes = db.query(Paciente).filter(
+    # La historia se carga en la misma consulta: en async no hay carga perezosa
+    query = select(Paciente).options(joinedload(Paciente.historia)).where(
         or_(
             Paciente.cedula.like(f"%{termino}%"),
             Paciente.nombre.ilike(f"%{termino}%"),
@@ -186,11 +236,11 @@ def buscar_pacientes(db: Session, termino: str):
             func.concat(Paciente.nombre, ' ', Paciente.apellido).ilike(f"%{termino}%")
         ),
         or_(Paciente.activo == True, Paciente.activo.is_(None))
-    ).limit(20).all()
+    ).limit(20)
+    pacientes = (await db.execute(query)).scalars().all()
     
-    # Agregar información adicional y corregir activo=NULL
+    # Agregar información adicional y normalizar activo=NULL
     for paciente in pacientes:
-        # Corregir activo=NULL (migración automática)
         if paciente.activo is None:
             paciente.activo = True
         
@@ -203,10 +253,6 @@ def buscar_pacientes(db: Session, termino: str):
         if paciente.historia:
             paciente.numero_historia_clinica = paciente.historia.identificador
     
-    # Hacer commit si hubo cambios
-    if any(p.activo is None for p in pacientes):
-        db.commit()
-    
     return pacientes
 
 def update_paciente(db: Session, paciente_id: int, payload: PacienteUpdate):
@@ -219,6 +265,7 @@ def update_paciente(db: Session, paciente_id: int, payload: PacienteUpdate):
         setattr(paciente, field, value)
     
     db.commit()
+    invalidar_paciente(paciente_id, db)
     db.refresh(paciente)
     return paciente
 
@@ -230,4 +277,5 @@ def delete_paciente(db: Session, paciente_id: int):
     # Borrado lógico en lugar de físico
     p.soft_delete()
     db.commit()
+    invalidar_paciente(paciente_id, db)
     return True
@@ -0,0 +1,135 @@
+"""
+Hash y verificación de contraseñas (bcrypt) en un pool de procesos acotado.
+
+bcrypt está diseñado para ser lento (~0.2 s por verificación con 12 rondas):
+en un cambio de turno con cientos de inicios de sesión, verificar en el
+threadpool del API ocupa todos sus hilos y el resto de endpoints se detiene.
+Aquí como máximo HASH_WORKERS operaciones corren a la vez, en procesos
+separados; hasta HASH_MAX_PENDIENTES esperan turno y las demás se rechazan
+con 503 en lugar de acumular latencia.
+"""
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_and_update_password
+
+
+# Funciones ejecutadas en el proceso hijo
+def _hashear(password: str) -> str:
+    return get_password_hash(password)
+
+
+def _verificar(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return verify_and_update_password(password, hashed_password)
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_cupos: Optional[asyncio.Semaphore] = None
+_estadisticas = {
+    "pendientes": 0,
+    "en_curso": 0,
+    "max_pendientes_observado": 0,
+    "completadas": 0,
+    "rechazadas": 0,
+    "rehashes": 0,
+    "espera_total_s": 0.0,
+    "computo_total_s": 0.0,
+}
+
+
+def _obtener_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # "spawn", como el pool de PDFs: no heredar hilos ni conexiones del API
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _obtener_cupos() -> asyncio.Semaphore:
+    # Se crea en el event loop del servidor, al primer uso
+    global _cupos
+    if _cupos is None:
+        _cupos = asyncio.Semaphore(max(1, settings.HASH_WORKERS))
+    return _cupos
+
+
+async def _ejecutar(funcion, *args):
+    if _estadisticas["pendientes"] >= settings.HASH_MAX_PENDIENTES:
+        _estadisticas["rechazadas"] += 1
+        raise HTTPException(
+            status_code=503,
+            detail="Demasiados inicios de sesión simultáneos, intente nuevamente en unos segundos",
+            headers={"Retry-After": "2"}
+        )
+    _estadisticas["pendientes"] += 1
+    _estadisticas["max_pendientes_observado"] = max(
+        _estadisticas["max_pendientes_observado"], _estadisticas["pendientes"]
+    )
+    llegada = time.perf_counter()
+    try:
+        async with _obtener_cupos():
+            inicio = time.perf_counter()
+            _estadisticas["espera_total_s"] += inicio - llegada
+            _estadisticas["en_curso"] += 1
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(_obtener_pool(), funcion, *args)
+            finally:
+                _estadisticas["en_curso"] -= 1
+                _estadisticas["computo_total_s"] += time.perf_counter() - inicio
+                _estadisticas["completadas"] += 1
+    finally:
+        _estadisticas["pendientes"] -= 1
+
+
+async def hashear_password(password: str) -> str:
+    """Hash bcrypt calculado en el pool de procesos"""
+    return await _ejecutar(_hashear, password)
+
+
+async def verificar_password(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica en el pool de procesos. Si la contraseña es correcta y el hash usa
+    otro costo (BCRYPT_ROUNDS cambió), retorna también el hash nuevo para guardarlo.
+    """
+    valida, nuevo_hash = await _ejecutar(_verificar, password, hashed_password)
+    if nuevo_hash:
+        _estadisticas["rehashes"] += 1
+    return valida, nuevo_hash
+
+
+def estadisticas_hash() -> dict:
+    completadas = _estadisticas["completadas"]
+    return {
+        "workers": settings.HASH_WORKERS,
+        "max_pendientes": settings.HASH_MAX_PENDIENTES,
+        "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+        "en_cola": _estadisticas["pendientes"] - _estadisticas["en_curso"],
+        **_estadisticas,
+        "espera_total_s": round(_estadisticas["espera_total_s"], 3),
+        "computo_total_s": round(_estadisticas["computo_total_s"], 3),
+        "espera_promedio_ms": round(_estadisticas["espera_total_s"] / completadas * 1000, 2) if completadas else 0,
+        "computo_promedio_ms": round(_estadisticas["computo_total_s"] / completadas * 1000, 2) if completadas else 0,
+    }
+
+
+def cerrar_pool_hash():
+    """Detiene los procesos del pool (apagado de la aplicación)"""
+    global _pool, _cupos
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+    _cupos = None
@@ -0,0 +1,164 @@
+"""
+Caché en disco de PDFs inmutables (recetas dispensadas, citas completadas).
+
+Cada archivo se nombra `{tipo}_{id}_{clave}.pdf`, donde la clave es el hash de
+los campos con los que se construye el documento: si cambia cualquier dato la
+clave cambia y nunca se sirve un PDF desactualizado. El directorio es
+compartido entre workers; el tamaño se acota desalojando los archivos usados
+hace más tiempo (LRU por mtime, que se actualiza en cada acierto).
+"""
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from dataclasses import asdict
+from typing import Awaitable, Callable, Optional
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, Response
+
+from app.core.config import settings
+from app.utils.validators import calcular_edad
+
+# Incrementar al modificar el diseño de los PDFs para descartar los cacheados
+VERSION_PLANTILLA = 1
+
+# Estados a partir de los cuales el documento ya no cambia
+ESTADOS_INMUTABLES = {
+    "receta": {"dispensada"},
+    "cita": {"completada"},
+}
+
+_lock_desalojo = threading.Lock()
+
+
+def _directorio() -> str:
+    directorio = settings.PDF_CACHE_DIR or os.path.join(tempfile.gettempdir(), "sgm_pdf_cache")
+    os.makedirs(directorio, exist_ok=True)
+    return directorio
+
+
+def es_cacheable(tipo: str, estado: Optional[str]) -> bool:
+    return (estado or "").lower() in ESTADOS_INMUTABLES.get(tipo, set())
+
+
+def clave_documento(tipo: str, documento_id: int, *dtos) -> str:
+    """Hash de los campos fuente del documento (DTOs de pdf_service)"""
+    fuente = [VERSION_PLANTILLA, tipo, documento_id]
+    for dto in dtos:
+        datos = asdict(dto) if dto is not None else None
+        # La edad impresa depende de la fecha actual, no solo de los datos
+        if datos and "fecha_nacimiento" in datos:
+            datos["edad"] = calcular_edad(datos["fecha_nacimiento"])
+        fuente.append(datos)
+    contenido = json.dumps(fuente, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(contenido.encode("utf-8")).hexdigest()[:40]
+
+
+def _ruta(tipo: str, documento_id: int, clave: str) -> str:
+    return os.path.join(_directorio(), f"{tipo}_{documento_id}_{clave}.pdf")
+
+
+def obtener(tipo: str, documento_id: int, clave: str) -> Optional[str]:
+    """Ruta del PDF cacheado o None"""
+    ruta = _ruta(tipo, documento_id, clave)
+    try:
+        os.utime(ruta)  # marca de uso reciente para el desalojo LRU
+    except FileNotFoundError:
+        return None
+    return ruta
+
+
+def guardar(tipo: str, documento_id: int, clave: str, contenido: bytes) -> str:
+    """Escribe el PDF de forma atómica y desaloja si se excede el tamaño máximo"""
+    ruta = _ruta(tipo, documento_id, clave)
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), suffix=".tmp")
+    with os.fdopen(descriptor, "wb") as archivo:
+        archivo.write(contenido)
+    os.replace(temporal, ruta)
+    _desalojar_si_excede()
+    return ruta
+
+
+def invalidar(tipo: str, documento_id: int):
+    """Elimina todas las versiones cacheadas de un documento"""
+    for ruta in glob.glob(os.path.join(_directorio(), f"{tipo}_{documento_id}_*.pdf")):
+        try:
+            os.remove(ruta)
+        except FileNotFoundError:
+            pass
+
+
+def _desalojar_si_excede():
+    limite = settings.PDF_CACHE_MAX_MB * 1024 * 1024
+    with _lock_desalojo:
+        archivos = []
+        total = 0
+        with os.scandir(_directorio()) as entradas:
+            for entrada in entradas:
+                if entrada.name.endswith(".pdf"):
+                    info = entrada.stat()
+                    archivos.append((info.st_mtime, info.st_size, entrada.path))
+                    total += info.st_size
+        if total <= limite:
+            return
+
+        # Se libera hasta el 90% del límite para no desalojar en cada escritura
+        archivos.sort()
+        for _, tamano, ruta in archivos:
+            if total <= limite * 0.9:
+                break
+            try:
+                os.remove(ruta)
+                total -= tamano
+            except FileNotFoundError:
+                pass
+
+
+def _etag_coincide(request: Request, etag: str) -> bool:
+    cabecera = request.headers.get("if-none-match")
+    if not cabecera:
+        return False
+    etiquetas = [e.strip() for e in cabecera.split(",")]
+    return "*" in etiquetas or etag in etiquetas or f"W/{etag}" in etiquetas
+
+
+async def servir_pdf(
+    request: Request,
+    tipo: str,
+    documento_id: int,
+    estado: Optional[str],
+    dtos: tuple,
+    renderizar: Callable[..., Awaitable[bytes]],
+    nombre_archivo: str
+) -> Response:
+    """
+    Responde con el PDF del documento. Si está en un estado inmutable se sirve
+    desde el disco (FileResponse) con ETag y soporte de 304; en otro caso se
+    genera en el pool de procesos sin cachear. El acceso al disco (y el
+    desalojo, que recorre todo el directorio) corre en el threadpool para no
+    detener el event loop.
+    """
+    if not es_cacheable(tipo, estado):
+        contenido = await renderizar(*dtos)
+        return Response(
+            content=contenido,
+            media_type="application/pdf",
+            headers={"Content-Disposition": f"attachment; filename={nombre_archivo}"}
+        )
+
+    clave = clave_documento(tipo, documento_id, *dtos)
+    etag = f'"{clave}"'
+    cabeceras = {"ETag": etag, "Cache-Control": "private, max-age=86400"}
+    if _etag_coincide(request, etag):
+        return Response(status_code=304, headers=cabeceras)
+
+    ruta = await run_in_threadpool(obtener, tipo, documento_id, clave)
+    if ruta is None:
+        contenido = await renderizar(*dtos)
+        ruta = await run_in_threadpool(guardar, tipo, documento_id, clave, contenido)
+
+    return FileResponse(ruta, media_type="application/pdf", filename=nombre_archivo, headers=cabeceras)
@@ -0,0 +1,295 @@
+"""
+Servicio de generación de PDFs (recetas y comprobantes de cita) en un pool de
+procesos. ReportLab es CPU intensivo y retiene el GIL: renderizar en el
+proceso del API deja sin atender al resto de solicitudes durante la ráfaga.
+
+Los datos viajan al proceso hijo como DTOs simples (dataclasses picklables),
+nunca como objetos ORM ligados a una sesión. ReportLab, PIL y qrcode se
+importan solo en el proceso hijo: el proceso del API no los carga.
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import AsyncIterator, Iterable, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.utils.logger import obtener_logger
+
+logger = obtener_logger("pdf")
+
+
+@dataclass
+class PacientePDF:
+    nombre: str
+    apellido: str
+    cedula: str
+    fecha_nacimiento: Optional[date] = None
+    genero: Optional[str] = None
+    telefono: Optional[str] = None
+    email: Optional[str] = None
+    alergias: Optional[str] = None
+
+    @classmethod
+    def desde_orm(cls, paciente) -> "PacientePDF":
+        return cls(
+            nombre=paciente.nombre,
+            apellido=paciente.apellido,
+            cedula=str(paciente.cedula),
+            fecha_nacimiento=paciente.fecha_nacimiento,
+            genero=paciente.genero,
+            telefono=paciente.telefono,
+            email=paciente.email,
+            alergias=paciente.alergias
+        )
+
+
+@dataclass
+class MedicoPDF:
+    id: int
+    nombre: str
+    apellido: str
+    cedula: Optional[str] = None
+    especialidad: Optional[str] = None
+
+    @classmethod
+    def desde_orm(cls, medico) -> "MedicoPDF":
+        """Acepta un Medico o un Empleado (este último no tiene especialidad)"""
+        return cls(
+            id=medico.id,
+            nombre=medico.nombre,
+            apellido=medico.apellido,
+            cedula=str(medico.cedula) if medico.cedula is not None else None,
+            especialidad=getattr(medico, "especialidad", None)
+        )
+
+
+@dataclass
+class RecetaPDF:
+    id: int
+    fecha_emision: datetime
+    estado: str
+    medicamentos: str
+    indicaciones: Optional[str] = None
+    dispensada_por: Optional[int] = None
+    fecha_dispensacion: Optional[datetime] = None
+    lote: Optional[str] = None
+    fecha_vencimiento: Optional[date] = None
+
+    @classmethod
+    def desde_orm(cls, receta) -> "RecetaPDF":
+        return cls(
+            id=receta.id,
+            fecha_emision=receta.fecha_emision,
+            estado=receta.estado,
+            medicamentos=receta.medicamentos,
+            indicaciones=receta.indicaciones,
+            dispensada_por=receta.dispensada_por,
+            fecha_dispensacion=receta.fecha_dispensacion,
+            lote=receta.lote,
+            fecha_vencimiento=receta.fecha_vencimiento
+        )
+
+
+@dataclass
+class CitaPDF:
+    id: int
+    fecha: datetime
+    estado: str
+    hora_inicio: Optional[str] = None
+    hora_fin: Optional[str] = None
+    sala_asignada: Optional[str] = None
+    tipo_cita: Optional[str] = None
+    motivo: Optional[str] = None
+
+    @classmethod
+    def desde_orm(cls, cita) -> "CitaPDF":
+        return cls(
+            id=cita.id,
+            fecha=cita.fecha,
+            estado=cita.estado,
+            hora_inicio=cita.hora_inicio,
+            hora_fin=cita.hora_fin,
+            sala_asignada=cita.sala_asignada,
+            tipo_cita=cita.tipo_cita,
+            motivo=cita.motivo
+        )
+
+
+# Funciones ejecutadas en el proceso hijo: retornan bytes (picklables)
+def _renderizar_receta(receta: RecetaPDF, paciente: PacientePDF, medico: MedicoPDF) -> bytes:
+    from app.utils.pdf_generator import generar_receta_pdf
+    return generar_receta_pdf(receta, paciente, medico).getvalue()
+
+
+def _renderizar_comprobante_cita(cita: CitaPDF, paciente: PacientePDF, medico: Optional[MedicoPDF]) -> bytes:
+    from app.utils.pdf_generator import generar_comprobante_cita_pdf
+    return generar_comprobante_cita_pdf(cita, paciente, medico).getvalue()
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_pendientes = 0
+
+
+def _obtener_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # "spawn": el proceso del API tiene hilos y conexiones abiertas que
+            # no deben heredarse con fork
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PDF_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _reservar_turno():
+    """Cuenta la solicitud como pendiente o rechaza con 503 si la cola está llena"""
+    global _pendientes
+    with _pool_lock:
+        if _pendientes >= settings.PDF_MAX_PENDIENTES:
+            raise HTTPException(
+                status_code=503,
+                detail="El servicio de PDFs está saturado, intente nuevamente en unos segundos",
+                headers={"Retry-After": "5"}
+            )
+        _pendientes += 1
+
+
+def _liberar_turno():
+    global _pendientes
+    with _pool_lock:
+        _pendientes -= 1
+
+
+async def _ejecutar(funcion, *args) -> bytes:
+    _reservar_turno()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_obtener_pool(), funcion, *args)
+    finally:
+        _liberar_turno()
+
+
+async def renderizar_receta(receta: RecetaPDF, paciente: PacientePDF, medico: MedicoPDF) -> bytes:
+    """PDF de receta generado en el pool de procesos"""
+    return await _ejecutar(_renderizar_receta, receta, paciente, medico)
+
+
+async def renderizar_comprobante_cita(cita: CitaPDF, paciente: PacientePDF,
+                                      medico: Optional[MedicoPDF] = None) -> bytes:
+    """PDF de comprobante de cita generado en el pool de procesos"""
+    return await _ejecutar(_renderizar_comprobante_cita, cita, paciente, medico)
+
+
+_RENDERIZADORES = {
+    "receta": _renderizar_receta,
+    "cita": _renderizar_comprobante_cita,
+}
+
+
+class ReservaLote:
+    """Turnos de un lote en la cola del pool; liberar() es idempotente"""
+
+    def __init__(self, ventana: int):
+        self.ventana = ventana
+        self._liberada = False
+
+    def liberar(self):
+        global _pendientes
+        with _pool_lock:
+            if not self._liberada:
+                _pendientes -= self.ventana
+                self._liberada = True
+
+
+def reservar_capacidad_lote() -> ReservaLote:
+    """
+    Reserva los turnos de un lote o rechaza con 503 si el pool no tiene lugar.
+    Se llama antes de empezar a responder, para que el error no llegue a mitad
+    del streaming. renderizar_lote libera la reserva al terminar; la ruta la
+    pasa también como tarea de fondo de la respuesta, por si el cliente se
+    desconecta antes de que el streaming empiece.
+    """
+    global _pendientes
+    ventana = _ventana_lote()
+    with _pool_lock:
+        if _pendientes + ventana > settings.PDF_MAX_PENDIENTES:
+            raise HTTPException(
+                status_code=503,
+                detail="El servicio de PDFs está saturado, intente nuevamente en unos segundos",
+                headers={"Retry-After": "5"}
+            )
+        _pendientes += ventana
+    return ReservaLote(ventana)
+
+
+def _ventana_lote() -> int:
+    # Un documento en curso por worker: el lote no acapara la cola
+    return max(1, settings.PDF_WORKERS)
+
+
+async def renderizar_lote(trabajos: Iterable[Tuple[str, str, tuple]],
+                          reserva: ReservaLote) -> AsyncIterator[Tuple[str, bytes]]:
+    """
+    Renderiza (nombre, tipo, dtos) en paralelo con como máximo un documento en
+    curso por worker y los entrega en orden de finalización. Un documento que
+    falla se entrega como `<nombre>.error.txt` sin cortar el ZIP. Los turnos
+    de la reserva se liberan al terminar o si el cliente se desconecta.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _obtener_pool()
+    pendientes = {}
+    trabajos = iter(trabajos)
+
+    def lanzar_siguiente() -> bool:
+        trabajo = next(trabajos, None)
+        if trabajo is None:
+            return False
+        nombre, tipo, dtos = trabajo
+        futuro = loop.run_in_executor(pool, _RENDERIZADORES[tipo], *dtos)
+        pendientes[futuro] = nombre
+        return True
+
+    try:
+        while len(pendientes) < reserva.ventana and lanzar_siguiente():
+            pass
+        while pendientes:
+            listos, _ = await asyncio.wait(list(pendientes), return_when=asyncio.FIRST_COMPLETED)
+            for futuro in listos:
+                nombre = pendientes.pop(futuro)
+                try:
+                    contenido = futuro.result()
+                except Exception:
+                    logger.exception("Error renderizando un PDF del lote", extra={"documento": nombre})
+                    yield f"{nombre}.error.txt", "No se pudo generar este documento.\n".encode()
+                else:
+                    yield nombre, contenido
+                lanzar_siguiente()
+    finally:
+        for futuro in pendientes:
+            futuro.cancel()
+        reserva.liberar()
+
+
+def estadisticas_pdf() -> dict:
+    return {
+        "workers": settings.PDF_WORKERS,
+        "max_pendientes": settings.PDF_MAX_PENDIENTES,
+        "pendientes": _pendientes
+    }
+
+
+def cerrar_pool_pdf():
+    """Detiene los procesos del pool (apagado de la aplicación)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
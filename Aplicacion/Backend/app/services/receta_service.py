@@ -1,14 +1,19 @@
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, aliased
 from app.models.receta import Receta
 from app.models.paciente import Paciente
 from app.models.empleado import Empleado
 from app.schemas.receta_schema import RecetaCreate, RecetaDispensar
 from app.core.websocket import manager
+from app.services.pdf_cache_service import invalidar as invalidar_pdf
+from app.utils.respuesta_json import columnas, subdict
+from app.utils.logger import obtener_logger
 from datetime import datetime
 from typing import Optional
 import pytz
 import asyncio
 
+logger = obtener_logger("recetas")
+
 ECUADOR_TZ = pytz.timezone('America/Guayaquil')
 
 def crear_receta(db: Session, payload: RecetaCreate):
@@ -37,18 +42,46 @@ def crear_receta(db: Session, payload: RecetaCreate):
             "data": {"receta_id": receta.id}
         }, "Farmaceutico"))
     except Exception as e:
-        print(f"Error enviando notificación WebSocket: {e}")
+        logger.warning("Error enviando notificación WebSocket", extra={"receta_id": receta.id, "error": str(e)})
     
     return receta
 
+# Columnas del listado de recetas
+CAMPOS_RECETA = [
+    'id', 'consulta_id', 'medico_id', 'paciente_id', 'fecha_emision', 'medicamentos',
+    'indicaciones', 'estado', 'dispensada_por', 'fecha_dispensacion', 'observaciones',
+    'lote', 'fecha_vencimiento',
+]
+
+
+def _nombre_completo(fila, prefijo: str):
+    if fila[prefijo + "nombre"] is None:
+        return None
+    return f"{fila[prefijo + 'nombre']} {fila[prefijo + 'apellido']}"
+
+
 def listar_recetas(db: Session, paciente_id: Optional[int] = None, estado: Optional[str] = None):
     """
     Lista recetas con filtros opcionales incluyendo información de paciente, médico y farmacéutico
     """
-    query = db.query(Receta).options(
-        joinedload(Receta.paciente),
-        joinedload(Receta.medico),
-        joinedload(Receta.farmaceutico)
+    Medico = aliased(Empleado)
+    Farmaceutico = aliased(Empleado)
+    # Solo columnas, sin entidades ORM: el listado se serializa con ORJSONResponse
+    query = db.query(
+        *columnas(Receta, CAMPOS_RECETA),
+        Paciente.nombre.label("paciente__nombre"),
+        Paciente.apellido.label("paciente__apellido"),
+        Paciente.cedula.label("paciente__cedula"),
+        Medico.nombre.label("medico__nombre"),
+        Medico.apellido.label("medico__apellido"),
+        Farmaceutico.nombre.label("farmaceutico__nombre"),
+        Farmaceutico.apellido.label("farmaceutico__apellido")
+    ).outerjoin(
+        Paciente, Receta.paciente_id == Paciente.id
+    ).outerjoin(
+        Medico, Receta.medico_id == Medico.id
+    ).outerjoin(
+        Farmaceutico, Receta.dispensada_por == Farmaceutico.id
     )
     
     if paciente_id:
@@ -57,32 +90,16 @@ def listar_recetas(db: Session, paciente_id: Optional[int] = None, estado: Optio
     if estado:
         query = query.filter(Receta.estado == estado)
     
-    recetas = query.order_by(Receta.fecha_emision.desc()).all()
-    
     # Convertir a lista de diccionarios con información adicional
     resultado = []
-    for receta in recetas:
-        receta_dict = {
-            'id': receta.id,
-            'consulta_id': receta.consulta_id,
-            'medico_id': receta.medico_id,
-            'paciente_id': receta.paciente_id,
-            'fecha_emision': receta.fecha_emision,
-            'medicamentos': receta.medicamentos,
-            'indicaciones': receta.indicaciones,
-            'estado': receta.estado,
-            'dispensada_por': receta.dispensada_por,
-            'fecha_dispensacion': receta.fecha_dispensacion,
-            'observaciones': receta.observaciones,
-            'lote': receta.lote,
-            'fecha_vencimiento': receta.fecha_vencimiento,
-            # Información adicional para farmacéuticos
-            'paciente_nombre': f"{receta.paciente.nombre} {receta.paciente.apellido}" if receta.paciente else None,
-            'paciente_cedula': receta.paciente.cedula if receta.paciente else None,
-            'medico_nombre': f"{receta.medico.nombre} {receta.medico.apellido}" if receta.medico else None,
-            'farmaceutico_nombre': f"{receta.farmaceutico.nombre} {receta.farmaceutico.apellido}" if receta.farmaceutico else None
-        }
-        
+    for fila in query.order_by(Receta.fecha_emision.desc()).all():
+        fila = fila._mapping
+        receta_dict = subdict(fila, CAMPOS_RECETA)
+        # Información adicional para farmacéuticos
+        receta_dict['paciente_nombre'] = _nombre_completo(fila, "paciente__")
+        receta_dict['paciente_cedula'] = fila["paciente__cedula"]
+        receta_dict['medico_nombre'] = _nombre_completo(fila, "medico__")
+        receta_dict['farmaceutico_nombre'] = _nombre_completo(fila, "farmaceutico__")
         resultado.append(receta_dict)
     
     return resultado
@@ -121,6 +138,7 @@ def dispensar_receta(db: Session, receta_id: int, farmaceutico_id: int, payload:
             receta.fecha_vencimiento = payload.fecha_vencimiento
     
     db.commit()
+    invalidar_pdf("receta", receta_id)
     db.refresh(receta)
     return receta
 
@@ -137,5 +155,6 @@ def cancelar_receta(db: Session, receta_id: int, observaciones: Optional[str] =
         receta.observaciones = observaciones
     
     db.commit()
+    invalidar_pdf("receta", receta_id)
     db.refresh(receta)
     return receta
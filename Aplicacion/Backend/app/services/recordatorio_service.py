@@ -0,0 +1,275 @@
+"""
+Job de recordatorios de citas por email (RF-001).
+
+Selecciona en una sola consulta las citas de la ventana (por defecto, las de
+mañana) con su paciente y médico, reclama cada una en `recordatorios_cita`
+antes de enviar y registra el resultado. Así un reinicio o varios workers
+ejecutando el job no envían dos veces el mismo recordatorio; los fallidos se
+reintentan en la siguiente ejecución hasta RECORDATORIOS_MAX_INTENTOS.
+
+El envío usa el transporte de email con concurrencia y tasa acotadas
+(RECORDATORIOS_CONCURRENCIA, RECORDATORIOS_POR_SEGUNDO).
+"""
+import asyncio
+import time as reloj
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.cita import Cita
+from app.models.medico import Medico
+from app.models.paciente import Paciente
+from app.models.recordatorio import RecordatorioCita
+from app.utils.email_plantillas import RECORDATORIO_CITA, fecha_hora_cita
+from app.utils.email_utils import send_email_async
+from app.utils.logger import obtener_logger
+
+logger = obtener_logger("recordatorios")
+
+ESTADOS_CITA_RECORDABLES = ("programada", "confirmada")
+
+# Un reclamo "enviando" más antiguo que esto quedó de una ejecución interrumpida
+_RECLAMO_VENCIDO = timedelta(hours=1)
+
+# Resultados acumulados antes de escribirlos en la base de datos
+_TAMANO_REGISTRO = 100
+
+
+def ventana_manana(hoy: Optional[date] = None) -> Tuple[datetime, datetime]:
+    """[mañana 00:00, pasado mañana 00:00)"""
+    manana = (hoy or date.today()) + timedelta(days=1)
+    inicio = datetime.combine(manana, time.min)
+    return inicio, inicio + timedelta(days=1)
+
+
+def _condicion_pendiente(ahora: datetime):
+    """Sin recordatorio, fallido con intentos disponibles o reclamo abandonado"""
+    return or_(
+        RecordatorioCita.id.is_(None),
+        and_(RecordatorioCita.estado == "fallido",
+             RecordatorioCita.intentos < settings.RECORDATORIOS_MAX_INTENTOS),
+        and_(RecordatorioCita.estado == "enviando",
+             RecordatorioCita.updated_at < ahora - _RECLAMO_VENCIDO),
+    )
+
+
+def seleccionar_pendientes(db: Session, inicio: datetime, fin: datetime) -> List[dict]:
+    """Citas de la ventana que necesitan recordatorio, con paciente y médico en la misma consulta"""
+    citas = db.query(Cita).options(
+        joinedload(Cita.paciente),
+        joinedload(Cita.medico).joinedload(Medico.empleado)
+    ).join(
+        Paciente, Cita.paciente_id == Paciente.id
+    ).outerjoin(
+        RecordatorioCita, RecordatorioCita.cita_id == Cita.id
+    ).filter(
+        Cita.fecha >= inicio,
+        Cita.fecha < fin,
+        or_(Cita.activo == True, Cita.activo.is_(None)),  # NULL: registros previos al borrado lógico
+        Cita.estado.in_(ESTADOS_CITA_RECORDABLES),
+        Paciente.email.isnot(None),
+        Paciente.email != "",
+        _condicion_pendiente(datetime.utcnow())
+    ).order_by(Cita.fecha).all()
+
+    pendientes = []
+    for cita in citas:
+        medico_nombre = "Por asignar"
+        if cita.medico and cita.medico.empleado:
+            medico_nombre = f"{cita.medico.empleado.nombre} {cita.medico.empleado.apellido}"
+        pendientes.append({
+            "cita_id": cita.id,
+            "email": cita.paciente.email,
+            "paciente_nombre": f"{cita.paciente.nombre} {cita.paciente.apellido}",
+            "fecha": fecha_hora_cita(cita.fecha, cita.hora_inicio),
+            "medico_nombre": medico_nombre,
+        })
+    return pendientes
+
+
+def reclamar(db: Session, pendientes: List[dict]) -> List[dict]:
+    """
+    Marca las citas como "enviando" y retorna solo las reclamadas por esta
+    ejecución. La fila única por cita y la actualización condicional impiden
+    que otro worker reclame la misma cita.
+    """
+    ahora = datetime.utcnow()
+    ids = [p["cita_id"] for p in pendientes]
+    existentes = {
+        cita_id for (cita_id,) in
+        db.query(RecordatorioCita.cita_id).filter(RecordatorioCita.cita_id.in_(ids))
+    } if ids else set()
+
+    reclamadas = set()
+    # Reintentos: la actualización solo afecta la fila si sigue pendiente
+    for cita_id in existentes:
+        resultado = db.execute(
+            update(RecordatorioCita)
+            .where(RecordatorioCita.cita_id == cita_id, _condicion_pendiente(ahora))
+            .values(estado="enviando", updated_at=ahora)
+            .execution_options(synchronize_session=False)
+        )
+        if resultado.rowcount:
+            reclamadas.add(cita_id)
+
+    nuevas = [p for p in pendientes if p["cita_id"] not in existentes]
+    filas = [
+        {"cita_id": p["cita_id"], "email": p["email"], "estado": "enviando", "intentos": 0, "updated_at": ahora}
+        for p in nuevas
+    ]
+    if filas:
+        try:
+            with db.begin_nested():
+                db.bulk_insert_mappings(RecordatorioCita, filas)
+            reclamadas.update(p["cita_id"] for p in nuevas)
+        except IntegrityError:
+            # Otro worker reclamó alguna a la vez: se inserta una por una
+            for fila in filas:
+                try:
+                    with db.begin_nested():
+                        db.bulk_insert_mappings(RecordatorioCita, [fila])
+                    reclamadas.add(fila["cita_id"])
+                except IntegrityError:
+                    pass
+    db.commit()
+    return [p for p in pendientes if p["cita_id"] in reclamadas]
+
+
+def registrar_resultados(db: Session, resultados: List[Tuple[int, Optional[str]]]):
+    """Guarda (cita_id, error): los enviados en una sola sentencia, los fallidos uno por uno"""
+    ahora = datetime.utcnow()
+    enviados = [cita_id for cita_id, error in resultados if error is None]
+    if enviados:
+        db.execute(
+            update(RecordatorioCita)
+            .where(RecordatorioCita.cita_id.in_(enviados))
+            .values(estado="enviado", fecha_envio=ahora, error=None,
+                    intentos=RecordatorioCita.intentos + 1, updated_at=ahora)
+            .execution_options(synchronize_session=False)
+        )
+    for cita_id, error in resultados:
+        if error is not None:
+            db.execute(
+                update(RecordatorioCita)
+                .where(RecordatorioCita.cita_id == cita_id)
+                .values(estado="fallido", error=error[:1000],
+                        intentos=RecordatorioCita.intentos + 1, updated_at=ahora)
+                .execution_options(synchronize_session=False)
+            )
+    db.commit()
+
+
+class _LimitadorTasa:
+    """Espacia los envíos para no superar `por_segundo` en promedio"""
+
+    def __init__(self, por_segundo: float):
+        self._intervalo = 1 / por_segundo if por_segundo > 0 else 0
+        self._siguiente = reloj.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def esperar(self):
+        if not self._intervalo:
+            return
+        async with self._lock:
+            ahora = reloj.monotonic()
+            espera = self._siguiente - ahora
+            self._siguiente = max(ahora, self._siguiente) + self._intervalo
+        if espera > 0:
+            await asyncio.sleep(espera)
+
+
+def _con_sesion(funcion, *args):
+    db = SessionLocal()
+    try:
+        return funcion(db, *args)
+    finally:
+        db.close()
+
+
+async def ejecutar_recordatorios(inicio: Optional[datetime] = None, fin: Optional[datetime] = None) -> dict:
+    """Envía los recordatorios pendientes de la ventana y retorna el reporte de la ejecución"""
+    if inicio is None or fin is None:
+        inicio, fin = ventana_manana()
+    comienzo = reloj.perf_counter()
+
+    pendientes = await run_in_threadpool(_con_sesion, seleccionar_pendientes, inicio, fin)
+    reclamadas = await run_in_threadpool(_con_sesion, reclamar, pendientes) if pendientes else []
+
+    cola: asyncio.Queue = asyncio.Queue()
+    for pendiente in reclamadas:
+        cola.put_nowait(pendiente)
+    limitador = _LimitadorTasa(settings.RECORDATORIOS_POR_SEGUNDO)
+    resultados: List[Tuple[int, Optional[str]]] = []
+    contadores = {"enviados": 0, "fallidos": 0}
+
+    async def volcar():
+        lote = resultados[:]
+        resultados.clear()
+        if lote:
+            await run_in_threadpool(_con_sesion, registrar_resultados, lote)
+
+    async def trabajador():
+        while True:
+            try:
+                pendiente = cola.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await limitador.esperar()
+            email = RECORDATORIO_CITA.renderizar(
+                paciente_nombre=pendiente["paciente_nombre"], fecha=pendiente["fecha"],
+                medico_nombre=pendiente["medico_nombre"], cita_id=pendiente["cita_id"]
+            )
+            try:
+                enviado = await send_email_async(
+                    pendiente["email"], email.asunto, email.texto, email.html, simular_si_falla=False
+                )
+                error = None if enviado else "No se pudo entregar el email (ver log del servidor)"
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            contadores["enviados" if error is None else "fallidos"] += 1
+            resultados.append((pendiente["cita_id"], error))
+            if len(resultados) >= _TAMANO_REGISTRO:
+                await volcar()
+
+    try:
+        concurrencia = max(1, settings.RECORDATORIOS_CONCURRENCIA)
+        await asyncio.gather(*[trabajador() for _ in range(concurrencia)])
+    finally:
+        # También si la ejecución se cancela: lo ya enviado queda registrado
+        await volcar()
+
+    duracion = reloj.perf_counter() - comienzo
+    reporte = {
+        "ventana": {"inicio": inicio.isoformat(), "fin": fin.isoformat()},
+        "pendientes": len(pendientes),
+        "reclamadas": len(reclamadas),
+        "enviados": contadores["enviados"],
+        "fallidos": contadores["fallidos"],
+        "duracion_segundos": round(duracion, 3),
+        "por_segundo": round(contadores["enviados"] / duracion, 2) if duracion > 0 else 0,
+    }
+    logger.info("Recordatorios enviados", extra={k: v for k, v in reporte.items() if k != "ventana"})
+    return reporte
+
+
+def _segundos_hasta_proxima_ejecucion(ahora: datetime) -> float:
+    proxima = ahora.replace(hour=settings.RECORDATORIOS_HORA, minute=0, second=0, microsecond=0)
+    if proxima <= ahora:
+        proxima += timedelta(days=1)
+    return (proxima - ahora).total_seconds()
+
+
+async def programar_recordatorios():
+    """Tarea de fondo: ejecuta el job todos los días a RECORDATORIOS_HORA"""
+    while True:
+        await asyncio.sleep(_segundos_hasta_proxima_ejecucion(datetime.now()))
+        try:
+            await ejecutar_recordatorios()
+        except Exception:
+            logger.exception("Error en el job de recordatorios")
@@ -0,0 +1,134 @@
+"""
+Resúmenes de visualización (nombre, cargo, especialidad) de empleados,
+médicos y pacientes, con caché de lectura en dos niveles:
+
+1. Por solicitud: diccionario en `db.info`, vive lo que vive la sesión.
+2. Por proceso: CacheTTL (LRU + TTL), compartida entre solicitudes del worker.
+
+Los servicios de actualización/eliminación llaman a invalidar_* para que el
+worker que hizo el cambio deje de servir el dato viejo; el resto de workers
+lo renuevan al expirar el TTL.
+"""
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.core.cache import crear_cache
+from app.models.empleado import Empleado
+from app.models.medico import Medico
+from app.models.paciente import Paciente
+
+_cache_empleados = crear_cache("empleados_resumen", max_entradas=2048, ttl_segundos=120)
+_cache_medicos = crear_cache("medicos_resumen", max_entradas=1024, ttl_segundos=120)
+_cache_pacientes = crear_cache("pacientes_resumen", max_entradas=8192, ttl_segundos=120)
+
+
+def _cache_sesion(db: Session) -> dict:
+    return db.info.setdefault("resumenes", {})
+
+
+def _leer(db: Session, cache, tipo: str, entidad_id: int, cargar) -> Optional[dict]:
+    if entidad_id is None:
+        return None
+
+    clave = (tipo, entidad_id)
+    por_solicitud = _cache_sesion(db)
+    if clave in por_solicitud:
+        return por_solicitud[clave]
+
+    resumen = cache.obtener(entidad_id)
+    if resumen is None:
+        resumen = cargar(db, entidad_id)
+        if resumen is not None:
+            cache.guardar(entidad_id, resumen)
+
+    por_solicitud[clave] = resumen
+    return resumen
+
+
+def _cargar_empleado(db: Session, empleado_id: int) -> Optional[dict]:
+    fila = db.query(
+        Empleado.id, Empleado.nombre, Empleado.apellido, Empleado.cargo
+    ).filter(Empleado.id == empleado_id).first()
+    if not fila:
+        return None
+    return {
+        "id": fila.id,
+        "nombre": fila.nombre,
+        "apellido": fila.apellido,
+        "nombre_completo": f"{fila.nombre} {fila.apellido}",
+        "cargo": fila.cargo
+    }
+
+
+def _cargar_medico(db: Session, medico_id: int) -> Optional[dict]:
+    fila = db.query(
+        Medico.id, Medico.nombre, Medico.apellido, Medico.especialidad, Medico.empleado_id,
+        Empleado.nombre.label("empleado_nombre"), Empleado.apellido.label("empleado_apellido")
+    ).outerjoin(Empleado, Empleado.id == Medico.empleado_id).filter(Medico.id == medico_id).first()
+    if not fila:
+        return None
+
+    # Igual que en los listados: el nombre del empleado tiene prioridad
+    tiene_empleado = fila.empleado_nombre is not None
+    nombre = fila.empleado_nombre if tiene_empleado else fila.nombre
+    apellido = fila.empleado_apellido if tiene_empleado else fila.apellido
+    return {
+        "id": fila.id,
+        "nombre": nombre,
+        "apellido": apellido,
+        "nombre_completo": f"{nombre} {apellido}",
+        "especialidad": fila.especialidad,
+        "empleado_id": fila.empleado_id,
+        "tiene_empleado": tiene_empleado
+    }
+
+
+def _cargar_paciente(db: Session, paciente_id: int) -> Optional[dict]:
+    fila = db.query(
+        Paciente.id, Paciente.nombre, Paciente.apellido, Paciente.cedula, Paciente.email
+    ).filter(Paciente.id == paciente_id).first()
+    if not fila:
+        return None
+    return {
+        "id": fila.id,
+        "nombre": fila.nombre,
+        "apellido": fila.apellido,
+        "nombre_completo": f"{fila.nombre} {fila.apellido}",
+        "cedula": fila.cedula,
+        "email": fila.email
+    }
+
+
+def obtener_empleado_resumen(db: Session, empleado_id: int) -> Optional[dict]:
+    """Nombre y cargo de un empleado (p. ej. el usuario que registra una auditoría)"""
+    return _leer(db, _cache_empleados, "empleado", empleado_id, _cargar_empleado)
+
+
+def obtener_medico_resumen(db: Session, medico_id: int) -> Optional[dict]:
+    """Nombre (del empleado asociado si existe) y especialidad de un médico"""
+    return _leer(db, _cache_medicos, "medico", medico_id, _cargar_medico)
+
+
+def obtener_paciente_resumen(db: Session, paciente_id: int) -> Optional[dict]:
+    """Nombre, cédula y email de un paciente"""
+    return _leer(db, _cache_pacientes, "paciente", paciente_id, _cargar_paciente)
+
+
+def invalidar_empleado(empleado_id: int, db: Session = None):
+    _cache_empleados.invalidar(empleado_id)
+    # El resumen de médico usa el nombre del empleado: se descarta completo
+    # (las ediciones de empleados son poco frecuentes)
+    _cache_medicos.limpiar()
+    if db is not None:
+        _cache_sesion(db).clear()
+
+
+def invalidar_medico(medico_id: int, db: Session = None):
+    _cache_medicos.invalidar(medico_id)
+    if db is not None:
+        _cache_sesion(db).pop(("medico", medico_id), None)
+
+
+def invalidar_paciente(paciente_id: int, db: Session = None):
+    _cache_pacientes.invalidar(paciente_id)
+    if db is not None:
+        _cache_sesion(db).pop(("paciente", paciente_id), None)
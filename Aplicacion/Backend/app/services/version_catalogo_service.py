@@ -0,0 +1,173 @@
+"""
+ETag y GET condicional para los catálogos de referencia (medicamentos,
+médicos, farmacias, diagnósticos CIE-10, empleados).
+
+Estos catálogos cambian poco, pero el frontend los vuelve a pedir en cada
+pantalla. Cada catálogo tiene un contador en `versiones_catalogo`. Los
+listados leen solo ese contador; si coincide con el If-None-Match del cliente
+responden 304 sin cargar ni serializar las filas.
+
+Las escrituras ORM (flush o update/delete masivo) sobre un catálogo solo lo
+anotan en la sesión; el contador se incrementa DESPUÉS del commit, en una
+transacción corta con su propia conexión. Incrementarlo dentro de la
+transacción de la escritura retendría el bloqueo de la fila del contador
+hasta el commit y serializaría todas las transacciones concurrentes que tocan
+el catálogo (cada dispensación actualiza Medicamento.stock, cada login puede
+actualizar el Empleado). Entre el commit y el incremento un listado puede
+responder datos nuevos con el ETag anterior: el cliente los vuelve a pedir en
+cuanto el contador sube. Si el incremento falla se registra el error y el
+catálogo se revalida recién en la próxima escritura.
+
+Las escrituras por SQL directo (text()) no incrementan el contador: usar el
+ORM o llamar a incrementar_versiones().
+"""
+import hashlib
+from datetime import datetime
+from itertools import chain
+from typing import Iterable, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import SesionSoloLectura
+from app.core.migraciones import DATOS_VERSION
+from app.utils.logger import obtener_logger
+from app.models.diagnostico_cie10 import DiagnosticoCIE10
+from app.models.empleado import Empleado
+from app.models.farmacia import Farmacia
+from app.models.medicamento import Medicamento
+from app.models.medico import Medico
+from app.models.version_catalogo import VersionCatalogo
+
+CATALOGOS = {
+    Medicamento: "medicamentos",
+    Medico: "medicos",
+    Farmacia: "farmacias",
+    DiagnosticoCIE10: "diagnosticos",
+    Empleado: "empleados",
+}
+
+# Revalidar siempre, pero permitir que el navegador guarde la respuesta
+_CACHE_CONTROL = "private, no-cache"
+
+# Clave en Session.info con los catálogos modificados en la transacción en curso
+_PENDIENTES = "catalogos_modificados"
+
+logger = obtener_logger("catalogos")
+
+
+def incrementar_versiones(db: Session, catalogos: Iterable[str]):
+    """Anota los catálogos para incrementar su contador cuando `db` haga commit"""
+    catalogos = set(catalogos)
+    if not catalogos or isinstance(db, SesionSoloLectura):
+        return
+    db.info.setdefault(_PENDIENTES, set()).update(catalogos)
+
+
+@event.listens_for(Session, "after_commit")
+def _al_confirmar(db: Session):
+    catalogos = sorted(db.info.pop(_PENDIENTES, ()))
+    if not catalogos:
+        return
+    # La sesión ya no tiene transacción: una propia, con otra conexión del pool
+    try:
+        with db.get_bind().begin() as conexion:
+            conexion.execute(
+                update(VersionCatalogo.__table__)
+                .where(VersionCatalogo.catalogo.in_(catalogos))
+                .values(version=VersionCatalogo.version + 1, fecha_actualizacion=datetime.utcnow())
+            )
+    except Exception:
+        logger.exception("No se pudo incrementar la versión de los catálogos", extra={"catalogos": catalogos})
+
+
+@event.listens_for(Session, "after_rollback")
+def _al_revertir(db: Session):
+    db.info.pop(_PENDIENTES, None)
+
+
+@event.listens_for(Session, "after_flush")
+def _al_hacer_flush(db: Session, contexto):
+    # new/dirty/deleted todavía muestran lo que se acaba de escribir
+    modificados = chain(
+        db.new, db.deleted, (obj for obj in db.dirty if db.is_modified(obj, include_collections=False))
+    )
+    incrementar_versiones(db, {CATALOGOS[type(obj)] for obj in modificados if type(obj) in CATALOGOS})
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _al_ejecutar(estado):
+    # update()/delete() masivos sobre un catálogo (no pasan por el flush)
+    if not (estado.is_update or estado.is_delete or estado.is_insert) or estado.bind_mapper is None:
+        return None
+    catalogo = CATALOGOS.get(estado.bind_mapper.class_)
+    if catalogo is None:
+        return None
+    resultado = estado.invoke_statement()
+    incrementar_versiones(estado.session, [catalogo])
+    return resultado
+
+
+def inicializar_versiones(db: Session):
+    """Crea la fila de cada catálogo que aún no la tenga (migración de esquema)"""
+    existentes = {c for (c,) in db.query(VersionCatalogo.catalogo)}
+    for catalogo in sorted(set(CATALOGOS.values()) - existentes):
+        db.add(VersionCatalogo(catalogo=catalogo, version=1))
+    db.commit()
+
+
+def _consulta_version(catalogo: str):
+    return select(VersionCatalogo.version).where(VersionCatalogo.catalogo == catalogo)
+
+
+def _etag(request: Request, catalogo: str, version: Optional[int], variantes: tuple) -> Optional[str]:
+    # Sin fila (base sin migrar) no hay versión confiable: se responde sin ETag
+    if version is None:
+        return None
+    # La misma versión del catálogo da respuestas distintas según ruta y filtros;
+    # DATOS_VERSION cubre las cargas de datos por defecto (CIE-10) de las migraciones
+    huella = hashlib.sha1(
+        f"{request.url.path}?{request.url.query}|{variantes}".encode()
+    ).hexdigest()[:16]
+    return f'W/"{catalogo}-{version}.{DATOS_VERSION}-{huella}"'
+
+
+def _coincide(request: Request, etag: str) -> bool:
+    # If-None-Match usa comparación débil: se ignora el prefijo W/
+    cabecera = request.headers.get("if-none-match")
+    if not cabecera:
+        return False
+    etiquetas = {e.strip().removeprefix("W/") for e in cabecera.split(",")}
+    return "*" in etiquetas or etag.removeprefix("W/") in etiquetas
+
+
+def _responder(request: Request, response: Response, etag: Optional[str]) -> Optional[Response]:
+    if etag is None:
+        return None
+    cabeceras = {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+    if _coincide(request, etag):
+        return Response(status_code=304, headers=cabeceras)
+    response.headers.update(cabeceras)
+    return None
+
+
+def respuesta_condicional(
+    db: Session, request: Request, response: Response, catalogo: str, *variantes
+) -> Optional[Response]:
+    """
+    Lee la versión del catálogo y agrega ETag a `response`. Retorna un 304 si el
+    cliente ya tiene esa versión (la ruta debe retornarlo sin consultar nada más).
+    `variantes`: datos del usuario que cambien la respuesta, además de la URL.
+    """
+    version = db.execute(_consulta_version(catalogo)).scalar()
+    return _responder(request, response, _etag(request, catalogo, version, variantes))
+
+
+async def respuesta_condicional_async(
+    db: AsyncSession, request: Request, response: Response, catalogo: str, *variantes
+) -> Optional[Response]:
+    """Igual que respuesta_condicional, con la sesión async"""
+    version = (await db.execute(_consulta_version(catalogo))).scalar()
+    return _responder(request, response, _etag(request, catalogo, version, variantes))
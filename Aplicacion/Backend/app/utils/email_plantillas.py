@@ -0,0 +1,730 @@
+"""
+Plantillas de email de citas (RF-001) compiladas una sola vez al importar el
+módulo, con un formateador de fechas en español compartido.
+
+Cada plantilla se divide al construirse en trozos literales y huecos, de
+modo que renderizar es solo un join (format_map volvería a analizar los
+~10 KB de HTML en cada llamada); los valores se escapan en la versión HTML. Las
+funciones de email_utils, el envío masivo de recordatorios y el visor de
+desarrollo (email_preview_routes) usan las mismas plantillas.
+"""
+from datetime import date, datetime, time
+from functools import lru_cache
+from html import escape
+from string import Formatter
+from typing import Callable, Iterable, List, NamedTuple, Optional, Union
+
+MESES = (
+    None, 'Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
+    'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre'
+)
+DIAS = ('Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo')
+
+
+def _solo_fecha(fecha: Union[date, datetime]) -> date:
+    return fecha.date() if isinstance(fecha, datetime) else fecha
+
+
+# Las fechas se cachean por día: en un envío masivo se repiten muchas veces
+@lru_cache(maxsize=1024)
+def _fecha_larga(dia: date) -> str:
+    return f"{DIAS[dia.weekday()]} {dia.day} de {MESES[dia.month]} de {dia.year}"
+
+
+@lru_cache(maxsize=1024)
+def _fecha_dia_mes(dia: date) -> str:
+    return f"{DIAS[dia.weekday()]} {dia.day} de {MESES[dia.month]}"
+
+
+@lru_cache(maxsize=1024)
+def _fecha_corta(dia: date) -> str:
+    return f"{dia.day} de {MESES[dia.month]} de {dia.year}"
+
+
+def fecha_larga(fecha: Union[date, datetime]) -> str:
+    """'Lunes 5 de Enero de 2026'"""
+    return _fecha_larga(_solo_fecha(fecha))
+
+
+def fecha_dia_mes(fecha: Union[date, datetime]) -> str:
+    """'Lunes 5 de Enero'"""
+    return _fecha_dia_mes(_solo_fecha(fecha))
+
+
+def fecha_corta(fecha: Union[date, datetime]) -> str:
+    """'5 de Enero de 2026'"""
+    return _fecha_corta(_solo_fecha(fecha))
+
+
+@lru_cache(maxsize=1440)
+def _hora_12h(hora: int, minuto: int) -> str:
+    return f"{hora % 12 or 12:02d}:{minuto:02d} {'PM' if hora >= 12 else 'AM'}"
+
+
+def hora_12h(fecha: datetime) -> str:
+    """'09:30 AM' (equivale a strftime('%I:%M %p') sin depender del locale)"""
+    return _hora_12h(fecha.hour, fecha.minute)
+
+
+def fecha_hora_cita(fecha: Union[date, datetime], hora_inicio: Optional[str]) -> datetime:
+    """Combina la fecha de la cita con su hora_inicio ('HH:MM' o 'HH:MM:SS'); 08:00 si no tiene"""
+    if hora_inicio:
+        partes = hora_inicio.split(':')
+        hora = time(int(partes[0]), int(partes[1]))
+    else:
+        hora = time(8, 0)
+    return datetime.combine(_solo_fecha(fecha), hora)
+
+
+class EmailRenderizado(NamedTuple):
+    asunto: str
+    texto: str
+    html: str
+
+
+class PlantillaEmail:
+    """
+    Asunto, cuerpo de texto y cuerpo HTML de un email. `preparar` convierte los
+    argumentos de negocio (fechas, nombres) en los campos de la plantilla.
+    """
+
+    def __init__(self, nombre: str, asunto: str, texto: str, html: str, preparar: Callable[..., dict]):
+        self._texto = _TextoCompilado(texto)
+        self._html = _TextoCompilado(html)
+        if self._texto.campos != self._html.campos:
+            raise ValueError(f"Plantilla {nombre}: texto y HTML usan campos distintos")
+        self.nombre = nombre
+        self.asunto = asunto
+        self.campos = self._texto.campos
+        self._preparar = preparar
+
+    def renderizar(self, **datos) -> EmailRenderizado:
+        campos = self._preparar(**datos)
+        campos_html = {
+            clave: escape(valor) if isinstance(valor, str) else valor
+            for clave, valor in campos.items()
+        }
+        return EmailRenderizado(self.asunto, self._texto.renderizar(campos), self._html.renderizar(campos_html))
+
+    def renderizar_lote(self, registros: Iterable[dict]) -> List[EmailRenderizado]:
+        """Renderiza un email por cada dict de argumentos (envíos masivos)"""
+        return [self.renderizar(**datos) for datos in registros]
+
+
+class _TextoCompilado:
+    """Texto con campos {nombre} dividido en trozos; los huecos se rellenan por posición"""
+
+    def __init__(self, plantilla: str):
+        trozos = []
+        huecos = []
+        for literal, campo, especificacion, conversion in Formatter().parse(plantilla):
+            if literal:
+                trozos.append(literal)
+            if campo is not None:
+                if especificacion or conversion:
+                    raise ValueError(f"Campo con formato no soportado: {campo}")
+                huecos.append((len(trozos), campo))
+                trozos.append("")
+        self._trozos = trozos
+        self._huecos = tuple(huecos)
+        self.campos = frozenset(campo for _, campo in huecos)
+
+    def renderizar(self, valores: dict) -> str:
+        trozos = self._trozos.copy()
+        for posicion, campo in self._huecos:
+            trozos[posicion] = str(valores[campo])
+        return "".join(trozos)
+
+
+# === TEXTOS (campos entre llaves, sin lógica) ===
+
+_ASUNTO_CONFIRMACION_CITA = "✅ Su Cita Médica ha sido Confirmada"
+
+_TEXTO_CONFIRMACION_CITA = """
+Estimado/a {paciente_nombre},
+
+¡Su cita médica ha sido agendada exitosamente!
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+DETALLES DE SU CITA
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+📅 Fecha: {fecha_formateada}
+🕐 Hora: {hora_formateada}
+👨‍⚕️ Doctor(a): {medico_nombre}
+📋 Motivo: {motivo}
+🔢 Código de Cita: #{cita_id}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+INSTRUCCIONES IMPORTANTES
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+✓ Llegar 15 minutos antes de su cita
+✓ Traer su documento de identidad
+✓ Traer su carnet de seguro médico (si aplica)
+✓ Traer exámenes previos relacionados
+
+Si necesita CANCELAR o REPROGRAMAR su cita, 
+contáctenos con al menos 24 horas de anticipación.
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+Estamos comprometidos con su salud y bienestar.
+
+Atentamente,
+Sistema de Gestión Hospitalaria
+📞 Teléfono: (099) XXX-XXXX
+📧 Email: info@hospital.com
+🏥 Hospital Central
+    """.strip()
+
+_HTML_CONFIRMACION_CITA = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    </head>
+    <body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #f5f7fa;">
+        <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f7fa; padding: 40px 20px;">
+            <tr>
+                <td align="center">
+                    <!-- Contenedor principal -->
+                    <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 16px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1); overflow: hidden;">
+                        <!-- Header con gradiente -->
+                        <tr>
+                            <td style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 40px 30px; text-align: center;">
+                                <div style="background-color: rgba(255,255,255,0.2); width: 80px; height: 80px; border-radius: 50%; margin: 0 auto 20px; display: flex; align-items: center; justify-content: center;">
+                                    <span style="font-size: 40px;">✅</span>
+                                </div>
+                                <h1 style="color: #ffffff; margin: 0; font-size: 28px; font-weight: bold;">Cita Confirmada</h1>
+                                <p style="color: rgba(255,255,255,0.9); margin: 10px 0 0 0; font-size: 16px;">Su cita ha sido agendada exitosamente</p>
+                            </td>
+                        </tr>
+                        
+                        <!-- Saludo -->
+                        <tr>
+                            <td style="padding: 30px 40px 20px;">
+                                <p style="font-size: 16px; color: #2d3748; margin: 0;">Estimado/a <strong style="color: #667eea;">{paciente_nombre}</strong>,</p>
+                                <p style="font-size: 16px; color: #4a5568; margin: 15px 0 0 0;">¡Su cita médica ha sido confirmada! A continuación encontrará todos los detalles:</p>
+                            </td>
+                        </tr>
+                        
+                        <!-- Detalles de la cita -->
+                        <tr>
+                            <td style="padding: 0 40px 30px;">
+                                <table width="100%" cellpadding="0" cellspacing="0" style="background: linear-gradient(135deg, #667eea15 0%, #764ba215 100%); border-radius: 12px; border: 2px solid #667eea30;">
+                                    <tr>
+                                        <td style="padding: 25px;">
+                                            <!-- Fecha -->
+                                            <div style="margin-bottom: 20px;">
+                                                <table width="100%" cellpadding="0" cellspacing="0">
+                                                    <tr>
+                                                        <td width="40" style="vertical-align: top;">
+                                                            <div style="width: 36px; height: 36px; background-color: #667eea; border-radius: 8px; display: flex; align-items: center; justify-content: center;">
+                                                                <span style="font-size: 20px;">📅</span>
+                                                            </div>
+                                                        </td>
+                                                        <td style="padding-left: 15px; vertical-align: middle;">
+                                                            <p style="margin: 0; font-size: 13px; color: #718096; font-weight: 600;">FECHA</p>
+                                                            <p style="margin: 5px 0 0 0; font-size: 18px; color: #2d3748; font-weight: bold;">{fecha_formateada}</p>
+                                                        </td>
+                                                    </tr>
+                                                </table>
+                                            </div>
+                                            
+                                            <!-- Hora -->
+                                            <div style="margin-bottom: 20px;">
+                                                <table width="100%" cellpadding="0" cellspacing="0">
+                                                    <tr>
+                                                        <td width="40" style="vertical-align: top;">
+                                                            <div style="width: 36px; height: 36px; background-color: #48bb78; border-radius: 8px; display: flex; align-items: center; justify-content: center;">
+                                                                <span style="font-size: 20px;">🕐</span>
+                                                            </div>
+                                                        </td>
+                                                        <td style="padding-left: 15px; vertical-align: middle;">
+                                                            <p style="margin: 0; font-size: 13px; color: #718096; font-weight: 600;">HORA</p>
+                                                            <p style="margin: 5px 0 0 0; font-size: 18px; color: #2d3748; font-weight: bold;">{hora_formateada}</p>
+                                                        </td>
+                                                    </tr>
+                                                </table>
+                                            </div>
+                                            
+                                            <!-- Médico -->
+                                            <div style="margin-bottom: 20px;">
+                                                <table width="100%" cellpadding="0" cellspacing="0">
+                                                    <tr>
+                                                        <td width="40" style="vertical-align: top;">
+                                                            <div style="width: 36px; height: 36px; background-color: #ed8936; border-radius: 8px; display: flex; align-items: center; justify-content: center;">
+                                                                <span style="font-size: 20px;">👨‍⚕️</span>
+                                                            </div>
+                                                        </td>
+                                                        <td style="padding-left: 15px; vertical-align: middle;">
+                                                            <p style="margin: 0; font-size: 13px; color: #718096; font-weight: 600;">DOCTOR(A)</p>
+                                                            <p style="margin: 5px 0 0 0; font-size: 18px; color: #2d3748; font-weight: bold;">Dr(a). {medico_nombre}</p>
+                                                        </td>
+                                                    </tr>
+                                                </table>
+                                            </div>
+                                            
+                                            <!-- Motivo -->
+                                            <div style="margin-bottom: 20px;">
+                                                <table width="100%" cellpadding="0" cellspacing="0">
+                                                    <tr>
+                                                        <td width="40" style="vertical-align: top;">
+                                                            <div style="width: 36px; height: 36px; background-color: #9f7aea; border-radius: 8px; display: flex; align-items: center; justify-content: center;">
+                                                                <span style="font-size: 20px;">📋</span>
+                                                            </div>
+                                                        </td>
+                                                        <td style="padding-left: 15px; vertical-align: middle;">
+                                                            <p style="margin: 0; font-size: 13px; color: #718096; font-weight: 600;">MOTIVO</p>
+                                                            <p style="margin: 5px 0 0 0; font-size: 16px; color: #2d3748;">{motivo}</p>
+                                                        </td>
+                                                    </tr>
+                                                </table>
+                                            </div>
+                                            
+                                            <!-- Código -->
+                                            <div>
+                                                <table width="100%" cellpadding="0" cellspacing="0">
+                                                    <tr>
+                                                        <td width="40" style="vertical-align: top;">
+                                                            <div style="width: 36px; height: 36px; background-color: #4299e1; border-radius: 8px; display: flex; align-items: center; justify-content: center;">
+                                                                <span style="font-size: 20px;">🔢</span>
+                                                            </div>
+                                                        </td>
+                                                        <td style="padding-left: 15px; vertical-align: middle;">
+                                                            <p style="margin: 0; font-size: 13px; color: #718096; font-weight: 600;">CÓDIGO DE CITA</p>
+                                                            <p style="margin: 5px 0 0 0; font-size: 18px; color: #667eea; font-weight: bold;">#{cita_id}</p>
+                                                        </td>
+                                                    </tr>
+                                                </table>
+                                            </div>
+                                        </td>
+                                    </tr>
+                                </table>
+                            </td>
+                        </tr>
+                        
+                        <!-- Instrucciones -->
+                        <tr>
+                            <td style="padding: 0 40px 30px;">
+                                <div style="background-color: #edf2f7; border-left: 4px solid #667eea; border-radius: 8px; padding: 20px;">
+                                    <h3 style="margin: 0 0 15px 0; color: #2d3748; font-size: 16px; font-weight: bold;">📌 Instrucciones Importantes</h3>
+                                    <ul style="margin: 0; padding-left: 20px; color: #4a5568; font-size: 14px; line-height: 1.8;">
+                                        <li>Llegar <strong>15 minutos antes</strong> de su cita</li>
+                                        <li>Traer su <strong>documento de identidad</strong></li>
+                                        <li>Traer su <strong>carnet de seguro médico</strong> (si aplica)</li>
+                                        <li>Traer <strong>exámenes previos</strong> relacionados</li>
+                                    </ul>
+                                </div>
+                            </td>
+                        </tr>
+                        
+                        <!-- Aviso de cancelación -->
+                        <tr>
+                            <td style="padding: 0 40px 30px;">
+                                <div style="background-color: #fff5f5; border-left: 4px solid #fc8181; border-radius: 8px; padding: 15px;">
+                                    <p style="margin: 0; color: #742a2a; font-size: 14px;">
+                                        <strong>⚠️ Cancelaciones:</strong> Si necesita cancelar o reprogramar, contáctenos con al menos <strong>24 horas de anticipación</strong>.
+                                    </p>
+                                </div>
+                            </td>
+                        </tr>
+                        
+                        <!-- Footer -->
+                        <tr>
+                            <td style="background-color: #f7fafc; padding: 30px 40px; text-align: center; border-top: 1px solid #e2e8f0;">
+                                <p style="margin: 0 0 10px 0; color: #2d3748; font-size: 16px; font-weight: bold;">Sistema de Gestión Hospitalaria</p>
+                                <p style="margin: 0 0 15px 0; color: #718096; font-size: 14px;">Comprometidos con su salud y bienestar</p>
+                                <div style="margin-top: 15px;">
+                                    <p style="margin: 5px 0; color: #4a5568; font-size: 13px;">📞 Teléfono: (099) XXX-XXXX</p>
+                                    <p style="margin: 5px 0; color: #4a5568; font-size: 13px;">📧 Email: info@hospital.com</p>
+                                    <p style="margin: 5px 0; color: #4a5568; font-size: 13px;">🏥 Hospital Central</p>
+                                </div>
+                                <p style="margin: 20px 0 0 0; color: #a0aec0; font-size: 12px;">
+                                    Este es un mensaje automático, por favor no responda a este correo.
+                                </p>
+                            </td>
+                        </tr>
+                    </table>
+                </td>
+            </tr>
+        </table>
+    </body>
+    </html>
+    """
+
+
+_ASUNTO_RECORDATORIO_CITA = "🔔 Recordatorio: Cita Médica Mañana"
+
+_TEXTO_RECORDATORIO_CITA = """
+Estimado/a {paciente_nombre},
+
+Este es un recordatorio de su cita médica programada para MAÑANA:
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+📅 Fecha: {fecha_formateada}
+🕐 Hora: {hora_formateada}
+👨‍⚕️ Doctor(a): {medico_nombre}
+🔢 Código: #{cita_id}
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+RECUERDE:
+✓ Llegar 15 minutos antes
+✓ Traer documento de identidad
+✓ Traer carnet de seguro (si aplica)
+
+Si no puede asistir, contáctenos lo antes posible.
+
+Atentamente,
+Sistema de Gestión Hospitalaria
+📞 (099) XXX-XXXX
+    """.strip()
+
+_HTML_RECORDATORIO_CITA = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    </head>
+    <body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background-color: #f5f7fa;">
+        <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f7fa; padding: 40px 20px;">
+            <tr>
+                <td align="center">
+                    <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 16px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1); overflow: hidden;">
+                        <!-- Header -->
+                        <tr>
+                            <td style="background: linear-gradient(135deg, #f59e0b 0%, #d97706 100%); padding: 40px 30px; text-align: center;">
+                                <div style="background-color: rgba(255,255,255,0.2); width: 80px; height: 80px; border-radius: 50%; margin: 0 auto 20px;">
+                                    <span style="font-size: 40px; line-height: 80px;">🔔</span>
+                                </div>
+                                <h1 style="color: #ffffff; margin: 0; font-size: 28px; font-weight: bold;">Recordatorio de Cita</h1>
+                                <p style="color: rgba(255,255,255,0.9); margin: 10px 0 0 0; font-size: 16px;">Su cita es mañana</p>
+                            </td>
+                        </tr>
+                        
+                        <tr>
+                            <td style="padding: 30px 40px;">
+                                <p style="font-size: 16px; color: #2d3748; margin: 0;">Estimado/a <strong style="color: #f59e0b;">{paciente_nombre}</strong>,</p>
+                                <p style="font-size: 16px; color: #4a5568; margin: 15px 0;">Le recordamos que tiene una cita médica programada para <strong>MAÑANA</strong>:</p>
+                                
+                                <table width="100%" cellpadding="15" cellspacing="0" style="background-color: #fef3c7; border-radius: 12px; margin: 20px 0;">
+                                    <tr>
+                                        <td>
+                                            <p style="margin: 8px 0; color: #78350f; font-size: 16px;"><strong>📅 Fecha:</strong> {fecha_formateada}</p>
+                                            <p style="margin: 8px 0; color: #78350f; font-size: 16px;"><strong>🕐 Hora:</strong> {hora_formateada}</p>
+                                            <p style="margin: 8px 0; color: #78350f; font-size: 16px;"><strong>👨‍⚕️ Doctor(a):</strong> Dr(a). {medico_nombre}</p>
+                                            <p style="margin: 8px 0; color: #78350f; font-size: 16px;"><strong>🔢 Código:</strong> #{cita_id}</p>
+                                        </td>
+                                    </tr>
+                                </table>
+                                
+                                <div style="background-color: #e0f2fe; border-left: 4px solid #0284c7; border-radius: 8px; padding: 20px; margin: 20px 0;">
+                                    <h3 style="margin: 0 0 12px 0; color: #0c4a6e; font-size: 16px;">✓ Recuerde:</h3>
+                                    <ul style="margin: 0; padding-left: 20px; color: #0c4a6e; font-size: 14px; line-height: 1.8;">
+                                        <li>Llegar <strong>15 minutos antes</strong></li>
+                                        <li>Traer documento de identidad</li>
+                                        <li>Traer carnet de seguro (si aplica)</li>
+                                    </ul>
+                                </div>
+                                
+                                <p style="color: #ef4444; font-size: 14px; margin: 20px 0;">
+                                    <strong>⚠️</strong> Si no puede asistir, contáctenos lo antes posible.
+                                </p>
+                            </td>
+                        </tr>
+                        
+                        <tr>
+                            <td style="background-color: #f7fafc; padding: 20px 40px; text-align: center; border-top: 1px solid #e2e8f0;">
+                                <p style="margin: 0; color: #718096; font-size: 13px;">Sistema de Gestión Hospitalaria</p>
+                                <p style="margin: 5px 0 0 0; color: #a0aec0; font-size: 12px;">📞 (099) XXX-XXXX</p>
+                            </td>
+                        </tr>
+                    </table>
+                </td>
+            </tr>
+        </table>
+    </body>
+    </html>
+    """
+
+
+_ASUNTO_CANCELACION_CITA = "❌ Notificación: Cita Médica Cancelada"
+
+_TEXTO_CANCELACION_CITA = """
+Estimado/a {paciente_nombre},
+
+Le informamos que su cita médica ha sido CANCELADA.
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+DATOS DE LA CITA CANCELADA
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+📅 Fecha: {fecha_formateada}
+🕐 Hora: {hora_formateada}
+
+MOTIVO DE CANCELACIÓN:
+{motivo_cancelacion}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+¿Desea reagendar su cita?
+Contáctenos o acceda al sistema para programar una nueva fecha.
+
+Atentamente,
+Sistema de Gestión Hospitalaria
+📞 (099) XXX-XXXX
+📧 info@hospital.com
+    """.strip()
+
+_HTML_CANCELACION_CITA = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    </head>
+    <body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background-color: #f5f7fa;">
+        <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f7fa; padding: 40px 20px;">
+            <tr>
+                <td align="center">
+                    <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 16px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1); overflow: hidden;">
+                        <!-- Header -->
+                        <tr>
+                            <td style="background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%); padding: 40px 30px; text-align: center;">
+                                <div style="background-color: rgba(255,255,255,0.2); width: 80px; height: 80px; border-radius: 50%; margin: 0 auto 20px;">
+                                    <span style="font-size: 40px; line-height: 80px;">❌</span>
+                                </div>
+                                <h1 style="color: #ffffff; margin: 0; font-size: 28px; font-weight: bold;">Cita Cancelada</h1>
+                                <p style="color: rgba(255,255,255,0.9); margin: 10px 0 0 0; font-size: 16px;">Su cita médica ha sido cancelada</p>
+                            </td>
+                        </tr>
+                        
+                        <tr>
+                            <td style="padding: 30px 40px;">
+                                <p style="font-size: 16px; color: #2d3748; margin: 0;">Estimado/a <strong style="color: #ef4444;">{paciente_nombre}</strong>,</p>
+                                <p style="font-size: 16px; color: #4a5568; margin: 15px 0;">Le informamos que su cita médica ha sido <strong>CANCELADA</strong>.</p>
+                                
+                                <table width="100%" cellpadding="15" cellspacing="0" style="background-color: #fee2e2; border-radius: 12px; margin: 20px 0;">
+                                    <tr>
+                                        <td>
+                                            <h3 style="margin: 0 0 12px 0; color: #991b1b; font-size: 16px;">Datos de la Cita Cancelada:</h3>
+                                            <p style="margin: 8px 0; color: #7f1d1d; font-size: 16px;"><strong>📅 Fecha:</strong> {fecha_formateada}</p>
+                                            <p style="margin: 8px 0; color: #7f1d1d; font-size: 16px;"><strong>🕐 Hora:</strong> {hora_formateada}</p>
+                                        </td>
+                                    </tr>
+                                </table>
+                                
+                                <div style="background-color: #fef3c7; border-left: 4px solid #f59e0b; border-radius: 8px; padding: 20px; margin: 20px 0;">
+                                    <h3 style="margin: 0 0 10px 0; color: #78350f; font-size: 16px;">📝 Motivo de Cancelación:</h3>
+                                    <p style="margin: 0; color: #78350f; font-size: 14px; line-height: 1.6;">{motivo_cancelacion}</p>
+                                </div>
+                                
+                                <div style="background-color: #e0f2fe; border-radius: 12px; padding: 25px; margin: 25px 0; text-align: center;">
+                                    <h3 style="margin: 0 0 10px 0; color: #0c4a6e; font-size: 18px;">¿Desea reagendar su cita?</h3>
+                                    <p style="margin: 0; color: #075985; font-size: 14px;">Contáctenos o acceda al sistema para programar una nueva fecha.</p>
+                                </div>
+                            </td>
+                        </tr>
+                        
+                        <tr>
+                            <td style="background-color: #f7fafc; padding: 20px 40px; text-align: center; border-top: 1px solid #e2e8f0;">
+                                <p style="margin: 0; color: #2d3748; font-size: 14px; font-weight: bold;">Sistema de Gestión Hospitalaria</p>
+                                <p style="margin: 5px 0; color: #718096; font-size: 13px;">📞 (099) XXX-XXXX | 📧 info@hospital.com</p>
+                            </td>
+                        </tr>
+                    </table>
+                </td>
+            </tr>
+        </table>
+    </body>
+    </html>
+    """
+
+
+_ASUNTO_REPROGRAMACION_CITA = "🔄 Importante: Cita Médica Reprogramada"
+
+_TEXTO_REPROGRAMACION_CITA = """
+Estimado/a {paciente_nombre},
+
+Su cita médica ha sido REPROGRAMADA.
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+FECHA ANTERIOR (CANCELADA):
+📅 {fecha_ant_formateada}
+🕐 {hora_ant_formateada}
+
+       ⬇️  CAMBIO A  ⬇️
+
+NUEVA FECHA (CONFIRMADA):
+📅 {fecha_nueva_formateada}
+🕐 {hora_nueva_formateada}
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+👨‍⚕️ Doctor(a): {medico_nombre}
+🔢 Código: #{cita_id}
+
+RECUERDE:
+✓ Llegar 15 minutos antes
+✓ Traer documento de identidad
+✓ Traer carnet de seguro (si aplica)
+
+Atentamente,
+Sistema de Gestión Hospitalaria
+📞 (099) XXX-XXXX
+    """.strip()
+
+_HTML_REPROGRAMACION_CITA = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    </head>
+    <body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background-color: #f5f7fa;">
+        <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #f5f7fa; padding: 40px 20px;">
+            <tr>
+                <td align="center">
+                    <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 16px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1); overflow: hidden;">
+                        <!-- Header -->
+                        <tr>
+                            <td style="background: linear-gradient(135deg, #8b5cf6 0%, #6366f1 100%); padding: 40px 30px; text-align: center;">
+                                <div style="background-color: rgba(255,255,255,0.2); width: 80px; height: 80px; border-radius: 50%; margin: 0 auto 20px;">
+                                    <span style="font-size: 40px; line-height: 80px;">🔄</span>
+                                </div>
+                                <h1 style="color: #ffffff; margin: 0; font-size: 28px; font-weight: bold;">Cita Reprogramada</h1>
+                                <p style="color: rgba(255,255,255,0.9); margin: 10px 0 0 0; font-size: 16px;">Su cita ha sido cambiada a una nueva fecha</p>
+                            </td>
+                        </tr>
+                        
+                        <tr>
+                            <td style="padding: 30px 40px;">
+                                <p style="font-size: 16px; color: #2d3748; margin: 0;">Estimado/a <strong style="color: #8b5cf6;">{paciente_nombre}</strong>,</p>
+                                <p style="font-size: 16px; color: #4a5568; margin: 15px 0;">Le informamos que su cita médica ha sido <strong>REPROGRAMADA</strong> a una nueva fecha:</p>
+                                
+                                <!-- Fecha Anterior -->
+                                <table width="100%" cellpadding="15" cellspacing="0" style="background-color: #fee2e2; border-radius: 12px; margin: 20px 0; border: 2px dashed #f87171;">
+                                    <tr>
+                                        <td>
+                                            <h3 style="margin: 0 0 12px 0; color: #991b1b; font-size: 16px;">❌ Fecha Anterior (Cancelada):</h3>
+                                            <p style="margin: 8px 0; color: #7f1d1d; font-size: 16px; text-decoration: line-through;"><strong>📅 Fecha:</strong> {fecha_ant_formateada}</p>
+                                            <p style="margin: 8px 0; color: #7f1d1d; font-size: 16px; text-decoration: line-through;"><strong>🕐 Hora:</strong> {hora_ant_formateada}</p>
+                                        </td>
+                                    </tr>
+                                </table>
+                                
+                                <!-- Flecha de cambio -->
+                                <div style="text-align: center; margin: 15px 0;">
+                                    <span style="font-size: 32px; color: #8b5cf6;">⬇️</span>
+                                    <p style="margin: 5px 0; color: #8b5cf6; font-weight: bold; font-size: 14px;">CAMBIO A</p>
+                                    <span style="font-size: 32px; color: #8b5cf6;">⬇️</span>
+                                </div>
+                                
+                                <!-- Nueva Fecha -->
+                                <table width="100%" cellpadding="15" cellspacing="0" style="background: linear-gradient(135deg, #ddd6fe, #e0e7ff); border-radius: 12px; margin: 20px 0; border: 2px solid #8b5cf6;">
+                                    <tr>
+                                        <td>
+                                            <h3 style="margin: 0 0 12px 0; color: #5b21b6; font-size: 18px;">✅ Nueva Fecha (Confirmada):</h3>
+                                            <p style="margin: 8px 0; color: #5b21b6; font-size: 18px; font-weight: bold;"><strong>📅 Fecha:</strong> {fecha_nueva_formateada}</p>
+                                            <p style="margin: 8px 0; color: #5b21b6; font-size: 18px; font-weight: bold;"><strong>🕐 Hora:</strong> {hora_nueva_formateada}</p>
+                                            <hr style="border: none; border-top: 1px solid rgba(91, 33, 182, 0.2); margin: 15px 0;">
+                                            <p style="margin: 8px 0; color: #5b21b6; font-size: 16px;"><strong>👨‍⚕️ Doctor(a):</strong> Dr(a). {medico_nombre}</p>
+                                            <p style="margin: 8px 0; color: #5b21b6; font-size: 16px;"><strong>🔢 Código:</strong> #{cita_id}</p>
+                                        </td>
+                                    </tr>
+                                </table>
+                                
+                                <div style="background-color: #e0f2fe; border-left: 4px solid #0284c7; border-radius: 8px; padding: 20px; margin: 20px 0;">
+                                    <h3 style="margin: 0 0 12px 0; color: #0c4a6e; font-size: 16px;">✓ Recuerde:</h3>
+                                    <ul style="margin: 0; padding-left: 20px; color: #0c4a6e; font-size: 14px; line-height: 1.8;">
+                                        <li>Llegar <strong>15 minutos antes</strong></li>
+                                        <li>Traer documento de identidad</li>
+                                        <li>Traer carnet de seguro (si aplica)</li>
+                                    </ul>
+                                </div>
+                            </td>
+                        </tr>
+                        
+                        <tr>
+                            <td style="background-color: #f7fafc; padding: 20px 40px; text-align: center; border-top: 1px solid #e2e8f0;">
+                                <p style="margin: 0; color: #2d3748; font-size: 14px; font-weight: bold;">Sistema de Gestión Hospitalaria</p>
+                                <p style="margin: 5px 0; color: #718096; font-size: 13px;">📞 (099) XXX-XXXX</p>
+                            </td>
+                        </tr>
+                    </table>
+                </td>
+            </tr>
+        </table>
+    </body>
+    </html>
+    """
+
+
+# === PLANTILLAS ===
+
+def _preparar_confirmacion(paciente_nombre: str, fecha: datetime, medico_nombre: str,
+                           motivo: str, cita_id: int) -> dict:
+    return {
+        "paciente_nombre": paciente_nombre,
+        "fecha_formateada": fecha_larga(fecha),
+        "hora_formateada": hora_12h(fecha),
+        "medico_nombre": medico_nombre,
+        "motivo": motivo,
+        "cita_id": cita_id,
+    }
+
+
+def _preparar_recordatorio(paciente_nombre: str, fecha: datetime, medico_nombre: str, cita_id: int) -> dict:
+    return {
+        "paciente_nombre": paciente_nombre,
+        "fecha_formateada": fecha_dia_mes(fecha),
+        "hora_formateada": hora_12h(fecha),
+        "medico_nombre": medico_nombre,
+        "cita_id": cita_id,
+    }
+
+
+def _preparar_cancelacion(paciente_nombre: str, fecha: datetime, motivo_cancelacion: str) -> dict:
+    return {
+        "paciente_nombre": paciente_nombre,
+        "fecha_formateada": fecha_corta(fecha),
+        "hora_formateada": hora_12h(fecha),
+        "motivo_cancelacion": motivo_cancelacion,
+    }
+
+
+def _preparar_reprogramacion(paciente_nombre: str, fecha_anterior: datetime, fecha_nueva: datetime,
+                             medico_nombre: str, cita_id: int) -> dict:
+    return {
+        "paciente_nombre": paciente_nombre,
+        "fecha_ant_formateada": fecha_corta(fecha_anterior),
+        "hora_ant_formateada": hora_12h(fecha_anterior),
+        "fecha_nueva_formateada": fecha_corta(fecha_nueva),
+        "hora_nueva_formateada": hora_12h(fecha_nueva),
+        "medico_nombre": medico_nombre,
+        "cita_id": cita_id,
+    }
+
+
+CONFIRMACION_CITA = PlantillaEmail(
+    "confirmacion_cita", _ASUNTO_CONFIRMACION_CITA, _TEXTO_CONFIRMACION_CITA,
+    _HTML_CONFIRMACION_CITA, _preparar_confirmacion
+)
+RECORDATORIO_CITA = PlantillaEmail(
+    "recordatorio_cita", _ASUNTO_RECORDATORIO_CITA, _TEXTO_RECORDATORIO_CITA,
+    _HTML_RECORDATORIO_CITA, _preparar_recordatorio
+)
+CANCELACION_CITA = PlantillaEmail(
+    "cancelacion_cita", _ASUNTO_CANCELACION_CITA, _TEXTO_CANCELACION_CITA,
+    _HTML_CANCELACION_CITA, _preparar_cancelacion
+)
+REPROGRAMACION_CITA = PlantillaEmail(
+    "reprogramacion_cita", _ASUNTO_REPROGRAMACION_CITA, _TEXTO_REPROGRAMACION_CITA,
+    _HTML_REPROGRAMACION_CITA, _preparar_reprogramacion
+)
+
+PLANTILLAS = {
+    plantilla.nombre: plantilla
+    for plantilla in (CONFIRMACION_CITA, RECORDATORIO_CITA, CANCELACION_CITA, REPROGRAMACION_CITA)
+}
@@ -1,4 +1,183 @@
+"""
+Logging estructurado de la aplicación.
+
+- Una línea JSON por evento (LOG_FORMATO=texto para leerlo en desarrollo):
+  fecha, nivel, logger, mensaje, los campos pasados en `extra` y la
+  excepción si la hay.
+- Los hilos de las solicitudes solo encolan el registro (QueueHandler); un
+  QueueListener en su propio hilo da formato y escribe en stdout. Una
+  consola o un disco lento no frenan al API.
+- Niveles por módulo con LOG_NIVELES ("websocket=WARNING,citas=DEBUG"), y
+  muestreo de eventos de alto volumen con LOG_MUESTREO
+  ("websocket.conexion=0.1"): el evento se marca con extra={"evento": ...}
+  y solo se escribe esa fracción. Advertencias y errores no se muestrean.
+
+Uso en un módulo:
+
+    from app.utils.logger import obtener_logger
+    logger = obtener_logger("citas")
+    logger.info("Cita creada", extra={"cita_id": cita.id})
+"""
+import atexit
+import copy
 import logging
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+import orjson
+
+from app.core.config import settings
+
+RAIZ = "gestion_medica"
+
+# Atributos propios de LogRecord: el resto son campos de `extra`
+_ATRIBUTOS_RECORD = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class FormatoJSON(logging.Formatter):
+    """Una línea JSON por registro"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        linea = {
+            "fecha": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensaje": record.getMessage(),
+        }
+        for clave, valor in vars(record).items():
+            if clave not in _ATRIBUTOS_RECORD and not clave.startswith("_"):
+                linea[clave] = valor
+        if record.exc_text:
+            linea["excepcion"] = record.exc_text
+        return orjson.dumps(linea, default=str).decode()
+
+
+class FormatoTexto(logging.Formatter):
+    """Formato legible para desarrollo, con los campos de `extra` al final"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s - %(levelname)s - %(name)s - %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        texto = super().format(record)
+        campos = {c: v for c, v in vars(record).items() if c not in _ATRIBUTOS_RECORD and not c.startswith("_")}
+        return f"{texto} {campos}" if campos else texto
+
+
+class _ColaHandler(QueueHandler):
+    """
+    Encola el registro sin darle formato (eso lo hace el hilo del listener).
+    Solo resuelve lo que depende del momento: el mensaje con sus argumentos
+    y el texto de la excepción.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class FiltroMuestreo(logging.Filter):
+    """Deja pasar solo una fracción de los eventos configurados (debajo de WARNING)"""
+
+    def __init__(self, tasas: Dict[str, float]):
+        super().__init__()
+        self.tasas = tasas
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        evento = getattr(record, "evento", None)
+        tasa = self.tasas.get(evento) if evento else None
+        if tasa is None or record.levelno >= logging.WARNING:
+            return True
+        if random.random() >= tasa:
+            return False
+        record.muestreo = tasa  # para estimar el total: cada línea representa 1/tasa eventos
+        return True
+
+
+def _pares(valor: Optional[str]) -> Dict[str, str]:
+    """ "a=1, b=2" -> {"a": "1", "b": "2"} """
+    pares = {}
+    for parte in (valor or "").split(","):
+        clave, _, dato = parte.partition("=")
+        if clave.strip() and dato.strip():
+            pares[clave.strip()] = dato.strip()
+    return pares
+
+
+_listener: Optional[QueueListener] = None
+_lock = threading.Lock()
+_atexit_registrado = False
+
+
+def _handler_salida() -> logging.Handler:
+    salida = logging.StreamHandler(sys.stdout)
+    salida.setFormatter(FormatoTexto() if settings.LOG_FORMATO == "texto" else FormatoJSON())
+    return salida
+
+
+def _filtro_muestreo() -> FiltroMuestreo:
+    return FiltroMuestreo({e: float(t) for e, t in _pares(settings.LOG_MUESTREO).items()})
+
+
+def configurar_logging():
+    """
+    Instala la cola y el listener en el logger raíz de la app. Se llama al
+    importar el módulo y en el startup de la app: si un apagado anterior
+    detuvo el listener (otro ciclo de vida en el mismo proceso, como en las
+    pruebas), lo vuelve a iniciar.
+    """
+    global _listener, _atexit_registrado
+    with _lock:
+        if _listener is not None:
+            return
+        cola = _ColaHandler(queue.SimpleQueue())
+        cola.addFilter(_filtro_muestreo())
+
+        raiz = logging.getLogger(RAIZ)
+        raiz.handlers = [cola]
+        raiz.setLevel(settings.LOG_NIVEL.upper())
+        raiz.propagate = False
+        for modulo, nivel in _pares(settings.LOG_NIVELES).items():
+            logging.getLogger(f"{RAIZ}.{modulo}").setLevel(nivel.upper())
+
+        _listener = QueueListener(cola.queue, _handler_salida(), respect_handler_level=True)
+        _listener.start()
+        if not _atexit_registrado:
+            atexit.register(detener_logging)
+            _atexit_registrado = True
+
+
+def detener_logging():
+    """
+    Escribe lo que quede en la cola y detiene el listener (apagado de la app).
+    El logger queda con un handler directo a stdout: lo que se registre hasta
+    el próximo configurar_logging() se escribe sin cola en lugar de perderse.
+    """
+    global _listener
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        _listener = None
+        salida = _handler_salida()
+        salida.addFilter(_filtro_muestreo())
+        logging.getLogger(RAIZ).handlers = [salida]
+
+
+def obtener_logger(modulo: str) -> logging.Logger:
+    """Logger `gestion_medica.<modulo>`; su nivel se ajusta con LOG_NIVELES"""
+    return logging.getLogger(f"{RAIZ}.{modulo}")
+
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-logger = logging.getLogger("gestion_medica")
+configurar_logging()
+logger = logging.getLogger(RAIZ)
@@ -0,0 +1,417 @@
+"""
+Plantillas precompiladas para los PDFs de pdf_generator: colores, estilos de
+párrafo, estilos de tabla y textos fijos se construyen una sola vez al
+importar el módulo. El código de cada documento solo rellena los datos.
+
+Los estilos (ParagraphStyle, TableStyle) no se modifican al construir un
+documento, por lo que se comparten. Los flowables (Paragraph, Table) sí
+guardan estado de maquetación: los párrafos fijos se entregan como copia.
+"""
+import copy
+from functools import lru_cache
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.platypus import Paragraph, TableStyle
+
+# Paleta de colores moderna y profesional
+COLORS = {
+    'primary': colors.HexColor('#2563eb'),      # Azul vibrante
+    'secondary': colors.HexColor('#7c3aed'),    # Púrpura elegante
+    'success': colors.HexColor('#059669'),      # Verde esmeralda
+    'warning': colors.HexColor('#d97706'),      # Ámbar
+    'danger': colors.HexColor('#dc2626'),       # Rojo
+    'dark': colors.HexColor('#1f2937'),         # Gris oscuro
+    'light': colors.HexColor('#f9fafb'),        # Gris muy claro
+    'border': colors.HexColor('#e5e7eb'),       # Gris border
+    'text_secondary': colors.HexColor('#6b7280'), # Texto secundario
+    'bg_highlight': colors.HexColor('#eff6ff'),  # Azul muy claro
+    'bg_success': colors.HexColor('#d1fae5'),    # Verde muy claro
+    'bg_warning': colors.HexColor('#fef3c7'),    # Amarillo claro
+}
+
+_base = getSampleStyleSheet()
+
+
+# === ESTILOS DE LA RECETA ===
+
+RECETA_TITULO = ParagraphStyle(
+    'ElegantTitle',
+    parent=_base['Heading1'],
+    fontSize=26,
+    textColor=COLORS['primary'],
+    spaceAfter=8,
+    spaceBefore=5,
+    alignment=TA_CENTER,
+    fontName='Helvetica-Bold',
+    leading=30
+)
+
+RECETA_SUBTITULO = ParagraphStyle(
+    'DocSubtitle',
+    parent=_base['Normal'],
+    fontSize=11,
+    textColor=COLORS['text_secondary'],
+    spaceAfter=20,
+    alignment=TA_CENTER,
+    fontName='Helvetica-Oblique'
+)
+
+RECETA_SECCION = ParagraphStyle(
+    'SectionLabel',
+    parent=_base['Heading2'],
+    fontSize=13,
+    textColor=COLORS['primary'],
+    spaceAfter=10,
+    spaceBefore=15,
+    fontName='Helvetica-Bold',
+    leftIndent=5,
+    borderPadding=5,
+    borderWidth=0,
+    borderColor=COLORS['primary']
+)
+
+RECETA_NORMAL = ParagraphStyle(
+    'NormalPlus',
+    parent=_base['Normal'],
+    fontSize=10,
+    spaceAfter=6,
+    leading=14,
+    textColor=COLORS['dark']
+)
+
+RECETA_MEDICAMENTOS = ParagraphStyle(
+    'PrescriptionText',
+    parent=_base['Normal'],
+    fontSize=11,
+    leading=18,
+    leftIndent=5,
+    fontName='Helvetica',
+    textColor=COLORS['dark']
+)
+
+RECETA_INDICACIONES = ParagraphStyle(
+    'Instructions',
+    parent=_base['Normal'],
+    fontSize=10,
+    leading=16,
+    textColor=COLORS['dark'],
+    alignment=TA_JUSTIFY
+)
+
+RECETA_PIE = ParagraphStyle(
+    'FooterNotes',
+    parent=_base['Normal'],
+    fontSize=8,
+    textColor=COLORS['text_secondary'],
+    alignment=TA_CENTER,
+    leading=12
+)
+
+# === ESTILOS DEL COMPROBANTE DE CITA ===
+
+CITA_TITULO = ParagraphStyle(
+    'AppointmentTitle',
+    parent=_base['Heading1'],
+    fontSize=28,
+    textColor=COLORS['primary'],
+    spaceAfter=6,
+    alignment=TA_CENTER,
+    fontName='Helvetica-Bold',
+    leading=32
+)
+
+CITA_SUBTITULO = ParagraphStyle(
+    'InstitutionSubtitle',
+    parent=_base['Normal'],
+    fontSize=12,
+    textColor=COLORS['text_secondary'],
+    spaceAfter=10,
+    alignment=TA_CENTER,
+    fontName='Helvetica-Oblique'
+)
+
+CITA_SECCION = ParagraphStyle(
+    'SectionTitle',
+    parent=_base['Heading2'],
+    fontSize=14,
+    textColor=COLORS['primary'],
+    spaceAfter=12,
+    spaceBefore=10,
+    fontName='Helvetica-Bold',
+    leftIndent=5
+)
+
+CITA_TEXTO = ParagraphStyle(
+    'InfoText',
+    parent=_base['Normal'],
+    fontSize=10,
+    textColor=COLORS['dark'],
+    leading=14
+)
+
+CITA_INSTRUCCIONES = ParagraphStyle(
+    'Instructions',
+    parent=_base['Normal'],
+    fontSize=10,
+    textColor=COLORS['text_secondary'],
+    alignment=TA_CENTER,
+    leading=15,
+    spaceAfter=6
+)
+
+CITA_MOTIVO = ParagraphStyle(
+    'MotivoText',
+    parent=_base['Normal'],
+    fontSize=10,
+    leading=15,
+    textColor=COLORS['dark'],
+    alignment=TA_JUSTIFY
+)
+
+CITA_PIE_CONTACTO = ParagraphStyle(
+    'FooterContact',
+    parent=_base['Normal'],
+    fontSize=9,
+    textColor=COLORS['text_secondary'],
+    alignment=TA_CENTER,
+    leading=13
+)
+
+# Colores del badge de estado de la cita
+CITA_ESTADO_COLORES = {
+    'programada': COLORS['primary'],
+    'confirmada': COLORS['success'],
+    'en_proceso': COLORS['warning'],
+    'completada': COLORS['success'],
+    'cancelada': COLORS['danger']
+}
+CITA_ESTADO_FONDOS = {
+    'programada': COLORS['bg_highlight'],
+    'confirmada': COLORS['bg_success'],
+    'en_proceso': COLORS['bg_warning'],
+    'completada': COLORS['bg_success'],
+    'cancelada': colors.HexColor('#fee2e2')
+}
+
+
+# === ESTILOS DE TABLA DE LA RECETA ===
+
+TABLA_RECETA_INFO = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), COLORS['bg_highlight']),
+    ('BOX', (0, 0), (-1, -1), 2, COLORS['primary']),
+    ('INNERGRID', (0, 1), (-1, -1), 0.5, COLORS['border']),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 15),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 15),
+    ('TOPPADDING', (0, 0), (-1, 0), 5),
+    ('TOPPADDING', (0, 1), (-1, -1), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+])
+
+TABLA_RECETA_PACIENTE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), COLORS['light']),
+    ('BACKGROUND', (1, 0), (1, -1), colors.white),
+    ('BOX', (0, 0), (-1, -1), 1.5, COLORS['border']),
+    ('INNERGRID', (0, 0), (-1, -1), 0.5, COLORS['border']),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 12),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+    ('TOPPADDING', (0, 0), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+])
+
+TABLA_RECETA_ALERGIAS = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#fee2e2')),
+    ('BOX', (0, 0), (-1, -1), 2, COLORS['danger']),
+    ('LEFTPADDING', (0, 0), (-1, -1), 15),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 15),
+    ('TOPPADDING', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+])
+
+TABLA_RECETA_MEDICAMENTOS = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), COLORS['bg_warning']),
+    ('BOX', (0, 0), (-1, -1), 2.5, COLORS['warning']),
+    ('LEFTPADDING', (0, 0), (-1, -1), 20),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 20),
+    ('TOPPADDING', (0, 0), (-1, -1), 18),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 18),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+])
+
+TABLA_RECETA_INDICACIONES = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#e0f2fe')),
+    ('BOX', (0, 0), (-1, -1), 1.5, COLORS['primary']),
+    ('LEFTPADDING', (0, 0), (-1, -1), 15),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 15),
+    ('TOPPADDING', (0, 0), (-1, -1), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+])
+
+TABLA_RECETA_DISPENSACION = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), COLORS['bg_success']),
+    ('BACKGROUND', (1, 0), (1, -1), colors.white),
+    ('BOX', (0, 0), (-1, -1), 1, COLORS['success']),
+    ('INNERGRID', (0, 0), (-1, -1), 0.5, COLORS['border']),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 12),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+    ('TOPPADDING', (0, 0), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+])
+
+TABLA_RECETA_FIRMA = TableStyle([
+    ('ALIGN', (1, 0), (1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('LINEABOVE', (1, 2), (1, 2), 1.5, COLORS['dark']),
+])
+
+TABLA_RECETA_NOTAS = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#fafafa')),
+    ('BOX', (0, 0), (-1, -1), 1, COLORS['border']),
+    ('LEFTPADDING', (0, 0), (-1, -1), 15),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 15),
+    ('TOPPADDING', (0, 0), (-1, -1), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+])
+
+# === ESTILOS DE TABLA DEL COMPROBANTE ===
+
+TABLA_CITA_QR = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('TOPPADDING', (0, 0), (-1, -1), 5),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+])
+
+TABLA_CITA_TARJETA = TableStyle([
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f8fafc')),
+    ('BOX', (0, 0), (-1, -1), 2.5, COLORS['primary']),
+    ('LINEAFTER', (0, 0), (0, 0), 1, COLORS['border']),
+    ('LEFTPADDING', (0, 0), (-1, -1), 20),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 20),
+    ('TOPPADDING', (0, 0), (-1, -1), 20),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 20),
+])
+
+TABLA_CITA_PACIENTE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), COLORS['light']),
+    ('BACKGROUND', (1, 0), (1, -1), colors.white),
+    ('BOX', (0, 0), (-1, -1), 1.5, COLORS['border']),
+    ('INNERGRID', (0, 0), (-1, -1), 0.5, COLORS['border']),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 12),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+    ('TOPPADDING', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+])
+
+TABLA_CITA_MEDICO = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), COLORS['bg_highlight']),
+    ('BACKGROUND', (1, 0), (1, -1), colors.white),
+    ('BOX', (0, 0), (-1, -1), 1.5, COLORS['primary']),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 12),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+    ('TOPPADDING', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+])
+
+TABLA_CITA_MOTIVO = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#fffbeb')),
+    ('BOX', (0, 0), (-1, -1), 1.5, COLORS['warning']),
+    ('LEFTPADDING', (0, 0), (-1, -1), 15),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 15),
+    ('TOPPADDING', (0, 0), (-1, -1), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+])
+
+TABLA_CITA_INSTRUCCIONES = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), COLORS['primary']),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f0f9ff')),
+    ('BOX', (0, 0), (-1, -1), 2, COLORS['primary']),
+    ('INNERGRID', (0, 0), (-1, -1), 0.5, COLORS['border']),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 15),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 15),
+    ('TOPPADDING', (0, 0), (-1, -1), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+])
+
+TABLA_CITA_PIE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#fafafa')),
+    ('BOX', (0, 0), (-1, -1), 1, COLORS['border']),
+    ('LEFTPADDING', (0, 0), (-1, -1), 15),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 15),
+    ('TOPPADDING', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+])
+
+
+@lru_cache(maxsize=None)
+def tabla_cita_info(estado: str) -> TableStyle:
+    """Estilo de la columna de información de la cita con el badge del estado"""
+    return TableStyle([
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 0),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+        ('TOPPADDING', (0, 0), (-1, -1), 2),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+        # Badge de estado
+        ('BACKGROUND', (0, -1), (-1, -1), CITA_ESTADO_FONDOS.get(estado, COLORS['light'])),
+        ('BOX', (0, -1), (-1, -1), 1.5, CITA_ESTADO_COLORES.get(estado, COLORS['text_secondary'])),
+        ('LEFTPADDING', (0, -1), (-1, -1), 8),
+        ('RIGHTPADDING', (0, -1), (-1, -1), 8),
+        ('TOPPADDING', (0, -1), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, -1), (-1, -1), 6),
+    ])
+
+
+# === TEXTOS FIJOS ===
+
+NOTAS_RECETA = (
+    '<font size=9><b>NOTAS IMPORTANTES</b></font><br/>'
+    '• Esta receta médica es válida por 30 días desde la fecha de emisión<br/>'
+    '• No automedicarse. Seguir estrictamente las indicaciones del médico<br/>'
+    '• Conservar los medicamentos en lugar fresco y seco, fuera del alcance de los niños<br/>'
+    '• Ante cualquier reacción adversa, suspender y consultar inmediatamente'
+)
+
+INSTRUCCIONES_CITA_TITULO = '<font size=11 color="#2563eb"><b>📋 INSTRUCCIONES PARA SU VISITA</b></font>'
+
+INSTRUCCIONES_CITA = (
+    '<font size=10 color="#1f2937">'
+    '<b>✓</b> Llegar <b>15 minutos antes</b> de la hora programada<br/>'
+    '<b>✓</b> Traer <b>documento de identidad</b> y carnet de seguro<br/>'
+    '<b>✓</b> Presentar este <b>comprobante en recepción</b><br/>'
+    '<b>✓</b> Para <b>cancelar o reprogramar</b>, contactar con <b>24 horas</b> de anticipación<br/>'
+    '<b>✓</b> En caso de retraso mayor a 15 min, la cita puede ser <b>reprogramada</b>'
+    '</font>'
+)
+
+CONTACTO_CITA = (
+    '<font size=10><b>INFORMACIÓN DE CONTACTO</b></font><br/>'
+    '📞 Teléfono: (02) 123-4567 | 📧 Email: info@hospital.com<br/>'
+    '🌐 Web: www.hospitalsistema.com | 📍 Dirección: Av. Principal 123<br/>'
+    '<font size=8 color="#9ca3af">─────────────────────────────────────────────</font><br/>'
+)
+
+
+@lru_cache(maxsize=256)
+def _parrafo_compilado(texto: str, estilo: ParagraphStyle) -> Paragraph:
+    return Paragraph(texto, estilo)
+
+
+def parrafo_fijo(texto: str, estilo: ParagraphStyle) -> Paragraph:
+    """
+    Párrafo de texto constante (etiquetas, notas, títulos). El marcado se
+    analiza una sola vez; cada documento recibe una copia propia porque la
+    maquetación guarda ancho y líneas en el objeto.
+    """
+    return copy.copy(_parrafo_compilado(texto, estilo))
@@ -0,0 +1,54 @@
+"""
+Generación de códigos QR en PNG con caché en memoria.
+
+El contenido de un QR depende solo de sus datos, así que el PNG resultante se
+reutiliza entre el endpoint de QR de citas y el comprobante PDF (cada proceso
+del pool de PDFs mantiene su propia caché). qrcode (y PIL) se importan al
+generar el primer QR, no al importar el módulo.
+"""
+import hashlib
+from functools import lru_cache
+from io import BytesIO
+
+# Niveles de corrección de errores, con los mismos valores que qrcode.constants
+ERROR_CORRECT_L = 1
+ERROR_CORRECT_M = 0
+
+# Cada PNG pesa ~1-2 KB: 512 entradas son alrededor de 1 MB por proceso
+MAX_QR_CACHEADOS = 512
+
+
+@lru_cache(maxsize=MAX_QR_CACHEADOS)
+def generar_qr_png(datos: str, box_size: int = 10, border: int = 4,
+                   correccion: int = ERROR_CORRECT_M) -> bytes:
+    """PNG (bytes) del código QR de `datos`. No modificar el resultado: es compartido"""
+    import qrcode
+
+    qr = qrcode.QRCode(version=1, error_correction=correccion, box_size=box_size, border=border)
+    qr.add_data(datos)
+    qr.make(fit=True)
+    # qrcode requiere string o tupla, no objeto Color de ReportLab
+    imagen = qr.make_image(fill_color="black", back_color="white")
+
+    buffer = BytesIO()
+    imagen.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def etag_qr(datos: str) -> str:
+    """ETag estable para el QR de un contenido dado"""
+    return '"' + hashlib.sha256(datos.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def estadisticas_qr() -> dict:
+    """Caché de PNGs de este proceso (los procesos del pool de PDFs tienen la suya)"""
+    info = generar_qr_png.cache_info()
+    total = info.hits + info.misses
+    return {
+        "entradas": info.currsize,
+        "max_entradas": info.maxsize,
+        "aciertos": info.hits,
+        "fallos": info.misses,
+        "tasa_aciertos": round(info.hits / total, 4) if total else 0.0
+    }
+
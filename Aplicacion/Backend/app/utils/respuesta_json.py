@@ -0,0 +1,47 @@
+"""
+Respuestas JSON rápidas para listados grandes.
+
+En los listados (citas, pacientes, recetas, auditoría) la mayor parte del
+tiempo se iba en crear entidades ORM, validarlas con pydantic (from_orm) y
+recorrerlas con jsonable_encoder. Estos endpoints seleccionan solo las
+columnas necesarias, arman diccionarios planos y los serializan con orjson.
+El `response_model` del decorador se mantiene para la documentación OpenAPI.
+"""
+from decimal import Decimal
+from typing import Iterable, List
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _por_defecto(valor):
+    # Igual que jsonable_encoder: Decimal como número
+    if isinstance(valor, Decimal):
+        return float(valor)
+    raise TypeError(f"Tipo no serializable a JSON: {type(valor).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSONResponse serializada con orjson. Fechas en ISO 8601 y enums por su
+    valor, como jsonable_encoder; el contenido no se valida contra ningún schema.
+    """
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_por_defecto, option=orjson.OPT_NON_STR_KEYS)
+
+
+def columnas(modelo, campos: Iterable[str], prefijo: str = "") -> list:
+    """Columnas del modelo etiquetadas como `prefijo + campo`, para seleccionar sin cargar entidades"""
+    return [getattr(modelo, campo).label(prefijo + campo) for campo in campos]
+
+
+def subdict(fila, campos: Iterable[str], prefijo: str = "") -> dict:
+    """Diccionario {campo: valor} con las columnas `prefijo + campo` de una fila (su `_mapping`)"""
+    return {campo: fila[prefijo + campo] for campo in campos}
+
+
+def filas_a_dicts(filas) -> List[dict]:
+    """Filas de una consulta por columnas como diccionarios {etiqueta: valor}"""
+    return [dict(fila._mapping) for fila in filas]
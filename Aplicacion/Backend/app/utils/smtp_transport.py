@@ -0,0 +1,218 @@
+"""
+Transporte SMTP con un pool de conexiones persistentes.
+
+Abrir una conexión por mensaje (con STARTTLS y login en servidores externos)
+cuesta un handshake TLS por paciente durante los envíos masivos. El pool
+reutiliza conexiones ya autenticadas, verifica con NOOP las que estuvieron
+inactivas, las recicla tras un número de mensajes y reconecta una vez si el
+servidor cerró la sesión.
+
+Para probar localmente: python -m aiosmtpd -n -l localhost:1025
+"""
+import asyncio
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from email.message import Message
+from typing import List, Optional
+
+from app.core.config import settings
+
+# Errores tras los cuales la conexión ya no es utilizable
+_ERRORES_CONEXION = (smtplib.SMTPServerDisconnected, smtplib.SMTPHeloError, ConnectionError, TimeoutError)
+
+
+def _es_servidor_local(host: str) -> bool:
+    return host in ("localhost", "127.0.0.1")
+
+
+@dataclass
+class _Conexion:
+    smtp: smtplib.SMTP
+    creada: float = field(default_factory=time.monotonic)
+    ultimo_uso: float = field(default_factory=time.monotonic)
+    mensajes: int = 0
+
+
+class PoolSMTP:
+    """
+    Pool de conexiones SMTP seguro entre hilos. Como máximo `tamano`
+    conexiones abiertas a la vez; quien pide una con el pool agotado espera.
+    """
+
+    def __init__(self, host: str, puerto: int, usuario: Optional[str] = None,
+                 password: Optional[str] = None, tamano: int = 4,
+                 max_inactivo: float = 60, max_mensajes: int = 100):
+        self.host = host
+        self.puerto = puerto
+        self.usuario = usuario
+        self.password = password
+        self.max_inactivo = max_inactivo
+        self.max_mensajes = max_mensajes
+        self._libres: List[_Conexion] = []
+        self._lock = threading.Lock()
+        self._cupos = threading.BoundedSemaphore(tamano)
+        self._estadisticas = {"conexiones_abiertas": 0, "reutilizadas": 0, "reconexiones": 0, "enviados": 0}
+
+    def _conectar(self) -> _Conexion:
+        # Servidor local (localhost:1025) - sin TLS ni autenticación
+        if _es_servidor_local(self.host):
+            smtp = smtplib.SMTP(self.host, self.puerto, timeout=3)
+        # Servidor externo (Gmail, etc) - con TLS y autenticación
+        else:
+            smtp = smtplib.SMTP(self.host, self.puerto, timeout=10)
+            smtp.starttls()
+            if self.usuario and self.password:
+                smtp.login(self.usuario, self.password)
+        with self._lock:
+            self._estadisticas["conexiones_abiertas"] += 1
+        return _Conexion(smtp)
+
+    @staticmethod
+    def _cerrar(conexion: _Conexion):
+        try:
+            conexion.smtp.quit()
+        except Exception:
+            conexion.smtp.close()
+
+    def _esta_viva(self, conexion: _Conexion) -> bool:
+        """NOOP solo si estuvo inactiva: recién usada se asume válida"""
+        if time.monotonic() - conexion.ultimo_uso < self.max_inactivo:
+            return True
+        try:
+            return conexion.smtp.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _tomar_libre(self) -> Optional[_Conexion]:
+        while True:
+            with self._lock:
+                if not self._libres:
+                    return None
+                conexion = self._libres.pop()  # LIFO: la más reciente, con menos riesgo de timeout
+            if self._esta_viva(conexion):
+                return conexion
+            self._cerrar(conexion)
+
+    def _devolver(self, conexion: _Conexion):
+        conexion.ultimo_uso = time.monotonic()
+        if conexion.mensajes >= self.max_mensajes:
+            self._cerrar(conexion)
+            return
+        with self._lock:
+            self._libres.append(conexion)
+
+    @contextmanager
+    def conexion(self):
+        """Presta una conexión; si falla durante el uso se descarta en lugar de devolverse"""
+        self._cupos.acquire()
+        conexion = None
+        try:
+            conexion = self._tomar_libre()
+            if conexion is None:
+                conexion = self._conectar()
+            else:
+                with self._lock:
+                    self._estadisticas["reutilizadas"] += 1
+            yield conexion
+        except BaseException:
+            if conexion is not None:
+                self._cerrar(conexion)
+                conexion = None
+            raise
+        finally:
+            if conexion is not None:
+                self._devolver(conexion)
+            self._cupos.release()
+
+    def enviar(self, mensaje: Message):
+        """Envía un mensaje; si la conexión estaba caída reintenta una vez con una nueva"""
+        for intento in (1, 2):
+            try:
+                with self.conexion() as conexion:
+                    conexion.smtp.send_message(mensaje)
+                    conexion.mensajes += 1
+                with self._lock:
+                    self._estadisticas["enviados"] += 1
+                return
+            except _ERRORES_CONEXION:
+                if intento == 2:
+                    raise
+                with self._lock:
+                    self._estadisticas["reconexiones"] += 1
+
+    def enviar_varios(self, mensajes: List[Message]) -> int:
+        """
+        Envía varios mensajes por una misma conexión prestada (una nueva al
+        llegar a max_mensajes). Si la conexión se cae reintenta el mensaje una
+        vez con otra, como enviar(). Retorna cuántos se enviaron.
+        """
+        enviados = 0
+        reintento = False
+        while enviados < len(mensajes):
+            try:
+                with self.conexion() as conexion:
+                    while enviados < len(mensajes) and conexion.mensajes < self.max_mensajes:
+                        conexion.smtp.send_message(mensajes[enviados])
+                        conexion.mensajes += 1
+                        enviados += 1
+                        reintento = False
+                        with self._lock:
+                            self._estadisticas["enviados"] += 1
+            except _ERRORES_CONEXION:
+                if reintento:
+                    raise
+                reintento = True
+                with self._lock:
+                    self._estadisticas["reconexiones"] += 1
+        return enviados
+
+    async def enviar_async(self, mensaje: Message):
+        """
+        Variante para el event loop: el envío bloqueante corre en el executor
+        por defecto y el pool limita cuántos están en curso a la vez.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.enviar, mensaje)
+
+    def cerrar(self):
+        with self._lock:
+            libres, self._libres = self._libres, []
+        for conexion in libres:
+            self._cerrar(conexion)
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            return {**self._estadisticas, "libres": len(self._libres)}
+
+
+_pool: Optional[PoolSMTP] = None
+_pool_lock = threading.Lock()
+
+
+def obtener_pool_smtp() -> PoolSMTP:
+    """Pool compartido del proceso, configurado desde settings"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = PoolSMTP(
+                settings.SMTP_HOST,
+                settings.SMTP_PORT,
+                settings.SMTP_USER,
+                settings.SMTP_PASSWORD,
+                tamano=settings.SMTP_POOL_SIZE,
+                max_inactivo=settings.SMTP_POOL_MAX_INACTIVO,
+                max_mensajes=settings.SMTP_MAX_MENSAJES_CONEXION
+            )
+        return _pool
+
+
+def cerrar_pool_smtp():
+    """Cierra las conexiones abiertas (apagado de la aplicación)"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.cerrar()
@@ -2,8 +2,12 @@
 Utilidades de validación para el sistema
 RF-001: Validación de cédula ecuatoriana y otras validaciones
 """
-from datetime import date, timedelta
-from typing import Tuple
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+
+
+# Tabla precalculada de coeficiente 2 (con la resta de 9) para el dígito verificador
+_DOBLE_MODULO_10 = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
 
 
 def validar_cedula_ecuatoriana(cedula: str) -> Tuple[bool, str]:
@@ -30,37 +34,43 @@ def validar_cedula_ecuatoriana(cedula: str) -> Tuple[bool, str]:
     if not cedula_str.isdigit():
         return False, "La cédula debe contener solo números"
     
+    d = [int(ch) for ch in cedula_str]
+    
     # Verificar código de provincia (01-24)
-    provincia = int(cedula_str[0:2])
+    provincia = d[0] * 10 + d[1]
     if provincia < 1 or provincia > 24:
         return False, "Código de provincia inválido (debe ser 01-24)"
     
     # Verificar tercer dígito (debe ser menor a 6 para personas naturales)
-    tercer_digito = int(cedula_str[2])
-    if tercer_digito > 5:
+    if d[2] > 5:
         return False, "Tercer dígito inválido (debe ser 0-5 para personas naturales)"
     
-    # Algoritmo de validación del dígito verificador
-    coeficientes = [2, 1, 2, 1, 2, 1, 2, 1, 2]
-    suma = 0
-    
-    for i in range(9):
-        valor = int(cedula_str[i]) * coeficientes[i]
-        if valor > 9:
-            valor -= 9
-        suma += valor
-    
-    # Calcular dígito verificador esperado
+    # Dígito verificador: coeficientes 2,1,2,1,... (los productos mayores a 9 restan 9)
+    suma = (
+        _DOBLE_MODULO_10[d[0]] + d[1] + _DOBLE_MODULO_10[d[2]] + d[3] +
+        _DOBLE_MODULO_10[d[4]] + d[5] + _DOBLE_MODULO_10[d[6]] + d[7] +
+        _DOBLE_MODULO_10[d[8]]
+    )
     residuo = suma % 10
     digito_verificador_esperado = 0 if residuo == 0 else 10 - residuo
-    digito_verificador_recibido = int(cedula_str[9])
     
-    if digito_verificador_esperado != digito_verificador_recibido:
+    if digito_verificador_esperado != d[9]:
         return False, "Dígito verificador inválido"
     
     return True, "Cédula válida"
 
 
+def validar_cedulas_ecuatorianas(cedulas: List[str]) -> List[Tuple[bool, str]]:
+    """
+    Versión por lotes de validar_cedula_ecuatoriana para importaciones
+    masivas (mismas reglas y mensajes: es la misma función por cada cédula).
+    
+    Returns:
+        List[Tuple[bool, str]]: (es_valida, mensaje) en el mismo orden de entrada
+    """
+    return [validar_cedula_ecuatoriana(cedula) for cedula in cedulas]
+
+
 def validar_vigencia_poliza(fecha_vigencia: date) -> Tuple[str, str]:
     """
     Valida el estado de vigencia de una póliza médica
@@ -85,17 +95,18 @@ def validar_vigencia_poliza(fecha_vigencia: date) -> Tuple[str, str]:
         return 'vigente', f'La póliza es válida por {dias_diferencia} días más'
 
 
-def generar_numero_historia_clinica(ultimo_numero: int = 0) -> str:
+def generar_numero_historia_clinica(ultimo_numero: int = 0, fecha: date = None) -> str:
     """
     Genera un número único de historia clínica con formato: HCL-YYYYMMDD-NNNN
     
     Args:
-        ultimo_numero: Último número secuencial usado en el día actual
+        ultimo_numero: Último número secuencial usado en el día
+        fecha: Día del número (por defecto, hoy)
     
     Returns:
         str: Número de historia clínica formateado
     """
-    hoy = date.today()
+    hoy = fecha or date.today()
     fecha_str = hoy.strftime("%Y%m%d")
     numero_secuencial = str(ultimo_numero + 1).zfill(4)
     
@@ -134,3 +145,26 @@ def validar_edad_coherente(fecha_nacimiento: date) -> Tuple[bool, str]:
         return False, f"Edad calculada ({edad} años) fuera de rango válido"
     
     return True, ""
+
+
+def edad_en_anios(fecha_nacimiento) -> Optional[int]:
+    """Edad en años cumplidos (None sin fecha de nacimiento)"""
+    if not fecha_nacimiento:
+        return None
+    
+    hoy = datetime.now().date()
+    if isinstance(fecha_nacimiento, datetime):
+        fecha_nacimiento = fecha_nacimiento.date()
+    
+    edad = hoy.year - fecha_nacimiento.year
+    if hoy.month < fecha_nacimiento.month or (hoy.month == fecha_nacimiento.month and hoy.day < fecha_nacimiento.day):
+        edad -= 1
+    return edad
+
+
+def calcular_edad(fecha_nacimiento):
+    """Calcula la edad a partir de la fecha de nacimiento"""
+    edad = edad_en_anios(fecha_nacimiento)
+    if edad is None:
+        return "N/A"
+    return f"{edad} años"
@@ -0,0 +1,49 @@
+"""
+Escritura de archivos ZIP en streaming: cada entrada se entrega al cliente en
+cuanto se agrega, sin armar el archivo completo en memoria ni en disco.
+"""
+import zipfile
+from datetime import datetime
+from typing import AsyncIterator, Tuple
+
+
+class _SalidaNoBuscable:
+    """
+    Destino de escritura sin seek ni tell: zipfile detecta que no es buscable
+    y escribe los tamaños en descriptores de datos tras cada entrada.
+    """
+
+    def __init__(self):
+        self._partes = []
+
+    def write(self, datos: bytes) -> int:
+        self._partes.append(bytes(datos))
+        return len(datos)
+
+    def flush(self):
+        pass
+
+    def vaciar(self) -> bytes:
+        datos = b"".join(self._partes)
+        self._partes.clear()
+        return datos
+
+
+async def zip_en_streaming(entradas: AsyncIterator[Tuple[str, bytes]]) -> AsyncIterator[bytes]:
+    """
+    Recibe (nombre_archivo, contenido) a medida que están listos y produce los
+    bloques del ZIP. La memoria usada es la de una entrada a la vez.
+
+    Las entradas se guardan sin compresión (ZIP_STORED): los PDFs ya vienen
+    comprimidos y deflate solo agregaría CPU.
+    """
+    salida = _SalidaNoBuscable()
+    archivo = zipfile.ZipFile(salida, mode="w", compression=zipfile.ZIP_STORED)
+    try:
+        async for nombre, contenido in entradas:
+            info = zipfile.ZipInfo(nombre, date_time=datetime.now().timetuple()[:6])
+            archivo.writestr(info, contenido)
+            yield salida.vaciar()
+    finally:
+        archivo.close()
+    yield salida.vaciar()
@@ -0,0 +1,362 @@
+"""
+Pruebas de carga con escenarios de uso del hospital (cliente ASGI en proceso).
+
+Escenarios (cada uno con --usuarios usuarios virtuales durante --duracion s):
+
+  reservas     recepción en hora pico: disponibilidad de médicos, búsqueda
+               de paciente, crear cita (400 si el bloque ya está tomado) y
+               agenda del día
+  farmacia     recetas pendientes, validar la prescripción, lotes
+               disponibles y dispensar
+  expediente   médico que busca por cédula y revisa expediente y paciente
+  dashboard    el Dashboard del frontend: listados completos de pacientes,
+               citas, médicos, medicamentos, recetas y resumen de stock
+
+Por endpoint informa solicitudes por segundo y latencia p50/p95/p99. Con
+--salida guarda el resultado en JSON; con --comparar muestra la variación
+de p95 respecto de una corrida anterior y termina con código 1 si algún
+endpoint empeoró más que --tolerancia.
+
+Requiere una base con datos de benchmarks.hospital_sintetico (--generar la
+crea si está vacía). Las solicitudes pasan por toda la app (autenticación,
+middlewares, base de datos). Durante la medición los loggers de la app
+(gestion_medica y los niveles por módulo de LOG_NIVELES) se suben por encima
+de CRITICAL y lo que quede de print se descarta: el informe no se mezcla con
+los logs y la cola de logging no agrega trabajo a la medición.
+
+Uso (desde Aplicacion/Backend, con las variables de entorno de la app):
+    export DB_URL=sqlite:////tmp/hospital.db DB_ASYNC_URL=sqlite+aiosqlite:////tmp/hospital.db
+    python -m benchmarks.carga_benchmark --generar --usuarios 8 --duracion 20 --salida base.json
+    python -m benchmarks.carga_benchmark --comparar base.json
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+import httpx
+from sqlalchemy import func, select
+
+from app.core import database
+from app.core.security import create_access_token
+from app.main import app
+from app.utils.logger import RAIZ
+from app.models.empleado import Empleado
+from app.models.medicamento import Medicamento
+from app.models.medico import Medico
+from app.models.paciente import Paciente
+from app.models.receta import Receta
+from benchmarks.login_benchmark import percentil
+
+ESCENARIOS = ("reservas", "farmacia", "expediente", "dashboard")
+
+
+@contextlib.contextmanager
+def app_en_silencio():
+    """
+    Sube los loggers de la app por encima de CRITICAL y descarta stdout. El
+    QueueListener escribe en el sys.stdout que capturó al configurarse, así
+    que redirect_stdout no alcanza a los logs.
+    """
+    loggers = [logging.getLogger(RAIZ)] + [
+        registrado for nombre, registrado in logging.Logger.manager.loggerDict.items()
+        if nombre.startswith(RAIZ + ".") and isinstance(registrado, logging.Logger)
+        and registrado.level != logging.NOTSET
+    ]
+    niveles = [registrado.level for registrado in loggers]
+    for registrado in loggers:
+        registrado.setLevel(logging.CRITICAL + 1)
+    try:
+        with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+            yield
+    finally:
+        for registrado, nivel in zip(loggers, niveles):
+            registrado.setLevel(nivel)
+
+
+class Registro:
+    """Latencias y códigos por endpoint (la plantilla de ruta, no la URL)"""
+
+    def __init__(self):
+        self.latencias = defaultdict(list)
+        self.codigos = defaultdict(lambda: defaultdict(int))
+        self.primer_error = {}
+
+    def agregar(self, endpoint: str, segundos: float, codigo: int, error: str = None):
+        self.latencias[endpoint].append(segundos * 1000)
+        self.codigos[endpoint][codigo] += 1
+        if error and endpoint not in self.primer_error:
+            self.primer_error[endpoint] = error[:300]
+
+    def resumen(self, duracion: float) -> dict:
+        resultado = {}
+        for endpoint, latencias in self.latencias.items():
+            codigos = self.codigos[endpoint]
+            resultado[endpoint] = {
+                "solicitudes": len(latencias),
+                "por_segundo": round(len(latencias) / duracion, 2),
+                "p50_ms": round(percentil(latencias, 0.50), 2),
+                "p95_ms": round(percentil(latencias, 0.95), 2),
+                "p99_ms": round(percentil(latencias, 0.99), 2),
+                "max_ms": round(max(latencias), 2),
+                "rechazadas": sum(n for c, n in codigos.items() if 400 <= c < 500),
+                "errores": sum(n for c, n in codigos.items() if c >= 500),
+            }
+            if endpoint in self.primer_error:
+                resultado[endpoint]["primer_error"] = self.primer_error[endpoint]
+        return resultado
+
+
+class Usuario:
+    """Cliente autenticado que registra cada solicitud con el nombre de su endpoint"""
+
+    def __init__(self, cliente: httpx.AsyncClient, token: str, registro: Registro, azar: random.Random):
+        self.cliente = cliente
+        self.cabeceras = {"Authorization": f"Bearer {token}", "Accept-Encoding": "gzip"}
+        self.registro = registro
+        self.azar = azar
+
+    async def pedir(self, metodo: str, endpoint: str, url: str, **kwargs) -> httpx.Response:
+        inicio = time.perf_counter()
+        error = None
+        try:
+            respuesta = await self.cliente.request(metodo, url, headers=self.cabeceras, **kwargs)
+            codigo = respuesta.status_code
+            if codigo >= 500:
+                error = respuesta.text
+        except Exception as e:
+            # Excepción no manejada en la app (ASGITransport la propaga)
+            respuesta, codigo, error = None, 599, f"{type(e).__name__}: {e}"
+        self.registro.agregar(f"{metodo} {endpoint}", time.perf_counter() - inicio, codigo, error)
+        return respuesta
+
+
+def _datos(respuesta):
+    return respuesta.json() if respuesta is not None and respuesta.status_code == 200 else None
+
+
+async def reservas(u: Usuario, ctx: dict):
+    dia = date.today() + timedelta(days=u.azar.randint(1, 14))
+    while dia.weekday() >= 5:
+        dia += timedelta(days=1)
+    medico = u.azar.choice(ctx["medicos"])
+    await u.pedir("GET", "/citas/disponibilidad/medicos", "/citas/disponibilidad/medicos",
+                  params={"fecha": dia.isoformat(), "especialidad": medico["especialidad"]})
+    paciente = u.azar.choice(ctx["pacientes"])
+    await u.pedir("GET", "/pacientes/buscar/search", "/pacientes/buscar/search",
+                  params={"q": str(paciente["cedula"])[:8]})
+    inicio = datetime.combine(dia, datetime.min.time()) + timedelta(hours=8, minutes=30 * u.azar.randrange(16))
+    await u.pedir("POST", "/citas/", "/citas/", json={
+        "fecha": inicio.isoformat(), "hora_inicio": f"{inicio:%H:%M}",
+        "hora_fin": f"{inicio + timedelta(minutes=30):%H:%M}", "motivo": "Control (benchmark)",
+        "paciente_id": paciente["id"], "medico_id": medico["id"],
+    })
+    await u.pedir("GET", "/citas/fecha/{fecha}", f"/citas/fecha/{dia.isoformat()}",
+                  params={"medico_id": medico["id"]})
+
+
+async def farmacia(u: Usuario, ctx: dict):
+    pendientes = _datos(await u.pedir("GET", "/recetas/?estado=pendiente", "/recetas/",
+                                      params={"estado": "pendiente"})) or []
+    # Cada usuario toma una receta distinta: la dispensa y deja de estar pendiente
+    tomadas = ctx["recetas_tomadas"]
+    disponibles = [r for r in pendientes if r["id"] not in tomadas]
+    if not disponibles:
+        return
+    receta = u.azar.choice(disponibles)
+    tomadas.add(receta["id"])
+    await u.pedir("GET", "/recetas/{receta_id}", f"/recetas/{receta['id']}")
+    prescritos = u.azar.sample(ctx["medicamentos"], 2)
+    await u.pedir("POST", "/recetas/validar-prescripcion", "/recetas/validar-prescripcion", json={
+        "paciente_id": receta["paciente_id"],
+        "medicamentos": [{"medicamento_id": m, "cantidad": 10, "dosis": "1 tableta"} for m in prescritos],
+    })
+    lotes = _datos(await u.pedir("GET", "/lotes/medicamento/{medicamento_id}/disponibles",
+                                 f"/lotes/medicamento/{prescritos[0]}/disponibles")) or []
+    await u.pedir("POST", "/recetas/{receta_id}/dispensar", f"/recetas/{receta['id']}/dispensar", json={
+        "estado": "dispensada", "lote": lotes[0]["numero_lote"] if lotes else None,
+        "observaciones": "Dispensada (benchmark)",
+    })
+
+
+async def expediente(u: Usuario, ctx: dict):
+    paciente = u.azar.choice(ctx["pacientes"])
+    await u.pedir("GET", "/historias/expediente/buscar", "/historias/expediente/buscar",
+                  params={"query": str(paciente["cedula"])})
+    await u.pedir("GET", "/historias/expediente/paciente/{paciente_id}",
+                  f"/historias/expediente/paciente/{paciente['id']}")
+    await u.pedir("GET", "/pacientes/{paciente_id}", f"/pacientes/{paciente['id']}")
+
+
+async def dashboard(u: Usuario, ctx: dict):
+    # Mismo orden que Dashboard.jsx (secuencial, como el frontend)
+    for ruta in ("/pacientes/", "/citas/", "/medicos/", "/medicamentos/", "/recetas/", "/notificaciones/stock/resumen"):
+        await u.pedir("GET", ruta, ruta)
+
+
+# Escenario -> (función, cargo del usuario)
+FUNCIONES = {
+    "reservas": (reservas, "Administrador"),
+    "farmacia": (farmacia, "Farmaceutico"),
+    "expediente": (expediente, "Medico"),
+    "dashboard": (dashboard, "Administrador"),
+}
+
+
+def cargar_contexto(semilla: int) -> dict:
+    """Tokens por cargo y una muestra de ids para los escenarios"""
+    azar = random.Random(semilla)
+    db = database.SessionLocal()
+    try:
+        if not db.execute(select(func.count(Paciente.id))).scalar():
+            raise SystemExit("La base no tiene pacientes: use --generar o python -m benchmarks.hospital_sintetico")
+        tokens = {}
+        for cargo in {cargo for _, cargo in FUNCIONES.values()}:
+            empleado_id = db.execute(
+                select(Empleado.id).where(Empleado.cargo == cargo, Empleado.activo.is_(True)).order_by(Empleado.id)
+            ).scalar()
+            tokens[cargo] = create_access_token({"sub": str(empleado_id), "cargo": cargo})
+        pacientes = [dict(f._mapping) for f in db.execute(select(Paciente.id, Paciente.cedula)).all()]
+        return {
+            "tokens": tokens,
+            "pacientes": azar.sample(pacientes, min(len(pacientes), 2000)),
+            "medicos": [dict(f._mapping) for f in db.execute(select(Medico.id, Medico.especialidad)).all()],
+            "medicamentos": [m for (m,) in db.execute(select(Medicamento.id)).all()],
+            "recetas_pendientes": db.execute(
+                select(func.count(Receta.id)).where(Receta.estado == "pendiente")
+            ).scalar(),
+            "recetas_tomadas": set(),
+        }
+    finally:
+        db.close()
+
+
+async def ejecutar_escenario(nombre: str, ctx: dict, usuarios: int, duracion: float, pausa: float,
+                             semilla: int) -> dict:
+    funcion, cargo = FUNCIONES[nombre]
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench", timeout=None) as cliente:
+        # Calentamiento (cachés, pools, primer uso del engine async): no se mide
+        await funcion(Usuario(cliente, ctx["tokens"][cargo], Registro(), random.Random(semilla)), ctx)
+
+        registro = Registro()
+        fin = time.perf_counter() + duracion
+
+        async def usuario_virtual(n: int):
+            u = Usuario(cliente, ctx["tokens"][cargo], registro, random.Random(semilla * 1000 + n))
+            while time.perf_counter() < fin:
+                await funcion(u, ctx)
+                if pausa:
+                    await asyncio.sleep(pausa)
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*[usuario_virtual(n) for n in range(usuarios)])
+        transcurrido = time.perf_counter() - inicio
+    return {"duracion_s": round(transcurrido, 2), "endpoints": registro.resumen(transcurrido)}
+
+
+def imprimir(nombre: str, resultado: dict, anterior: dict = None) -> bool:
+    """Tabla del escenario; True si algún endpoint empeoró más que la tolerancia"""
+    print(f"\n== {nombre} ({resultado['duracion_s']} s)")
+    print(f"{'endpoint':<52} {'n':>6} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'4xx':>5} {'5xx':>5}"
+          + (f" {'p95 vs base':>12}" if anterior is not None else ""))
+    regresion = False
+    for endpoint, r in sorted(resultado["endpoints"].items()):
+        linea = (f"{endpoint:<52} {r['solicitudes']:>6} {r['por_segundo']:>8.1f} {r['p50_ms']:>6.1f}ms "
+                 f"{r['p95_ms']:>6.1f}ms {r['p99_ms']:>6.1f}ms {r['rechazadas']:>5} {r['errores']:>5}")
+        base = (anterior or {}).get("endpoints", {}).get(endpoint)
+        if base:
+            cambio = (r["p95_ms"] - base["p95_ms"]) / base["p95_ms"] if base["p95_ms"] else 0
+            marca = " !" if cambio > anterior["tolerancia"] else ""
+            regresion = regresion or bool(marca)
+            linea += f" {cambio:+11.0%}{marca}"
+        print(linea)
+    for endpoint, r in sorted(resultado["endpoints"].items()):
+        if "primer_error" in r:
+            print(f"  5xx en {endpoint}: {r['primer_error']}")
+    return regresion
+
+
+async def ejecutar(args) -> bool:
+    ctx = cargar_contexto(args.semilla)
+    base = None
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        if (base["usuarios"], base["duracion_s"]) != (args.usuarios, args.duracion):
+            print(f"⚠️ La base usó {base['usuarios']} usuarios y {base['duracion_s']} s: la comparación no es directa")
+
+    print(f"{len(ctx['pacientes'])} pacientes de muestra, {len(ctx['medicos'])} médicos, "
+          f"{ctx['recetas_pendientes']} recetas pendientes | {args.usuarios} usuarios, {args.duracion} s por escenario")
+    resultados, regresion = {}, False
+    try:
+        for nombre in args.escenarios:
+            # La app registra auditoría, emails simulados y avisos: no mezclarlos con el informe
+            with app_en_silencio():
+                resultados[nombre] = await ejecutar_escenario(
+                    nombre, ctx, args.usuarios, args.duracion, args.pausa_ms / 1000, args.semilla
+                )
+            anterior = None
+            if base and nombre in base["escenarios"]:
+                anterior = {**base["escenarios"][nombre], "tolerancia": args.tolerancia}
+            regresion = imprimir(nombre, resultados[nombre], anterior) or regresion
+    finally:
+        await database.cerrar_async_engine()
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump({
+                "fecha": datetime.now().isoformat(timespec="seconds"),
+                "usuarios": args.usuarios, "duracion_s": args.duracion, "escenarios": resultados,
+            }, archivo, indent=2, ensure_ascii=False)
+        print(f"\nResultado guardado en {args.salida}")
+    return regresion
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pruebas de carga por escenarios")
+    parser.add_argument("--escenarios", type=lambda v: v.split(","), default=list(ESCENARIOS),
+                        help=f"Separados por coma: {','.join(ESCENARIOS)}")
+    parser.add_argument("--usuarios", type=int, default=8, help="Usuarios virtuales concurrentes por escenario")
+    parser.add_argument("--duracion", type=float, default=20, help="Segundos por escenario")
+    parser.add_argument("--pausa-ms", type=float, default=0, help="Pausa de cada usuario entre iteraciones")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--generar", action="store_true", help="Generar el hospital sintético si la base está vacía")
+    parser.add_argument("--salida", help="Guardar el resultado en este archivo JSON")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior para comparar p95")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Aumento de p95 tolerado (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    desconocidos = set(args.escenarios) - set(ESCENARIOS)
+    if desconocidos:
+        parser.error(f"Escenarios desconocidos: {', '.join(sorted(desconocidos))}")
+    # Una línea de log por solicitud distorsionaría la medición
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    # Sin el evento startup (ASGITransport no lo ejecuta) los modelos no están todos registrados
+    database.importar_modelos()
+
+    if args.generar:
+        from benchmarks.hospital_sintetico import generar
+        db = database.SessionLocal()
+        try:
+            vacia = not db.execute(select(func.count(Paciente.id))).scalar()
+        except Exception:
+            vacia = True  # base sin migrar
+        finally:
+            db.close()
+        if vacia:
+            print("Generando hospital sintético...")
+            print(json.dumps(generar(semilla=args.semilla)))
+
+    sys.exit(1 if asyncio.run(ejecutar(args)) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Benchmark de compresión de respuestas: bytes y tiempo ahorrados.
+
+Sirve respuestas con la forma de los endpoints reales (listado de citas y
+pacientes, medicamentos, expediente completo, un listado en streaming y un
+PDF, que debe quedar sin comprimir) detrás de CompresionMiddleware y mide:
+
+  - bytes enviados sin compresión, con gzip y con br (si está instalado brotli)
+  - tiempo en el servidor (mediana de --repeticiones), que incluye comprimir
+  - tiempo estimado total en un enlace de --kbps (consultorio remoto)
+
+No usa la base de datos: los datos son sintéticos y deterministas.
+
+Uso (desde Aplicacion/Backend, con las variables de entorno de la app):
+    python -m benchmarks.compresion_benchmark --filas 2000 --kbps 1024
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+
+from app.core.compresion import BROTLI_DISPONIBLE, CompresionMiddleware
+from app.core.config import settings
+from app.utils.respuesta_json import ORJSONResponse
+
+NOMBRES = ["María", "José", "Luis", "Ana", "Carlos", "Gabriela", "Andrés", "Sofía", "Diego", "Valeria"]
+APELLIDOS = ["Andrade", "Mena", "Quishpe", "Vera", "Torres", "Guamán", "Paredes", "Cevallos", "Salazar"]
+MOTIVOS = ["Control de presión arterial", "Dolor abdominal", "Chequeo anual", "Seguimiento de diabetes"]
+
+
+def _paciente(azar: random.Random, i: int) -> dict:
+    nacimiento = date(1950, 1, 1) + timedelta(days=azar.randint(0, 25000))
+    return {
+        "nombre": azar.choice(NOMBRES), "apellido": azar.choice(APELLIDOS), "cedula": 1700000000 + i,
+        "email": f"paciente{i}@example.com", "telefono": f"09{azar.randint(10000000, 99999999)}",
+        "direccion": "Av. Amazonas N34-120 y Av. República, Quito", "fecha_nacimiento": nacimiento,
+        "genero": azar.choice(["Masculino", "Femenino"]), "grupo_sanguineo": "O+",
+        "alergias": azar.choice([None, "Penicilina", "Ninguna conocida"]), "antecedentes_medicos": None,
+        "contacto_emergencia_nombre": None, "contacto_emergencia_telefono": None,
+        "contacto_emergencia_relacion": None, "tipo_seguro": "IESS", "aseguradora": None,
+        "numero_poliza": None, "fecha_vigencia_poliza": None, "id": i, "historia_id": i,
+        "edad": (date.today() - nacimiento).days // 365, "numero_historia_clinica": f"HC-20250310-{i:04d}",
+        "estado_poliza": "sin_informacion",
+    }
+
+
+def datos_sinteticos(filas: int) -> dict:
+    azar = random.Random(42)
+    pacientes = [_paciente(azar, i) for i in range(1, filas + 1)]
+    medico = {"nombre": "Carlos", "apellido": "Mena", "cedula": 1712345678, "especialidad": "Medicina Interna",
+              "email": "carlos.mena@example.com", "id": 1, "empleado_id": 3}
+    citas = []
+    for i, paciente in enumerate(pacientes, start=1):
+        citas.append({
+            "fecha": datetime(2025, 3, 10, 8) + timedelta(minutes=30 * i), "hora_inicio": "09:00",
+            "hora_fin": "09:30", "motivo": azar.choice(MOTIVOS), "estado": "programada",
+            "sala_asignada": f"Consultorio {azar.randint(1, 12)}", "tipo_cita": "consulta", "id": i,
+            "paciente_id": paciente["id"], "medico_id": 1, "encargado_id": None, "observaciones_cancelacion": None,
+            "paciente_nombre": paciente["nombre"], "paciente_apellido": paciente["apellido"],
+            "paciente_cedula": str(paciente["cedula"]), "paciente_edad": paciente["edad"],
+            "paciente_genero": paciente["genero"], "paciente_telefono": paciente["telefono"],
+            "medico_nombre": "Carlos", "medico_apellido": "Mena", "medico_especialidad": "Medicina Interna",
+            "paciente": paciente, "medico": medico,
+        })
+    medicamentos = [
+        {"nombre": f"Medicamento {i} {azar.choice(['tabletas', 'jarabe', 'cápsulas'])}", "stock": azar.randint(0, 500),
+         "contenido": f"{azar.choice([250, 500, 1000])}mg", "id": i, "farmacia_id": 1}
+        for i in range(1, min(filas, 400) + 1)
+    ]
+    consultas = [
+        {"id": i, "fecha": datetime(2024, 1, 1) + timedelta(days=7 * i), "motivo": azar.choice(MOTIVOS),
+         "diagnostico": "J00 - Rinofaringitis aguda (resfriado común)",
+         "tratamiento": "Paracetamol 500 mg cada 8 horas por 3 días. Abundantes líquidos y reposo relativo.",
+         "observaciones": "Paciente refiere mejoría parcial. Se indica control en una semana si persisten síntomas.",
+         "signos_vitales": {"presion_arterial": "120/80", "frecuencia_cardiaca": 72, "temperatura": 36.8,
+                            "peso": 70.5, "talla": 1.68, "saturacion_oxigeno": 97}}
+        for i in range(1, 61)
+    ]
+    expediente = {"paciente": pacientes[0], "historia": {"id": 1, "identificador": "HC-20250310-0001"},
+                  "consultas": consultas, "recetas": [], "total_consultas": len(consultas), "total_recetas": 0}
+    return {"citas": citas, "pacientes": pacientes, "medicamentos": medicamentos, "expediente": expediente}
+
+
+def crear_app(datos: dict) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(
+        CompresionMiddleware,
+        minimo_bytes=settings.COMPRESION_MINIMO_BYTES,
+        nivel_gzip=settings.COMPRESION_NIVEL_GZIP,
+        nivel_brotli=settings.COMPRESION_NIVEL_BROTLI,
+    )
+
+    @app.get("/citas/")
+    def citas():
+        return ORJSONResponse(datos["citas"])
+
+    @app.get("/pacientes/")
+    def pacientes():
+        return ORJSONResponse(datos["pacientes"])
+
+    @app.get("/medicamentos/")
+    def medicamentos():
+        return ORJSONResponse(datos["medicamentos"])
+
+    @app.get("/historias/expediente/paciente/1")
+    def expediente():
+        return ORJSONResponse(datos["expediente"])
+
+    @app.get("/citas/streaming")
+    def citas_streaming():
+        cuerpo = ORJSONResponse(datos["citas"]).body
+        fragmentos = [cuerpo[i:i + 64 * 1024] for i in range(0, len(cuerpo), 64 * 1024)]
+        return StreamingResponse(iter(fragmentos), media_type="application/json")
+
+    @app.get("/recetas/1/pdf")
+    def receta_pdf():
+        return Response(content=datos["pdf"], media_type="application/pdf")
+
+    return app
+
+
+async def medir(cliente: httpx.AsyncClient, ruta: str, codificacion: str, repeticiones: int) -> dict:
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        respuesta = await cliente.get(ruta, headers={"Accept-Encoding": codificacion})
+        await respuesta.aread()
+        tiempos.append(time.perf_counter() - inicio)
+    return {
+        "bytes": respuesta.num_bytes_downloaded,
+        "codificacion": respuesta.headers.get("content-encoding", "-"),
+        "servidor_ms": statistics.median(tiempos) * 1000,
+    }
+
+
+async def ejecutar(filas: int, kbps: float, repeticiones: int):
+    from benchmarks.pdf_benchmark import MEDICO, PACIENTE, RECETA
+    from app.utils.pdf_generator import generar_receta_pdf
+
+    datos = datos_sinteticos(filas)
+    datos["pdf"] = generar_receta_pdf(RECETA, PACIENTE, MEDICO).getvalue()
+    codificaciones = ["identity", "gzip"] + (["br"] if BROTLI_DISPONIBLE else [])
+    bytes_por_ms = kbps * 1000 / 8 / 1000
+
+    print(f"{filas} filas, enlace de {kbps:.0f} kbps, mínimo {settings.COMPRESION_MINIMO_BYTES} B, "
+          f"gzip nivel {settings.COMPRESION_NIVEL_GZIP}, brotli {'sí' if BROTLI_DISPONIBLE else 'no instalado'}")
+    print(f"{'endpoint':<34} {'pedido':<9} {'enviado':<9} {'bytes':>10} {'ratio':>6} "
+          f"{'servidor':>9} {'en enlace':>10} {'ahorro':>9}")
+    transporte = httpx.ASGITransport(app=crear_app(datos))
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        for ruta in ["/citas/", "/pacientes/", "/medicamentos/", "/historias/expediente/paciente/1",
+                     "/citas/streaming", "/recetas/1/pdf"]:
+            base = None
+            for codificacion in codificaciones:
+                r = await medir(cliente, ruta, codificacion, repeticiones)
+                total_ms = r["servidor_ms"] + r["bytes"] / bytes_por_ms
+                if base is None:
+                    base = (r["bytes"], total_ms)
+                print(f"{ruta:<34} {codificacion:<9} {r['codificacion']:<9} {r['bytes']:>10,} "
+                      f"{base[0] / r['bytes']:5.1f}x {r['servidor_ms']:7.1f}ms {total_ms:8.0f}ms "
+                      f"{base[1] - total_ms:7.0f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de compresión de respuestas")
+    parser.add_argument("--filas", type=int, default=2000)
+    parser.add_argument("--kbps", type=float, default=1024, help="Ancho de banda del enlace del consultorio")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(ejecutar(args.filas, args.kbps, args.repeticiones))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""
+Generador de un hospital sintético para pruebas de carga.
+
+Crea médicos (con su empleado), enfermeras, farmacéuticos y recepcionistas,
+pacientes con historia clínica, farmacias, medicamentos con lotes, y
+--anios de actividad: citas en días hábiles (más un mes de agenda futura),
+consultas de las citas completadas, recetas (las recientes quedan
+pendientes de dispensar) y registros de auditoría.
+
+Los datos son deterministas para una misma --semilla y se insertan con
+executemany por bloques (Core, sin crear entidades ORM). Antes de insertar
+aplica las migraciones, igual que el arranque de la app.
+
+Usa la base de DB_URL: debe ser una base dedicada y vacía (se rechaza si ya
+tiene pacientes).
+
+Uso (desde Aplicacion/Backend, con las variables de entorno de la app):
+    DB_URL=sqlite:////tmp/hospital.db python -m benchmarks.hospital_sintetico --pacientes 5000
+"""
+import argparse
+import json
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app.core import migraciones
+from app.core.database import SessionLocal, engine
+from app.core.security import get_password_hash
+from app.models.auditoria import Auditoria
+from app.models.cita import Cita
+from app.models.consulta import Consulta
+from app.models.diagnostico_cie10 import DiagnosticoCIE10
+from app.models.empleado import Empleado, EstadoEmpleado
+from app.models.farmacia import Farmacia
+from app.models.historia import Historia
+from app.models.lote import Lote
+from app.models.medicamento import Medicamento
+from app.models.medico import Medico
+from app.models.paciente import Paciente
+from app.models.receta import Receta
+
+# Contraseña de todos los empleados generados
+PASSWORD = "Bench2025!"
+
+NOMBRES = ["María", "José", "Luis", "Ana", "Carlos", "Gabriela", "Andrés", "Sofía", "Diego", "Valeria",
+           "Jorge", "Camila", "Fernando", "Daniela", "Ricardo", "Paola", "Santiago", "Lucía"]
+APELLIDOS = ["Andrade", "Mena", "Quishpe", "Vera", "Torres", "Guamán", "Paredes", "Cevallos", "Salazar",
+             "Chávez", "Morales", "Herrera", "Castillo", "Ortiz", "Ramírez", "Villacís"]
+ESPECIALIDADES = ["Medicina General", "Medicina Interna", "Pediatría", "Cardiología", "Ginecología",
+                  "Traumatología", "Dermatología", "Neurología"]
+MOTIVOS = ["Control de presión arterial", "Dolor abdominal", "Chequeo anual", "Seguimiento de diabetes",
+           "Cefalea persistente", "Tos y fiebre", "Dolor lumbar", "Control prenatal"]
+DIAGNOSTICOS = [("I10", "Hipertensión esencial (primaria)"), ("E11", "Diabetes mellitus tipo 2"),
+                ("J00", "Rinofaringitis aguda (resfriado común)"), ("K29", "Gastritis y duodenitis"),
+                ("M54", "Dorsalgia"), ("R51", "Cefalea")]
+PRINCIPIOS = [("Paracetamol", "500mg", "Tableta", "Analgésico"), ("Ibuprofeno", "400mg", "Tableta", "Antiinflamatorio"),
+              ("Amoxicilina", "500mg", "Cápsula", "Antibiótico"), ("Losartán", "50mg", "Tableta", "Antihipertensivo"),
+              ("Metformina", "850mg", "Tableta", "Antidiabético"), ("Omeprazol", "20mg", "Cápsula", "Antiácido"),
+              ("Salbutamol", "100mcg", "Inhalador", "Broncodilatador"), ("Loratadina", "10mg", "Jarabe", "Antihistamínico")]
+GRUPOS_SANGUINEOS = ["O+", "O-", "A+", "A-", "B+", "AB+"]
+SEGUROS = [("IESS", None), ("Privado", "Salud S.A."), ("Privado", "BMI"), ("Público", None), (None, None)]
+
+BLOQUE = 5000
+
+
+def _persona(azar: random.Random) -> dict:
+    return {"nombre": azar.choice(NOMBRES), "apellido": f"{azar.choice(APELLIDOS)} {azar.choice(APELLIDOS)}"}
+
+
+def _nombre(fila: dict) -> str:
+    return f"{fila['nombre']} {fila['apellido']}"
+
+
+class _Insertador:
+    """Inserta filas por bloques con ids explícitos (para enlazar las claves foráneas)"""
+
+    def __init__(self, conexion):
+        self.conexion = conexion
+        self.conteos = {}
+
+    def siguiente_id(self, modelo) -> int:
+        return (self.conexion.execute(select(func.max(modelo.id))).scalar() or 0) + 1
+
+    def insertar(self, modelo, filas: list):
+        tabla = modelo.__table__
+        for inicio in range(0, len(filas), BLOQUE):
+            self.conexion.execute(tabla.insert(), filas[inicio:inicio + BLOQUE])
+        self.conteos[tabla.name] = self.conteos.get(tabla.name, 0) + len(filas)
+
+
+def _empleados(ins: _Insertador, azar: random.Random, cantidades: dict, hashed: str) -> dict:
+    """Empleados por cargo: {cargo: [fila, ...]}; los médicos también en la tabla medicos"""
+    siguiente = ins.siguiente_id(Empleado)
+    por_cargo, filas = {}, []
+    for cargo, cantidad in cantidades.items():
+        for _ in range(cantidad):
+            i = siguiente + len(filas)
+            fila = {
+                **_persona(azar), "id": i, "cedula": 1700000000 + i, "cargo": cargo,
+                "email": f"empleado{i}@bench.hospital.com", "telefono": f"09{azar.randint(10000000, 99999999)}",
+                "hashed_password": hashed, "estado": EstadoEmpleado.ACTIVO, "activo": True,
+            }
+            filas.append(fila)
+            por_cargo.setdefault(cargo, []).append(fila)
+    ins.insertar(Empleado, filas)
+
+    siguiente_medico = ins.siguiente_id(Medico)
+    medicos = []
+    for j, empleado in enumerate(por_cargo.get("Medico", [])):
+        medicos.append({
+            "id": siguiente_medico + j, "nombre": empleado["nombre"], "apellido": empleado["apellido"],
+            "cedula": empleado["cedula"], "especialidad": ESPECIALIDADES[j % len(ESPECIALIDADES)],
+            "email": empleado["email"], "empleado_id": empleado["id"], "activo": True,
+        })
+    ins.insertar(Medico, medicos)
+    por_cargo["medicos"] = medicos
+    return por_cargo
+
+
+def _pacientes(ins: _Insertador, azar: random.Random, cantidad: int, hoy: date) -> list:
+    siguiente_historia = ins.siguiente_id(Historia)
+    siguiente = ins.siguiente_id(Paciente)
+    historias, pacientes = [], []
+    for k in range(cantidad):
+        i = siguiente + k
+        historia_id = siguiente_historia + k
+        creada = datetime.combine(hoy, datetime.min.time()) - timedelta(days=azar.randint(0, 2000))
+        historias.append({
+            "id": historia_id, "identificador": f"HCL-{creada:%Y%m%d}-{historia_id:04d}",
+            "fecha_creacion": creada, "activo": True,
+        })
+        tipo_seguro, aseguradora = azar.choice(SEGUROS)
+        pacientes.append({
+            **_persona(azar), "id": i, "cedula": 1800000000 + i,
+            "email": f"paciente{i}@example.com" if azar.random() < 0.7 else None,
+            "telefono": f"09{azar.randint(10000000, 99999999)}",
+            "direccion": "Av. Amazonas N34-120 y Av. República, Quito",
+            "fecha_nacimiento": hoy - timedelta(days=azar.randint(365, 90 * 365)),
+            "genero": azar.choice(["Masculino", "Femenino"]), "grupo_sanguineo": azar.choice(GRUPOS_SANGUINEOS),
+            "alergias": azar.choice([None, None, None, "Penicilina", "Sulfas"]),
+            "tipo_seguro": tipo_seguro, "aseguradora": aseguradora,
+            "numero_poliza": f"POL-{i:08d}" if aseguradora else None,
+            "fecha_vigencia_poliza": hoy + timedelta(days=azar.randint(-90, 720)) if aseguradora else None,
+            "historia_id": historia_id, "activo": True,
+        })
+    ins.insertar(Historia, historias)
+    ins.insertar(Paciente, pacientes)
+    return pacientes
+
+
+def _farmacia(ins: _Insertador, azar: random.Random, medicamentos: int, farmaceuticos: list, hoy: date) -> list:
+    siguiente_farmacia = ins.siguiente_id(Farmacia)
+    farmacias = [
+        {"id": siguiente_farmacia + k, "nombre_farmacia": f"Farmacia {nombre}", "direccion": "Planta baja",
+         "telefono": "022345678", "farmaceutico_id": farmaceuticos[k % len(farmaceuticos)]["id"] if farmaceuticos else None,
+         "activo": True}
+        for k, nombre in enumerate(["Central", "Emergencias"])
+    ]
+    ins.insertar(Farmacia, farmacias)
+
+    siguiente = ins.siguiente_id(Medicamento)
+    siguiente_lote = ins.siguiente_id(Lote)
+    filas, lotes = [], []
+    for k in range(medicamentos):
+        i = siguiente + k
+        principio, concentracion, forma, categoria = PRINCIPIOS[k % len(PRINCIPIOS)]
+        cantidades = []
+        for n in range(3):
+            inicial = azar.randint(50, 500)
+            disponible = azar.randint(0, inicial)
+            vencimiento = hoy + timedelta(days=azar.randint(-60, 720))
+            cantidades.append(disponible)
+            lote = {
+                "id": siguiente_lote + len(lotes), "medicamento_id": i, "numero_lote": f"L{i:05d}-{n}",
+                "fecha_ingreso": hoy - timedelta(days=azar.randint(30, 400)), "fecha_vencimiento": vencimiento,
+                "cantidad_inicial": inicial, "cantidad_disponible": disponible,
+                "ubicacion_fisica": f"Estantería {chr(65 + k % 8)}, Nivel {n + 1}", "proveedor": "Distribuidora Andina",
+                "costo_unitario": round(azar.uniform(0.05, 12), 2), "activo": True,
+            }
+            lote["estado"] = Lote(fecha_vencimiento=vencimiento, cantidad_disponible=disponible).calcular_estado()
+            lotes.append(lote)
+        filas.append({
+            "id": i, "nombre": f"{principio} {concentracion} #{i}", "stock": sum(cantidades), "contenido": concentracion,
+            "codigo_interno": f"MED-{i:05d}", "principio_activo": principio, "nombre_comercial": f"{principio} Genérico",
+            "concentracion": concentracion, "forma_farmaceutica": forma, "categoria_terapeutica": categoria,
+            "dosis_recomendada": "1 cada 8 horas", "farmacia_id": farmacias[k % len(farmacias)]["id"], "activo": True,
+        })
+    ins.insertar(Medicamento, filas)
+    ins.insertar(Lote, lotes)
+    return filas
+
+
+def _actividad(ins: _Insertador, azar: random.Random, empleados: dict, pacientes: list, medicamentos: list,
+               diagnosticos: list, anios: float, citas_por_dia: int, ahora: datetime):
+    """Citas, consultas, recetas y auditoría, insertadas por mes para acotar la memoria"""
+    medicos = empleados["medicos"]
+    medico_empleado = {m["id"]: m for m in empleados["Medico"]}
+    recepcion = empleados.get("Administrador") or empleados["Medico"]
+    farmaceuticos = empleados.get("Farmaceutico") or recepcion
+    ids = {modelo: ins.siguiente_id(modelo) for modelo in (Cita, Consulta, Receta, Auditoria)}
+
+    dia = (ahora - timedelta(days=int(anios * 365))).date()
+    ultimo = (ahora + timedelta(days=30)).date()
+    while dia <= ultimo:
+        fin_mes = min(ultimo, (dia.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1))
+        citas, consultas, recetas, auditoria = [], [], [], []
+        while dia <= fin_mes:
+            if dia.weekday() < 5:
+                for medico in medicos:
+                    empleado_medico = medico_empleado[medico["empleado_id"]]
+                    for slot in azar.sample(range(16), min(citas_por_dia, 16)):
+                        inicio = datetime.combine(dia, datetime.min.time()) + timedelta(hours=8, minutes=30 * slot)
+                        paciente = azar.choice(pacientes)
+                        pasada = inicio < ahora
+                        estado = (azar.choices(["completada", "cancelada", "no_asistio"], [80, 10, 10])[0] if pasada
+                                  else azar.choice(["programada", "confirmada"]))
+                        encargado = azar.choice(recepcion)
+                        cita = {
+                            "id": ids[Cita], "fecha": inicio, "hora_inicio": f"{inicio:%H:%M}",
+                            "hora_fin": f"{inicio + timedelta(minutes=30):%H:%M}", "motivo": azar.choice(MOTIVOS),
+                            "estado": estado, "sala_asignada": f"Consultorio {medico['id'] % 12 + 1}",
+                            "tipo_cita": azar.choices(["consulta", "seguimiento", "emergencia"], [70, 25, 5])[0],
+                            "paciente_id": paciente["id"], "medico_id": medico["id"], "encargado_id": encargado["id"],
+                            "observaciones_cancelacion": "Paciente reprogramó" if estado == "cancelada" else None,
+                            "activo": True,
+                        }
+                        ids[Cita] += 1
+                        citas.append(cita)
+                        auditoria.append(_auditoria(ids, encargado, "CREAR", "Citas", "citas", cita["id"],
+                                                    f"Nueva cita creada para {_nombre(paciente)}", inicio - timedelta(days=7)))
+                        if estado != "completada":
+                            continue
+
+                        codigo, descripcion = azar.choice(diagnosticos)
+                        consulta = {
+                            "id": ids[Consulta], "cita_id": cita["id"], "historia_id": paciente["historia_id"],
+                            "paciente_id": paciente["id"], "medico_id": empleado_medico["id"],
+                            "signos_vitales": {
+                                "presion_arterial": f"{azar.randint(100, 150)}/{azar.randint(60, 95)}",
+                                "frecuencia_cardiaca": azar.randint(55, 110), "temperatura": round(azar.uniform(36, 38.5), 1),
+                                "peso": round(azar.uniform(8, 110), 1), "saturacion_oxigeno": azar.randint(90, 100),
+                            },
+                            "motivo_consulta": cita["motivo"], "enfermedad_actual": "Cuadro de tres días de evolución.",
+                            "examen_fisico": "Paciente consciente, orientado, hidratado.",
+                            "diagnostico": descripcion, "diagnostico_codigo": codigo,
+                            "tratamiento": "Tratamiento sintomático y control.", "indicaciones": "Abundantes líquidos.",
+                            "fecha_consulta": inicio + timedelta(minutes=5), "activo": True,
+                        }
+                        ids[Consulta] += 1
+                        consultas.append(consulta)
+                        if azar.random() >= 0.6:
+                            continue
+
+                        prescritos = azar.sample(medicamentos, min(len(medicamentos), azar.randint(1, 3)))
+                        # Las recetas de la última semana todavía esperan en farmacia
+                        pendiente = ahora - inicio < timedelta(days=7)
+                        farmaceutico = azar.choice(farmaceuticos)
+                        receta = {
+                            "id": ids[Receta], "consulta_id": consulta["id"], "medico_id": empleado_medico["id"],
+                            "paciente_id": paciente["id"], "fecha_emision": consulta["fecha_consulta"],
+                            "medicamentos": "\n\n".join(
+                                f"{n}. {m['nombre']}\n   Dosis: 1 {m['forma_farmaceutica'].lower()}\n"
+                                f"   Frecuencia: cada 8 horas\n   Duración: 5 días\n   Vía: oral"
+                                for n, m in enumerate(prescritos, start=1)
+                            ),
+                            "indicaciones": "Tomar después de las comidas.",
+                            "estado": "pendiente" if pendiente else azar.choices(["dispensada", "cancelada"], [95, 5])[0],
+                            "dispensada_por": None if pendiente else farmaceutico["id"],
+                            "fecha_dispensacion": None if pendiente else inicio + timedelta(hours=1),
+                            "activo": True,
+                        }
+                        ids[Receta] += 1
+                        recetas.append(receta)
+                        if receta["estado"] == "dispensada":
+                            auditoria.append(_auditoria(ids, farmaceutico, "DISPENSAR", "Recetas", "recetas", receta["id"],
+                                                        f"Receta #{receta['id']} dispensada", receta["fecha_dispensacion"]))
+            dia += timedelta(days=1)
+        ins.insertar(Cita, citas)
+        ins.insertar(Consulta, consultas)
+        ins.insertar(Receta, recetas)
+        ins.insertar(Auditoria, auditoria)
+
+
+def _auditoria(ids: dict, empleado: dict, accion: str, modulo: str, tabla: str, registro_id: int,
+               descripcion: str, momento: datetime) -> dict:
+    fila = {
+        "id": ids[Auditoria], "usuario_id": empleado["id"], "usuario_nombre": _nombre(empleado),
+        "usuario_cargo": empleado["cargo"], "accion": accion, "modulo": modulo, "descripcion": descripcion,
+        "tabla_afectada": tabla, "registro_id": registro_id, "ip_address": "10.0.0.15",
+        "user_agent": "Mozilla/5.0", "estado": "exitoso", "fecha_hora": momento, "activo": True,
+    }
+    ids[Auditoria] += 1
+    return fila
+
+
+def generar(medicos: int = 20, pacientes: int = 5000, anios: float = 1, citas_por_dia: int = 8,
+            medicamentos: int = 300, semilla: int = 42) -> dict:
+    """Genera el hospital en la base de DB_URL y retorna las filas insertadas por tabla"""
+    if not migraciones.esquema_actualizado() and not migraciones.migrar():
+        raise RuntimeError("No se pudo migrar la base de datos")
+
+    azar = random.Random(semilla)
+    ahora = datetime.now().replace(second=0, microsecond=0)
+    # Un solo hash para todos: con BCRYPT_ROUNDS reales, miles de hashes tardarían minutos
+    hashed = get_password_hash(PASSWORD)
+
+    with engine.begin() as conexion:
+        if conexion.execute(select(func.count()).select_from(Paciente.__table__)).scalar():
+            raise RuntimeError("La base ya tiene pacientes: use una base dedicada y vacía para el benchmark")
+        codigos = conexion.execute(
+            select(DiagnosticoCIE10.codigo, DiagnosticoCIE10.descripcion).limit(200)
+        ).all()
+        ins = _Insertador(conexion)
+        empleados = _empleados(ins, azar, {
+            "Medico": medicos, "Enfermera": max(1, medicos // 2), "Farmaceutico": max(1, medicos // 8),
+            "Administrador": max(1, medicos // 4),
+        }, hashed)
+        filas_pacientes = _pacientes(ins, azar, pacientes, ahora.date())
+        filas_medicamentos = _farmacia(ins, azar, medicamentos, empleados["Farmaceutico"], ahora.date())
+        _actividad(ins, azar, empleados, filas_pacientes, filas_medicamentos,
+                   [(codigo, descripcion[:255]) for codigo, descripcion in codigos] or DIAGNOSTICOS, anios, citas_por_dia, ahora)
+
+    # La carga por Core no pasa por el ORM: los ETag de catálogos deben cambiar igual
+    from app.services.version_catalogo_service import CATALOGOS, incrementar_versiones
+    db = SessionLocal()
+    try:
+        incrementar_versiones(db, CATALOGOS.values())
+        db.commit()
+    finally:
+        db.close()
+    return ins.conteos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera un hospital sintético para pruebas de carga")
+    parser.add_argument("--medicos", type=int, default=20)
+    parser.add_argument("--pacientes", type=int, default=5000)
+    parser.add_argument("--anios", type=float, default=1, help="Años de historial de citas")
+    parser.add_argument("--citas-por-dia", type=int, default=8, help="Citas por médico y día hábil (máx. 16)")
+    parser.add_argument("--medicamentos", type=int, default=300)
+    parser.add_argument("--semilla", type=int, default=42)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    conteos = generar(args.medicos, args.pacientes, args.anios, args.citas_por_dia, args.medicamentos, args.semilla)
+    duracion = time.perf_counter() - inicio
+    total = sum(conteos.values())
+    print(json.dumps(conteos, indent=2))
+    print(f"{total:,} filas en {duracion:.1f} s ({total / duracion:,.0f} filas/s) | contraseña: {PASSWORD}")
+
+
+if __name__ == "__main__":
+    main()
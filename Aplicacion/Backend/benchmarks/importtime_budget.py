@@ -0,0 +1,97 @@
+"""
+Presupuesto de tiempo de importación de app.main (arranque en frío del worker).
+
+Ejecuta `python -X importtime -c "import app.main"` en procesos nuevos, toma
+el mejor de --repeticiones y falla (código de salida 1) si:
+  - el tiempo acumulado de app.main supera --presupuesto-ms, o
+  - se cargó alguno de los módulos pesados que deben importarse solo al
+    usarse (ReportLab, PIL, qrcode, resend, scalar_fastapi).
+
+También informa la memoria residente máxima del proceso tras el import.
+
+Uso (desde Aplicacion/Backend, con las variables de entorno de la app):
+    python -m benchmarks.importtime_budget --presupuesto-ms 2500
+    python -m benchmarks.importtime_budget --top 15   # módulos más lentos
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+MODULOS_DIFERIDOS = ("reportlab", "PIL", "qrcode", "resend", "scalar_fastapi")
+
+_LINEA = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+_SCRIPT_MEMORIA = (
+    "import resource, app.main; "
+    "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+)
+
+
+def _entorno() -> dict:
+    entorno = dict(os.environ)
+    entorno["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), entorno.get("PYTHONPATH")]))
+    return entorno
+
+
+def perfilar() -> list:
+    """[(modulo, propio_us, acumulado_us, profundidad)] de un import en frío de app.main"""
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True, text=True, env=_entorno()
+    )
+    if resultado.returncode != 0:
+        sys.exit(f"No se pudo importar app.main:\n{resultado.stderr[-2000:]}")
+    modulos = []
+    for linea in resultado.stderr.splitlines():
+        coincidencia = _LINEA.match(linea)
+        if coincidencia:
+            propio, acumulado, sangria, modulo = coincidencia.groups()
+            modulos.append((modulo, int(propio), int(acumulado), len(sangria) // 2))
+    return modulos
+
+
+def memoria_kb() -> int:
+    resultado = subprocess.run(
+        [sys.executable, "-c", _SCRIPT_MEMORIA], capture_output=True, text=True, env=_entorno()
+    )
+    return int(resultado.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Presupuesto de importación de app.main")
+    parser.add_argument("--presupuesto-ms", type=float, default=2500)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="Módulos de primer nivel más lentos a mostrar")
+    args = parser.parse_args()
+
+    perfiles = [perfilar() for _ in range(args.repeticiones)]
+    mejor = min(perfiles, key=lambda modulos: next(a for m, _, a, _ in modulos if m == "app.main"))
+    total_ms = next(a for m, _, a, _ in mejor if m == "app.main") / 1000
+
+    print(f"app.main: {total_ms:.0f} ms (mejor de {args.repeticiones}), presupuesto {args.presupuesto_ms:.0f} ms")
+    print(f"Memoria residente máxima tras el import: {memoria_kb() / 1024:.1f} MB")
+    print("Más lentos (acumulado):")
+    directos = sorted((m for m in mejor if m[3] == 1), key=lambda m: m[2], reverse=True)
+    for modulo, _, acumulado, _ in directos[:args.top]:
+        print(f"  {acumulado / 1000:8.1f} ms  {modulo}")
+
+    cargados = sorted({
+        m for m, _, _, _ in mejor
+        if m.split(".")[0] in MODULOS_DIFERIDOS
+    })
+    fallas = []
+    if total_ms > args.presupuesto_ms:
+        fallas.append(f"el import tardó {total_ms:.0f} ms (> {args.presupuesto_ms:.0f} ms)")
+    if cargados:
+        fallas.append("se importaron módulos que deben cargarse al usarse: " + ", ".join(cargados[:10]))
+    for falla in fallas:
+        print(f"❌ {falla}")
+    if fallas:
+        sys.exit(1)
+    print("✅ Dentro del presupuesto")
+
+
+if __name__ == "__main__":
+    main()
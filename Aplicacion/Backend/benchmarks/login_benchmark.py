@@ -0,0 +1,123 @@
+"""
+Benchmark de inicios de sesión (bcrypt) frente a la latencia del resto del API.
+
+Simula un cambio de turno: --logins inicios de sesión concurrentes mientras
+otro cliente consulta un endpoint liviano (sync, como la mayoría del API) y
+mide su latencia. Compara los dos modos de verificar la contraseña:
+
+  hilos     verify_password en una ruta sync (threadpool del API, como antes)
+  procesos  verificar_password en el pool de hash (HASH_WORKERS procesos)
+
+No usa la base de datos: el costo que interesa es el de bcrypt.
+
+Uso (desde Aplicacion/Backend, con las variables de entorno de la app):
+    python -m benchmarks.login_benchmark --logins 200 --rondas 12
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.security import verify_password
+from app.services import password_service
+
+
+def crear_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/login-hilos")
+    def login_hilos(payload: dict):
+        return {"ok": verify_password(payload["password"], payload["hash"])}
+
+    @app.post("/login-procesos")
+    async def login_procesos(payload: dict):
+        valida, _ = await password_service.verificar_password(payload["password"], payload["hash"])
+        return {"ok": valida}
+
+    @app.get("/ping")
+    def ping():
+        return {}
+
+    return app
+
+
+def percentil(valores, p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+async def escenario(modo: str, logins: int, hashed: str, app: FastAPI) -> dict:
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        await cliente.get("/ping")
+        terminado = asyncio.Event()
+        latencias_ping = []
+
+        async def sondear():
+            while not terminado.is_set():
+                inicio = time.perf_counter()
+                await cliente.get("/ping")
+                latencias_ping.append((time.perf_counter() - inicio) * 1000)
+                await asyncio.sleep(0.01)
+
+        async def iniciar_sesion():
+            respuesta = await cliente.post(f"/login-{modo}", json={"password": "Clave2025!", "hash": hashed})
+            return respuesta.status_code == 200 and respuesta.json()["ok"]
+
+        sonda = asyncio.create_task(sondear())
+        inicio = time.perf_counter()
+        resultados = await asyncio.gather(*[iniciar_sesion() for _ in range(logins)])
+        duracion = time.perf_counter() - inicio
+        terminado.set()
+        await sonda
+
+    return {
+        "modo": modo,
+        "correctos": sum(resultados),
+        "logins_s": logins / duracion,
+        "duracion_s": duracion,
+        "ping_p50": statistics.median(latencias_ping),
+        "ping_p95": percentil(latencias_ping, 0.95),
+        "ping_max": max(latencias_ping),
+    }
+
+
+async def ejecutar(logins: int, rondas: int):
+    # Mismo costo que BCRYPT_ROUNDS: si no, cada login también regeneraría el hash
+    hashed = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rondas).hash("Clave2025!")
+    app = crear_app()
+    # Arrancar los procesos del pool fuera de la medición
+    await asyncio.gather(*[password_service.verificar_password("x", hashed) for _ in range(settings.HASH_WORKERS)])
+
+    print(f"{logins} logins concurrentes, bcrypt {rondas} rondas, HASH_WORKERS={settings.HASH_WORKERS}")
+    print(f"{'modo':<10} {'logins/s':>9} {'total s':>8} {'ping p50':>9} {'ping p95':>9} {'ping max':>9}")
+    for modo in ("hilos", "procesos"):
+        r = await escenario(modo, logins, hashed, app)
+        print(f"{r['modo']:<10} {r['logins_s']:9.1f} {r['duracion_s']:8.2f} "
+              f"{r['ping_p50']:7.1f}ms {r['ping_p95']:7.1f}ms {r['ping_max']:7.1f}ms  ({r['correctos']} correctos)")
+    print(password_service.estadisticas_hash())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de inicios de sesión con bcrypt")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--rondas", type=int, default=settings.BCRYPT_ROUNDS)
+    args = parser.parse_args()
+    # Los procesos del pool leen la configuración del entorno al arrancar
+    os.environ["BCRYPT_ROUNDS"] = str(args.rondas)
+    settings.BCRYPT_ROUNDS = args.rondas
+    settings.HASH_MAX_PENDIENTES = max(settings.HASH_MAX_PENDIENTES, args.logins)
+    try:
+        asyncio.run(ejecutar(args.logins, args.rondas))
+    finally:
+        password_service.cerrar_pool_hash()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Micro-benchmark de generación de PDFs (recetas y comprobantes de cita).
+
+Mide PDFs por segundo de generar_receta_pdf y generar_comprobante_cita_pdf
+en el proceso actual (sin pool), que es el costo que paga cada worker.
+
+Uso (desde Aplicacion/Backend, con las variables de entorno de la app):
+    python -m benchmarks.pdf_benchmark --iteraciones 200
+"""
+import argparse
+import time
+from datetime import date, datetime
+
+from app.services.pdf_service import CitaPDF, MedicoPDF, PacientePDF, RecetaPDF
+from app.utils.pdf_generator import generar_comprobante_cita_pdf, generar_receta_pdf
+
+PACIENTE = PacientePDF(
+    nombre="María José", apellido="Andrade Vera", cedula="1710034065",
+    fecha_nacimiento=date(1988, 5, 17), genero="Femenino", telefono="0991234567",
+    email="maria.andrade@example.com", alergias="Penicilina"
+)
+MEDICO = MedicoPDF(id=1, nombre="Carlos", apellido="Mena", cedula="1712345678", especialidad="Medicina Interna")
+RECETA = RecetaPDF(
+    id=1542, fecha_emision=datetime(2025, 3, 10, 9, 30), estado="dispensada",
+    medicamentos="Amoxicilina 500 mg - 1 cada 8 horas por 7 días\nIbuprofeno 400 mg - 1 cada 12 horas por 3 días",
+    indicaciones="Tomar con abundante agua.\nNo suspender el tratamiento antes de tiempo.",
+    dispensada_por=3, fecha_dispensacion=datetime(2025, 3, 10, 11, 0), lote="L-2025-001",
+    fecha_vencimiento=date(2026, 1, 31)
+)
+CITA = CitaPDF(
+    id=872, fecha=datetime(2025, 3, 12, 10, 0), estado="programada", hora_inicio="10:00",
+    hora_fin="10:30", sala_asignada="Consultorio 4", tipo_cita="consulta", motivo="Control de presión arterial"
+)
+
+
+def medir(nombre: str, funcion, iteraciones: int) -> float:
+    funcion()  # calentamiento (imports y fuentes)
+    inicio = time.perf_counter()
+    for _ in range(iteraciones):
+        funcion()
+    duracion = time.perf_counter() - inicio
+    por_segundo = iteraciones / duracion
+    print(f"{nombre:<22} {iteraciones:>6} PDFs  {duracion:8.2f} s  {por_segundo:8.1f} PDFs/s  {duracion / iteraciones * 1000:7.2f} ms/PDF")
+    return por_segundo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de generación de PDFs")
+    parser.add_argument("--iteraciones", type=int, default=200)
+    args = parser.parse_args()
+
+    medir("receta", lambda: generar_receta_pdf(RECETA, PACIENTE, MEDICO), args.iteraciones)
+    medir("comprobante_cita", lambda: generar_comprobante_cita_pdf(CITA, PACIENTE, MEDICO), args.iteraciones)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""
+Configuración común de las pruebas: `python -m pytest` desde Aplicacion/Backend.
+
+Settings exige las variables de la base de datos y del JWT; aquí se fijan
+valores de prueba (SQLite en un directorio temporal) antes de que alguna
+prueba importe la aplicación. Las variables ya definidas en el entorno
+tienen prioridad. Por eso el plugin de presupuesto SQL se registra aquí y no
+con `pytest -p` (que lo cargaría antes de fijarlas).
+"""
+import os
+import tempfile
+
+_DIRECTORIO = tempfile.mkdtemp(prefix="gestion_medica_pruebas_")
+
+for _variable, _valor in {
+    "DB_USER": "pruebas",
+    "DB_PASSWORD": "pruebas",
+    "DB_HOST": "localhost",
+    "DB_PORT": "3306",
+    "DB_NAME": "pruebas",
+    "DB_URL": f"sqlite:///{os.path.join(_DIRECTORIO, 'primaria.db')}",
+    "DB_ASYNC_URL": f"sqlite+aiosqlite:///{os.path.join(_DIRECTORIO, 'primaria.db')}",
+    "JWT_SECRET": "secreto-de-pruebas",
+    "LOG_FORMATO": "texto",
+}.items():
+    os.environ.setdefault(_variable, _valor)
+
+pytest_plugins = ["app.core.pytest_perfil_sql"]
@@ -0,0 +1,33 @@
+"""
+Logging en cola a través de varios ciclos de vida de la app en el mismo
+proceso: el apagado detiene el listener y el siguiente startup lo reinicia.
+"""
+from fastapi.testclient import TestClient
+
+from app.core import migraciones
+from app.main import app
+from app.utils import logger as modulo_logger
+
+
+def test_cada_ciclo_de_vida_escribe_sus_registros(monkeypatch, capsys):
+    monkeypatch.setattr(migraciones, "esquema_actualizado", lambda: True)
+    # El listener de la importación escribe al stdout de entonces: se detiene
+    # para que el startup lo configure sobre el stdout capturado
+    modulo_logger.detener_logging()
+    log = modulo_logger.obtener_logger("pruebas")
+
+    with TestClient(app):
+        log.warning("registro del primer ciclo")
+    log.warning("registro entre ciclos")
+    with TestClient(app):
+        log.warning("registro del segundo ciclo")
+
+    salida = capsys.readouterr().out
+    assert "registro del primer ciclo" in salida
+    assert "registro entre ciclos" in salida
+    assert "registro del segundo ciclo" in salida
+    # Tras el segundo apagado no queda la cola instalada acumulando registros
+    assert not any(
+        isinstance(h, modulo_logger._ColaHandler)
+        for h in modulo_logger.logger.handlers
+    )
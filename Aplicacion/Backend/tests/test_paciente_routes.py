@@ -0,0 +1,14 @@
+"""Validación de parámetros del listado de pacientes"""
+from fastapi.testclient import TestClient
+
+from app.core.permissions import get_current_user
+from app.main import app
+
+
+def test_estado_poliza_desconocido_responde_422():
+    app.dependency_overrides[get_current_user] = lambda: {"id": 1, "cargo": "Administrador"}
+    try:
+        respuesta = TestClient(app).get("/pacientes/", params={"estado_poliza": "vencido"})
+    finally:
+        app.dependency_overrides.clear()
+    assert respuesta.status_code == 422
@@ -0,0 +1,54 @@
+"""Presupuesto de consultas SQL de endpoints con riesgo de N+1"""
+from datetime import date, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import database
+from app.core.permissions import get_current_user
+from app.main import app
+from app.models.cita import Cita
+from app.models.empleado import Empleado
+from app.models.medico import Medico
+from app.models.paciente import Paciente
+
+MEDICOS = 5
+
+
+@pytest.fixture(scope="module")
+def cliente():
+    database.importar_modelos()
+    database.Base.metadata.create_all(database.engine)
+    db = database.SessionLocal()
+    try:
+        paciente = Paciente(nombre="Ana", apellido="Paz", cedula=1710034065, activo=True)
+        db.add(paciente)
+        db.flush()
+        hoy = datetime.combine(date.today(), datetime.min.time())
+        for i in range(MEDICOS):
+            empleado = Empleado(nombre=f"Médico{i}", apellido="Prueba", cedula=1800000000 + i, cargo="Medico")
+            medico = Medico(nombre=f"Médico{i}", apellido="Prueba", cedula=1900000000 + i,
+                            especialidad="Medicina General", empleado=empleado, activo=True)
+            db.add(medico)
+            db.flush()
+            for hora in ("09:00", "10:00"):
+                db.add(Cita(fecha=hoy, hora_inicio=hora, hora_fin=hora[:2] + ":30", estado="programada",
+                            paciente_id=paciente.id, medico_id=medico.id, activo=True))
+        db.commit()
+    finally:
+        db.close()
+
+    app.dependency_overrides[get_current_user] = lambda: {"id": 1, "cargo": "Administrador"}
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_disponibilidad_medicos_sin_n_mas_1(cliente, presupuesto_sql):
+    # Médicos (con su empleado) y las citas del día de todos: dos consultas
+    with presupuesto_sql(consultas=2, repeticiones=1):
+        respuesta = cliente.get("/citas/disponibilidad/medicos")
+
+    assert respuesta.status_code == 200
+    disponibilidad = respuesta.json()
+    assert len(disponibilidad) == MEDICOS
+    assert all(m["total_citas_dia"] == 2 for m in disponibilidad)
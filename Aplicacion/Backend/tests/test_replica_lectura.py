@@ -0,0 +1,101 @@
+"""
+Ruteo lectura/escritura de get_db con dos archivos SQLite: uno hace de
+primaria y otro de réplica (sin replicación: la réplica queda "atrasada").
+"""
+import time
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, Integer, create_engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+
+from app.core import database
+from app.core.config import settings
+
+VENTANA = 0.3  # segundos de lectura en la primaria tras escribir
+
+_Base = declarative_base()
+
+
+class _Nota(_Base):
+    __tablename__ = "notas"
+    id = Column(Integer, primary_key=True)
+
+
+def _crear_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/notas")
+    def crear(db: Session = Depends(database.get_db)):
+        db.add(_Nota())
+        db.commit()
+        return {"ok": True}
+
+    @app.get("/notas")
+    def listar(db: Session = Depends(database.get_db)):
+        return {
+            "origen": "replica" if isinstance(db, database.SesionSoloLectura) else "primaria",
+            "notas": db.query(_Nota).count(),
+        }
+
+    return app
+
+
+@pytest.fixture
+def cliente(tmp_path, monkeypatch):
+    primaria = create_engine(f"sqlite:///{tmp_path / 'primaria.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for motor in (primaria, replica):
+        _Base.metadata.create_all(motor)
+
+    monkeypatch.setattr(database, "HAY_REPLICA", True)
+    monkeypatch.setattr(database, "SessionLocal", sessionmaker(bind=primaria, autoflush=False))
+    monkeypatch.setattr(database, "SessionReplica", sessionmaker(
+        bind=replica, autoflush=False, class_=database.SesionSoloLectura
+    ))
+    monkeypatch.setattr(database, "_ultimas_escrituras", {})
+    monkeypatch.setattr(settings, "DB_LEER_PRIMARIA_TRAS_ESCRITURA", VENTANA)
+
+    yield TestClient(_crear_app())
+    primaria.dispose()
+    replica.dispose()
+
+
+def test_lecturas_van_a_la_replica(cliente):
+    respuesta = cliente.get("/notas", headers={"Authorization": "Bearer a"})
+    assert respuesta.json() == {"origen": "replica", "notas": 0}
+
+
+def test_lectura_tras_escritura_va_a_la_primaria_durante_la_ventana(cliente):
+    autorizacion = {"Authorization": "Bearer a"}
+    assert cliente.post("/notas", headers=autorizacion).status_code == 200
+
+    # Dentro de la ventana: la primaria, que ya tiene la nota
+    assert cliente.get("/notas", headers=autorizacion).json() == {"origen": "primaria", "notas": 1}
+    # Otro cliente no escribió: sigue leyendo de la réplica
+    assert cliente.get("/notas", headers={"Authorization": "Bearer b"}).json() == {"origen": "replica", "notas": 0}
+
+    time.sleep(VENTANA + 0.05)
+    # Pasada la ventana vuelve a la réplica (aquí sin la nota: no hay replicación)
+    assert cliente.get("/notas", headers=autorizacion).json() == {"origen": "replica", "notas": 0}
+
+
+def test_no_retiene_el_token_en_memoria(cliente):
+    cliente.post("/notas", headers={"Authorization": "Bearer secreto"})
+    assert database._ultimas_escrituras
+    assert not any("secreto" in clave for clave in database._ultimas_escrituras)
+
+
+def test_escritura_se_registra_antes_de_responder(cliente):
+    app = cliente.app
+    registrado = {}
+
+    @app.post("/verificar")
+    def verificar(db: Session = Depends(database.get_db)):
+        # Dentro del endpoint, antes de que la respuesta salga
+        registrado["antes"] = bool(database._ultimas_escrituras)
+        return {}
+
+    cliente.post("/verificar", headers={"Authorization": "Bearer a"})
+    assert registrado["antes"]
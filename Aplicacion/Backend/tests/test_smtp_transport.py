@@ -0,0 +1,110 @@
+"""
+PoolSMTP contra un servidor SMTP local de aiosmtpd (sin TLS ni login, como
+localhost:1025 en desarrollo).
+"""
+import socket
+from email.message import EmailMessage
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.utils.smtp_transport import PoolSMTP
+
+
+class _Buzon:
+    """Handler de aiosmtpd que guarda los destinatarios de cada mensaje"""
+
+    def __init__(self):
+        self.recibidos = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.recibidos.append(envelope.rcpt_tos[0])
+        return "250 OK"
+
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _mensaje(destinatario: str) -> EmailMessage:
+    mensaje = EmailMessage()
+    mensaje["From"] = "noreply@hospital.com"
+    mensaje["To"] = destinatario
+    mensaje["Subject"] = "Prueba"
+    mensaje.set_content("Contenido")
+    return mensaje
+
+
+@pytest.fixture
+def servidor():
+    buzon = _Buzon()
+    controlador = Controller(buzon, hostname="127.0.0.1", port=_puerto_libre())
+    controlador.start()
+    yield controlador, buzon
+    controlador.stop()
+
+
+def test_enviar_reutiliza_la_conexion(servidor):
+    controlador, buzon = servidor
+    pool = PoolSMTP("127.0.0.1", controlador.port)
+    try:
+        pool.enviar(_mensaje("a@correo.com"))
+        pool.enviar(_mensaje("b@correo.com"))
+    finally:
+        pool.cerrar()
+
+    assert buzon.recibidos == ["a@correo.com", "b@correo.com"]
+    estadisticas = pool.estadisticas()
+    assert estadisticas["conexiones_abiertas"] == 1
+    assert estadisticas["reutilizadas"] == 1
+
+
+def test_enviar_varios_usa_una_sola_conexion(servidor):
+    controlador, buzon = servidor
+    pool = PoolSMTP("127.0.0.1", controlador.port)
+    destinatarios = [f"paciente{i}@correo.com" for i in range(5)]
+    try:
+        enviados = pool.enviar_varios([_mensaje(d) for d in destinatarios])
+    finally:
+        pool.cerrar()
+
+    assert enviados == 5
+    assert buzon.recibidos == destinatarios
+    assert pool.estadisticas()["conexiones_abiertas"] == 1
+    assert pool.estadisticas()["enviados"] == 5
+
+
+def test_enviar_varios_recicla_tras_max_mensajes(servidor):
+    controlador, buzon = servidor
+    pool = PoolSMTP("127.0.0.1", controlador.port, max_mensajes=2)
+    try:
+        enviados = pool.enviar_varios([_mensaje(f"p{i}@correo.com") for i in range(5)])
+    finally:
+        pool.cerrar()
+
+    assert enviados == 5
+    assert len(buzon.recibidos) == 5
+    assert pool.estadisticas()["conexiones_abiertas"] == 3
+
+
+def test_reconecta_si_el_servidor_cerro_la_sesion():
+    buzon = _Buzon()
+    puerto = _puerto_libre()
+    controlador = Controller(buzon, hostname="127.0.0.1", port=puerto)
+    controlador.start()
+    pool = PoolSMTP("127.0.0.1", puerto)
+    try:
+        pool.enviar(_mensaje("a@correo.com"))
+        # El servidor se reinicia: la conexión guardada en el pool queda muerta
+        controlador.stop()
+        controlador = Controller(buzon, hostname="127.0.0.1", port=puerto)
+        controlador.start()
+        pool.enviar(_mensaje("b@correo.com"))
+    finally:
+        pool.cerrar()
+        controlador.stop()
+
+    assert buzon.recibidos == ["a@correo.com", "b@correo.com"]
+    assert pool.estadisticas()["reconexiones"] == 1
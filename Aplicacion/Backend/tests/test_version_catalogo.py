@@ -0,0 +1,78 @@
+"""
+Contador de versión de los catálogos: se incrementa después del commit, fuera
+de la transacción de la escritura, y no se incrementa si hay rollback.
+"""
+import pytest
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import sessionmaker
+
+from app.core import database
+from app.models.farmacia import Farmacia
+from app.models.version_catalogo import VersionCatalogo
+from app.services.version_catalogo_service import inicializar_versiones
+
+
+@pytest.fixture
+def sesiones(tmp_path):
+    database.importar_modelos()
+    motor = create_engine(f"sqlite:///{tmp_path / 'catalogos.db'}")
+    database.Base.metadata.create_all(motor)
+    fabrica = sessionmaker(bind=motor, autoflush=False)
+    db = fabrica()
+    inicializar_versiones(db)
+    db.close()
+    yield fabrica, motor
+    motor.dispose()
+
+
+def _version(motor, catalogo: str) -> int:
+    with motor.connect() as conexion:
+        return conexion.execute(
+            select(VersionCatalogo.version).where(VersionCatalogo.catalogo == catalogo)
+        ).scalar()
+
+
+def test_incrementa_despues_del_commit(sesiones):
+    fabrica, motor = sesiones
+    inicial = _version(motor, "farmacias")
+
+    db = fabrica()
+    db.add(Farmacia(nombre_farmacia="Central", activo=True))
+    db.flush()
+    # Dentro de la transacción solo se anota: la fila del contador no se toca
+    assert _version(motor, "farmacias") == inicial
+    db.commit()
+    db.close()
+
+    assert _version(motor, "farmacias") == inicial + 1
+    assert _version(motor, "medicamentos") == 1
+
+
+def test_update_masivo_incrementa_al_confirmar(sesiones):
+    fabrica, motor = sesiones
+    db = fabrica()
+    db.add(Farmacia(nombre_farmacia="Central", activo=True))
+    db.commit()
+    inicial = _version(motor, "farmacias")
+
+    db.execute(update(Farmacia).values(telefono="0999999999"))
+    assert _version(motor, "farmacias") == inicial
+    db.commit()
+    db.close()
+
+    assert _version(motor, "farmacias") == inicial + 1
+
+
+def test_rollback_no_incrementa(sesiones):
+    fabrica, motor = sesiones
+    inicial = _version(motor, "farmacias")
+
+    db = fabrica()
+    db.add(Farmacia(nombre_farmacia="Central", activo=True))
+    db.flush()
+    db.rollback()
+    # Un commit posterior sin cambios en catálogos tampoco incrementa
+    db.commit()
+    db.close()
+
+    assert _version(motor, "farmacias") == inicial